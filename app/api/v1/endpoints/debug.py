@@ -0,0 +1,64 @@
+# API endpoints for retrieving request profiles captured by ProfilingMiddleware
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import profile_store
+
+
+def require_profiling_token(x_profile: Optional[str] = Header(None)):
+    """Profiles expose code paths and timings, so they require the admin token."""
+    token = settings.PROFILING_TOKEN
+    if (
+        not token
+        or x_profile is None
+        or not secrets.compare_digest(x_profile.encode(), token.encode())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Profile token is required",
+        )
+
+
+router = APIRouter(
+    prefix="/debug/profiles",
+    tags=["Debug"],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+@router.get("")
+def list_profiles():
+    """List recently captured profiles, newest first."""
+    return [
+        {
+            "id": record.id,
+            "method": record.method,
+            "path": record.path,
+            "mode": record.mode,
+            "trace_id": record.trace_id,
+            "duration_ms": record.duration_ms,
+        }
+        for record in profile_store.list()
+    ]
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def get_profile_output(profile_id: str):
+    """Return the raw profile: folded stacks (sampling) or pstats report (cprofile)."""
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return record.output
+
+
+@router.get("/{profile_id}/spans")
+def get_profile_spans(profile_id: str):
+    """Return the trace spans recorded for a profiled request."""
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"trace_id": record.trace_id, "spans": record.spans}
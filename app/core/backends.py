@@ -0,0 +1,387 @@
+"""
+Pluggable shared-state backends with a Redis-compatible interface.
+
+Process-local dicts stop being consistent as soon as the app runs with more
+than one worker. State that must be shared between workers (caches, rate-limit
+counters, the Media Shuttle transfer store) goes through a ``StateBackend``
+chosen by ``STATE_BACKEND_URL``:
+
+* ``memory://``: in-process dicts; single worker only (default, tests).
+* ``sqlite:///path/to/state.db``: a WAL-mode SQLite file shared by every
+  worker on the machine, with no extra service.
+* ``redis://host:6379/0``: Redis, when the optional ``redis`` package is
+  installed; shared across machines.
+
+Values are strings; the method names and semantics follow the Redis commands
+of the same name so the backends are interchangeable.
+
+The methods are synchronous. SQLite and Redis calls wait on locks or the
+network, so async code runs them through ``run_blocking``, which moves them to
+a worker thread unless the backend is in-process.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class StateBackend:
+    """Subset of the Redis command set used by the application."""
+
+    # Calls may block (file locks, network); see run_blocking
+    blocking = True
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(
+        self, key: str, value: str, ex: Optional[float] = None, nx: bool = False
+    ) -> bool:
+        """Store ``value``; ``ex`` is a TTL in seconds, ``nx`` only sets a new key."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> int:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically add ``amount`` to an integer value (missing keys start at 0)."""
+        raise NotImplementedError
+
+    def expire(self, key: str, seconds: float) -> bool:
+        raise NotImplementedError
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def hset(self, key: str, field: str, value: str) -> int:
+        raise NotImplementedError
+
+    def hdel(self, key: str, *fields: str) -> int:
+        raise NotImplementedError
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(StateBackend):
+    """Process-local backend; consistent only within a single worker."""
+
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, str] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._expires: dict[str, float] = {}
+
+    def _expired(self, key: str) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._values.pop(key, None)
+            self._hashes.pop(key, None)
+            del self._expires[key]
+            return True
+        return False
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._expired(key)
+            return self._values.get(key)
+
+    def set(
+        self, key: str, value: str, ex: Optional[float] = None, nx: bool = False
+    ) -> bool:
+        with self._lock:
+            self._expired(key)
+            if nx and (key in self._values or key in self._hashes):
+                return False
+            self._values[key] = str(value)
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                self._expired(key)
+                found = self._values.pop(key, None) is not None
+                found = self._hashes.pop(key, None) is not None or found
+                self._expires.pop(key, None)
+                removed += found
+            return removed
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            self._expired(key)
+            value = int(self._values.get(key, 0)) + amount
+            self._values[key] = str(value)
+            return value
+
+    def expire(self, key: str, seconds: float) -> bool:
+        with self._lock:
+            if self._expired(key) or (
+                key not in self._values and key not in self._hashes
+            ):
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        with self._lock:
+            self._expired(key)
+            return self._hashes.get(key, {}).get(field)
+
+    def hset(self, key: str, field: str, value: str) -> int:
+        with self._lock:
+            self._expired(key)
+            fields = self._hashes.setdefault(key, {})
+            added = field not in fields
+            fields[field] = str(value)
+            return int(added)
+
+    def hdel(self, key: str, *fields: str) -> int:
+        with self._lock:
+            self._expired(key)
+            stored = self._hashes.get(key, {})
+            return sum(stored.pop(field, None) is not None for field in fields)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        with self._lock:
+            self._expired(key)
+            return dict(self._hashes.get(key, {}))
+
+
+class SQLiteBackend(StateBackend):
+    """
+    Backend stored in a SQLite file shared by all workers on one machine.
+
+    WAL mode lets readers proceed while a writer commits; every write is a
+    single short transaction, so ``incr`` and ``set(nx=True)`` are atomic
+    across processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS kv (
+                    key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS hash (
+                    key TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL,
+                    PRIMARY KEY (key, field)
+                );
+                """)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql: str, params: tuple = ()) -> tuple[int, list]:
+        """Runs one statement in its own transaction; returns (rowcount, rows)."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM kv WHERE key = ? AND expires_at <= ?",
+                (params[0], time.time()),
+            )
+            cursor = conn.execute(sql, params)
+            rows = cursor.fetchall()
+            conn.execute("COMMIT")
+            return cursor.rowcount, rows
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM kv"
+                " WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(
+        self, key: str, value: str, ex: Optional[float] = None, nx: bool = False
+    ) -> bool:
+        expires_at = time.time() + ex if ex is not None else None
+        if nx:
+            inserted, _ = self._write(
+                "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, str(value), expires_at),
+            )
+            return inserted == 1
+        self._write(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, str(value), expires_at),
+        )
+        return True
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            found = self._write("DELETE FROM kv WHERE key = ?", (key,))[0] > 0
+            found = (
+                self._write("DELETE FROM hash WHERE key = ?", (key,))[0] > 0 or found
+            )
+            removed += found
+        return removed
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        _, rows = self._write(
+            "INSERT INTO kv (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE"
+            " SET value = CAST(value AS INTEGER) + excluded.value "
+            "RETURNING value",
+            (key, amount),
+        )
+        return int(rows[0][0])
+
+    def expire(self, key: str, seconds: float) -> bool:
+        # Expiry applies to string keys; hashes persist until deleted.
+        updated, _ = self._write(
+            "UPDATE kv SET expires_at = ?2 WHERE key = ?1", (key, time.time() + seconds)
+        )
+        return updated == 1
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute("SELECT value FROM hash WHERE key = ? AND field = ?", (key, field))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def hset(self, key: str, field: str, value: str) -> int:
+        existed = self.hget(key, field) is not None
+        self._write(
+            "INSERT OR REPLACE INTO hash (key, field, value) VALUES (?, ?, ?)",
+            (key, field, str(value)),
+        )
+        return int(not existed)
+
+    def hdel(self, key: str, *fields: str) -> int:
+        return sum(
+            self._write("DELETE FROM hash WHERE key = ? AND field = ?", (key, field))[0]
+            for field in fields
+        )
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        rows = (
+            self._connection()
+            .execute("SELECT field, value FROM hash WHERE key = ?", (key,))
+            .fetchall()
+        )
+        return dict(rows)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisBackend(StateBackend):
+    """Thin adapter over ``redis.Redis``; requires the optional ``redis`` package."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "STATE_BACKEND_URL uses redis:// but redis is not installed"
+            ) from e
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._redis.get(key)
+
+    def set(
+        self, key: str, value: str, ex: Optional[float] = None, nx: bool = False
+    ) -> bool:
+        px = int(ex * 1000) if ex is not None else None
+        return bool(self._redis.set(key, value, px=px, nx=nx))
+
+    def delete(self, *keys: str) -> int:
+        return self._redis.delete(*keys) if keys else 0
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self._redis.incrby(key, amount)
+
+    def expire(self, key: str, seconds: float) -> bool:
+        return bool(self._redis.pexpire(key, int(seconds * 1000)))
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        return self._redis.hget(key, field)
+
+    def hset(self, key: str, field: str, value: str) -> int:
+        return self._redis.hset(key, field, value)
+
+    def hdel(self, key: str, *fields: str) -> int:
+        return self._redis.hdel(key, *fields) if fields else 0
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return self._redis.hgetall(key)
+
+    def close(self) -> None:
+        self._redis.close()
+
+
+def create_backend(url: str) -> StateBackend:
+    """Builds the backend for a ``memory://``, ``sqlite:///path`` or ``redis://``."""
+    scheme, _, rest = url.partition("://")
+    if scheme == "memory":
+        return MemoryBackend()
+    if scheme == "sqlite":
+        return SQLiteBackend(rest[1:] if rest.startswith("/") else rest)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported STATE_BACKEND_URL: {url}")
+
+
+_backend: Optional[StateBackend] = None
+_backend_lock = threading.Lock()
+
+
+async def run_blocking(backend: StateBackend, call: Callable[[], T]) -> T:
+    """Runs ``call`` (which uses ``backend``) off the event loop if it may block."""
+    if not backend.blocking:
+        return call()
+    return await asyncio.to_thread(call)
+
+
+def get_backend() -> StateBackend:
+    """The shared backend for this process, created from settings on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(settings.STATE_BACKEND_URL)
+    return _backend
@@ -0,0 +1,113 @@
+"""
+DataLoader-style coalescing of single-key lookups.
+
+Dashboards fire bursts of lookups for one item each (``/jobs/{job_id}``,
+``check_job_status``...). A ``DataLoader`` collects the keys requested within
+``window`` seconds, or until ``max_batch_size`` keys are waiting, and resolves
+them with one call of its batch function. Callers asking for the same key in
+the same batch share one result.
+
+The batch function takes the list of distinct keys and returns a mapping
+from key to value; keys it leaves out resolve to ``None``. If it raises,
+every caller in the batch gets the exception.
+"""
+
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Generic, Hashable, Mapping, Optional, TypeVar
+
+from app.core.metrics import Counter, Histogram
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunction = Callable[[list[K]], Awaitable[Mapping[K, V]]]
+
+BATCH_SIZE = Histogram(
+    "batch_loader_batch_size",
+    "Distinct keys resolved per batch by loader.",
+    ["loader"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+BATCH_KEYS = Counter(
+    "batch_loader_keys_total",
+    "Keys requested from batch loaders, by whether they joined a pending lookup.",
+    ["loader", "outcome"],
+)
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces ``load(key)`` calls into batched calls of ``batch_fn``."""
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        name: str,
+        window: float = 0.0,
+        max_batch_size: int = 1000,
+    ):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[K, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Batches belong to one event loop (tests run several)
+            self._pending = {}
+            self._loop = loop
+            self._timer = None
+        future = self._pending.get(key)
+        if future is not None:
+            BATCH_KEYS.labels(self.name, "deduplicated").inc()
+            return await asyncio.shield(future)
+        BATCH_KEYS.labels(self.name, "loaded").inc()
+        future = self._pending[key] = loop.create_future()
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            # window=0 still batches every lookup made before the loop's next turn
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self._dispatch)
+            else:
+                self._timer = loop.call_soon(self._dispatch)
+        # Shielded so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            # A fresh context: the batch serves many requests, not the
+            # request-scoped state of the one that started it. Callers put
+            # what they read from their scope (e.g. the snapshot) in the key
+            task = self._loop.create_task(
+                self._resolve(batch), context=contextvars.Context()
+            )
+            # The loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[K, asyncio.Future]) -> None:
+        BATCH_SIZE.labels(self.name).observe(len(batch))
+        try:
+            values = await self.batch_fn(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
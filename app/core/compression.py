@@ -0,0 +1,323 @@
+"""
+Response compression with Accept-Encoding negotiation.
+
+``CompressionMiddleware`` compresses compressible responses (JSON, text,
+markdown, SSE) with the best encoding the client accepts:
+
+* ``zstd`` when the optional ``zstandard`` package is installed,
+* ``br`` when the optional ``brotli`` package is installed,
+* ``gzip`` always.
+
+Single-message bodies below ``min_size`` are sent as is. Streaming bodies
+(e.g. MCP server-sent events) are compressed incrementally and flushed after
+every chunk so events are not held back.
+
+Versioned responses (those carrying an ``ETag``) are compressed once per
+(ETag, URL, encoding): the compressed body is kept in a small LRU and reused
+for every client polling the same snapshot version.
+"""
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import record_cache_lookup
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+# --- Encoders ---
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self) -> "_ZlibStream":
+        return _ZlibStream(zlib.compressobj(self.level, zlib.DEFLATED, 31))
+
+
+class _ZlibStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int = 5):
+        import brotli
+
+        self._brotli = brotli
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> "_BrotliStream":
+        return _BrotliStream(self._brotli.Compressor(quality=self.quality))
+
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        import zstandard
+
+        self._zstandard = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._lock = threading.Lock()
+
+    def compress(self, data: bytes) -> bytes:
+        # ZstdCompressor instances are not thread-safe
+        with self._lock:
+            return self._compressor.compress(data)
+
+    def stream(self) -> "_ZstdStream":
+        with self._lock:
+            return _ZstdStream(self._compressor.compressobj(), self._zstandard)
+
+
+class _ZstdStream:
+    def __init__(self, compressor, zstandard):
+        self._compressor = compressor
+        self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            self._flush_mode
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> dict:
+    """Encoders usable in this environment, in server preference order."""
+    encoders = {}
+    for factory in (ZstdEncoder, BrotliEncoder, GzipEncoder):
+        try:
+            encoder = factory()
+        except ImportError:
+            continue
+        encoders[encoder.name] = encoder
+    return encoders
+
+
+def negotiate(accept_encoding: Optional[str], available: list[str]) -> Optional[str]:
+    """
+    Picks the encoding with the highest q-value in Accept-Encoding.
+
+    Ties go to the earliest entry of ``available`` (server preference); ``*``
+    covers encodings the header does not name, and ``q=0`` refuses one.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies keyed by (ETag, URL, encoding)."""
+
+    def __init__(self, max_items: int = 256):
+        self.max_items = max_items
+        self._items: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# --- ASGI middleware ---
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers or "no-transform" in headers.get(
+        "cache-control", ""
+    ):
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        min_size: int = 1024,
+        cache_size: int = 256,
+        encoders: Optional[dict] = None,
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+        self.preference = list(self.encoders)
+        self.cache = CompressedBodyCache(cache_size) if cache_size else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding"), self.preference
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, scope, self.encoders[encoding], send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, scope: Scope, encoder, send: Send
+    ):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoder = encoder
+        self._send = send
+        self._start: Optional[Message] = None
+        self._stream = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status = message["status"]
+            if status < 200 or status in (204, 304) or not _compressible(headers):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                self._start = message
+            return
+        if self._passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._stream is not None:
+            await self._send_stream_chunk(body, more_body)
+        elif not more_body:
+            await self._send_whole(body)
+        else:
+            # Length unknown: compress incrementally, flushing every chunk
+            self._stream = self.encoder.stream()
+            headers = self._headers()
+            del headers["content-length"]
+            await self._send(self._start)
+            await self._send_stream_chunk(body, more_body)
+
+    def _headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers["content-encoding"] = self.encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) < self.middleware.min_size:
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        compressed = self._cached_compress(body)
+        headers = self._headers()
+        headers["content-length"] = str(len(compressed))
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _cached_compress(self, body: bytes) -> bytes:
+        cache = self.middleware.cache
+        etag = Headers(raw=self._start["headers"]).get("etag")
+        if cache is None or etag is None or self._start["status"] != 200:
+            return self.encoder.compress(body)
+        key = (
+            etag,
+            self.scope["path"],
+            self.scope.get("query_string", b""),
+            self.encoder.name,
+        )
+        compressed = cache.get(key)
+        record_cache_lookup("compressed_body", compressed is not None)
+        if compressed is None:
+            compressed = self.encoder.compress(body)
+            cache.put(key, compressed)
+        return compressed
+
+    async def _send_stream_chunk(self, body: bytes, more_body: bool) -> None:
+        chunk = self._stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self._stream.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
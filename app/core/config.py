@@ -1,13 +1,109 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
+
 class Settings(BaseSettings):
     DEADLINE_WEBSERVICE_URL: str = "http://localhost:8082"
-    
+    DEADLINE_TIMEOUT: float = 30.0
+    # Serve built-in sample jobs instead of calling the Deadline web service
+    DEADLINE_USE_MOCK_DATA: bool = True
+    # Seconds a fetched job snapshot is reused before calling Deadline again
+    DEADLINE_CACHE_TTL: float = 2.0
+    # Job control commands sent to Deadline at once by a batch
+    DEADLINE_CONTROL_CONCURRENCY: int = 8
+    # Single-job lookups arriving within this many seconds are resolved
+    # together (0 = those made before the event loop's next turn)
+    DEADLINE_LOOKUP_BATCH_WINDOW: float = 0.0
+    # Adaptive background refresh of the job snapshot (see
+    # app/modules/deadline/sync.py): interval bounds, and seconds without
+    # client requests before it pauses
+    DEADLINE_SYNC_ENABLED: bool = True
+    DEADLINE_SYNC_MIN_INTERVAL: float = 2.0
+    DEADLINE_SYNC_MAX_INTERVAL: float = 60.0
+    DEADLINE_SYNC_IDLE_TIMEOUT: float = 300.0
+    # Job snapshot saved to disk for warm restarts (see
+    # app/modules/deadline/persistence.py), e.g. on a Fly volume; an empty
+    # path disables it
+    DEADLINE_SNAPSHOT_PATH: str = ""
+    DEADLINE_SNAPSHOT_SAVE_INTERVAL: float = 30.0
+
+    # Farm history sampling (see app/modules/deadline/history.py): a SQLite
+    # file shared by the workers, or ":memory:"; an interval of 0 disables it
+    HISTORY_DB_PATH: str = ":memory:"
+    HISTORY_SAMPLE_INTERVAL: float = 60.0
+
+    # User lookups cached per process (see app/db/repositories/user_repository.py):
+    # seconds an entry is reused, and entries kept (0 disables either)
+    USER_CACHE_TTL: float = 60.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Cache-Control max-age for versioned GET responses (0 = revalidate)
+    HTTP_CACHE_MAX_AGE: int = 0
+
+    # MCP streamable HTTP; an empty host list disables DNS-rebinding checks
+    MCP_ALLOWED_HOSTS: list[str] = []
+    MCP_ALLOWED_ORIGINS: list[str] = []
+
+    # Stateless streamable HTTP lets any worker answer any MCP request;
+    # JSON responses (instead of SSE streams) suit it best
+    MCP_STATELESS_HTTP: bool = False
+    MCP_JSON_RESPONSE: bool = False
+    # Stateful session limits (0 = unlimited): open sessions per worker, idle
+    # seconds before a session is closed, and tool calls a session may run at
+    # once / queue behind them before further calls are rejected
+    MCP_MAX_SESSIONS: int = 1000
+    MCP_SESSION_IDLE_TIMEOUT: float = 1800.0
+    MCP_MAX_REQUEST_BODY_BYTES: int = 4 * 1024 * 1024
+    MCP_MAX_INFLIGHT_PER_SESSION: int = 4
+    MCP_MAX_QUEUED_PER_SESSION: int = 32
+    # Rendered MCP resources/prompts kept per snapshot version (0 disables)
+    MCP_RENDER_CACHE_BYTES: int = 8 * 1024 * 1024
+    # JSON size budget of one page of AI tool results; the rest is paged
+    # through continuation cursors
+    TOOL_RESULT_MAX_BYTES: int = 64 * 1024
+
+    # Deployment: worker processes (0 = one per CPU core) and the state
+    # backend they share: memory://, sqlite:///path or redis://host:port/db
+    WEB_CONCURRENCY: int = 0
+    STATE_BACKEND_URL: str = "memory://"
+    RATE_LIMIT_PER_MINUTE: int = 0  # per client, 0 disables
+
+    # Defer the MCP SDK import and tool registration until after startup
+    LAZY_STARTUP: bool = True
+
+    # Response compression (gzip; br/zstd when brotli/zstandard are installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as is
+    COMPRESSION_CACHE_SIZE: int = (
+        256  # compressed bodies kept per (ETag, URL, encoding)
+    )
+
+    # Observability
+    METRICS_ENABLED: bool = True
+    # Logging (see app/core/logs.py): JSON lines (or plain text) written by a
+    # background thread from a bounded queue. Access and MCP call lines under
+    # the path prefixes listed are logged at the given rate
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: dict[str, float] = {"/mcp": 0.1}
+
+    # Opt-in request profiling (see app/core/profiling.py)
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None  # X-Profile header value
+    PROFILING_SAMPLE_EVERY: int = 0  # profile 1 in N requests, 0 disables
+    PROFILING_MODE: str = "sampling"  # "sampling" (folded stacks) or "cprofile"
+    PROFILING_SAMPLE_INTERVAL: float = 0.001
+    PROFILING_MAX_STORED: int = 50
+    PROFILING_OUTPUT_DIR: Optional[str] = None
+
     # Add other application-wide settings here
 
     class Config:
         # In a real application, you might load this from a .env file
         env_file = ".env"
 
+
 # Create a single, importable instance of the settings
-settings = Settings()
\ No newline at end of file
+settings = Settings()
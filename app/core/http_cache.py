@@ -0,0 +1,69 @@
+"""
+Conditional GET support (ETag / If-None-Match) driven by version counters.
+
+Resources expose a cheap version number that changes whenever their data
+changes (a snapshot counter, a store write counter). The ETag is derived from
+that number, so checking a poll costs one lookup: when the client's
+``If-None-Match`` matches, the request is answered with an empty 304 before the
+endpoint runs, skipping filtering, validation and serialization.
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.core.config import settings
+
+VersionGetter = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+def make_etag(name: str, version: Any) -> str:
+    # Weak: the representation can vary (e.g. compression) for the same data
+    return f'W/"{name}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_control(max_age: Optional[int] = None) -> str:
+    max_age = settings.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+    # no-cache still lets clients store the body; they must revalidate first
+    return f"max-age={max_age}, must-revalidate" if max_age > 0 else "no-cache"
+
+
+def conditional_get(
+    name: str, get_version: VersionGetter, max_age: Optional[int] = None
+):
+    """
+    Dependency that sets ETag/Cache-Control and answers matching polls with 304.
+
+    Only applies to GET and HEAD, so it can be attached to a whole router.
+    ``get_version`` may be sync or async.
+    """
+
+    async def dependency(request: Request, response: Response) -> None:
+        if request.method not in ("GET", "HEAD"):
+            return
+        version = get_version()
+        if inspect.isawaitable(version):
+            version = await version
+        headers = {
+            "ETag": make_etag(name, version),
+            "Cache-Control": cache_control(max_age),
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(dependency)
@@ -0,0 +1,174 @@
+"""
+Deferred construction of the FastMCP server for fast cold starts.
+
+Importing the ``mcp`` SDK and registering every tool accounts for a large
+share of ``import main``. ``LazyFastMCP`` records ``@tool``/``@resource``/
+``@prompt`` registrations without importing the SDK and only builds the real
+``InstrumentedFastMCP`` when it is first needed:
+
+* in lazy mode (``LAZY_STARTUP``), the app lifespan builds it on a worker
+  thread after startup, so the first REST response does not wait for it and
+  ``/mcp`` requests wait until it is ready;
+* any attribute access (``mcp.call_tool``, ``mcp.list_tools``...) builds it
+  synchronously on demand.
+
+If building or starting it fails, ``/mcp`` answers 503 in lazy mode and the
+app lifespan fails in eager mode, rather than waiting forever.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LazyFastMCP:
+    """Drop-in stand-in for ``InstrumentedFastMCP`` that defers building it."""
+
+    def __init__(self, name: str, lazy: bool = True, **kwargs: Any):
+        self.name = name
+        self.lazy = lazy
+        self._kwargs = kwargs
+        self._registrations: list[tuple[str, Callable, tuple, dict]] = []
+        self._server = None
+        self._build_lock = threading.Lock()
+        self._running = False
+        self._ready: Optional[asyncio.Event] = None
+        # Why the transport could not start in the current lifespan
+        self._error: Optional[Exception] = None
+        if not lazy:
+            self._build()
+
+    # --- Registration ---
+
+    def _register(self, kind: str, args: tuple, kwargs: dict):
+        def decorator(fn: Callable) -> Callable:
+            with self._build_lock:
+                self._registrations.append((kind, fn, args, kwargs))
+                server = self._server
+            if server is not None:
+                getattr(server, kind)(*args, **kwargs)(fn)
+            return fn
+
+        return decorator
+
+    def tool(self, *args: Any, **kwargs: Any):
+        return self._register("tool", args, kwargs)
+
+    def resource(self, *args: Any, **kwargs: Any):
+        return self._register("resource", args, kwargs)
+
+    def prompt(self, *args: Any, **kwargs: Any):
+        return self._register("prompt", args, kwargs)
+
+    # --- Construction ---
+
+    @property
+    def is_built(self) -> bool:
+        return self._server is not None
+
+    @property
+    def server(self):
+        """The real server, built on first access."""
+        return self._server or self._build()
+
+    def _build(self):
+        with self._build_lock:
+            if self._server is None:
+                module = importlib.import_module("app.core.mcp_server")
+                server = module.InstrumentedFastMCP(self.name, **self._kwargs)
+                for kind, fn, args, kwargs in self._registrations:
+                    getattr(server, kind)(*args, **kwargs)(fn)
+                self._server = server
+            return self._server
+
+    async def notify_resource_updated(self, uri: str) -> int:
+        # Nobody can have subscribed before the server exists
+        if self._server is None:
+            return 0
+        return await self._server.notify_resource_updated(uri)
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only reached for attributes not defined here: delegate to the server.
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        return getattr(self.server, attribute)
+
+    # --- Streamable HTTP lifecycle ---
+
+    def http_app(self) -> "LazyStreamableHTTPMount":
+        """ASGI app to mount in FastAPI; requires ``run_http()`` in the app lifespan."""
+        return LazyStreamableHTTPMount(self)
+
+    @asynccontextmanager
+    async def run_http(self) -> AsyncIterator[None]:
+        """Run the streamable-HTTP transport for one app lifespan."""
+        self._ready = asyncio.Event()
+        self._error = None
+        self._running = True
+        task = asyncio.create_task(self._serve())
+        if not self.lazy:
+            await self._ready.wait()
+            if self._error is not None:
+                self._running = False
+                raise self._error
+        try:
+            yield
+        finally:
+            self._running = False
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _serve(self) -> None:
+        # The SDK import and tool registration run on a worker thread so the
+        # event loop keeps serving requests while the server is built.
+        try:
+            server = self._server or await asyncio.to_thread(self._build)
+            async with server.run_http():
+                self._ready.set()
+                await asyncio.Event().wait()
+        except Exception as e:
+            logger.exception("MCP server failed: %s", e)
+            self._error = e
+            # Wakes the requests (or eager startup) waiting for it
+            self._ready.set()
+
+    async def wait_ready(self) -> bool:
+        """
+        Wait until the transport is running; False when no lifespan started
+        it or it failed to start.
+        """
+        if not self._running or self._ready is None:
+            return False
+        await self._ready.wait()
+        return self._error is None
+
+
+class LazyStreamableHTTPMount:
+    """Routes ``/mcp`` requests to the server once it has been built and started."""
+
+    def __init__(self, lazy_mcp: LazyFastMCP):
+        self.lazy_mcp = lazy_mcp
+        self._mount = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not await self.lazy_mcp.wait_ready():
+            message = "MCP server is not running"
+            if self.lazy_mcp._error is not None:
+                message = "MCP server failed to start"
+            response = PlainTextResponse(message, status_code=503)
+            await response(scope, receive, send)
+            return
+        if self._mount is None:
+            self._mount = self.lazy_mcp.server.http_app()
+        await self._mount(scope, receive, send)
@@ -0,0 +1,280 @@
+"""
+Structured logging, written off the event loop.
+
+``configure_logging()`` (called from the app lifespan) puts a
+``ContextQueueHandler`` on the root logger. Logging a record only renders its
+message, stamps it with the current request ID and puts it on a bounded
+queue; a ``QueueListener`` thread formats it (one JSON object per line by
+default) and writes it to stdout. A slow or blocked stdout never stalls the
+event loop: when the queue is full, records are dropped and counted in
+``log_records_dropped_total``.
+
+Request IDs live in a context variable. ``RequestLogMiddleware`` takes the
+client's ``X-Request-ID`` (or makes one up), returns it on the response and
+logs one access line per request. Records logged while serving the request,
+including MCP messages dispatched on the session task (see ``mcp_server``),
+carry it as ``request_id``.
+
+High-volume routes are sampled: ``sampled(path)`` keeps a line with the rate
+of the longest matching prefix in ``LOG_SAMPLE_RATES`` (e.g. ``{"/mcp": 0.1}``),
+or always when no prefix matches. MCP calls are sampled under
+``/mcp/<kind>/<name>``, so a single tool can get its own rate. Server errors
+and failed calls are always logged.
+"""
+
+import copy
+import json
+import logging
+import queue
+import random
+import secrets
+import sys
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, Optional, TextIO
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter
+
+REQUEST_ID_HEADER = b"x-request-id"
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+# Loggers writing a line per message or upstream call; the sampled access
+# and MCP call lines cover them
+QUIET_LOGGERS = ("mcp.server.lowlevel.server", "httpx")
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full.",
+)
+
+access_logger = logging.getLogger("app.access")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# Longest prefix first
+_sample_rates: list[tuple[str, float]] = []
+_handler: Optional["ContextQueueHandler"] = None
+_listener: Optional["_Listener"] = None
+
+# Attributes every LogRecord has; any other was passed as ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]) -> None:
+    """Sets the request ID for the rest of the current task."""
+    # Every request and MCP message runs in its own task (and context copy),
+    # so the ID ends with it
+    _request_id.set(request_id)
+
+
+def set_sample_rates(rates: Mapping[str, float]) -> None:
+    _sample_rates[:] = sorted(
+        rates.items(), key=lambda item: len(item[0]), reverse=True
+    )
+
+
+def sampled(path: str) -> bool:
+    """Whether to log a line for ``path``, at the rate of its longest prefix."""
+    for prefix, rate in _sample_rates:
+        if path.startswith(prefix):
+            return rate >= 1 or random.random() < rate
+    return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, request ID, extras."""
+
+    def __init__(self):
+        super().__init__()
+        # Records come in bursts within the same second
+        self._second = (-1, "")
+
+    def _time(self, created: float) -> str:
+        second = int(created)
+        cached, text = self._second
+        if cached != second:
+            text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = (second, text)
+        return f"{text}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self._time(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# Renders tracebacks in the logging thread
+_TRACEBACKS = logging.Formatter()
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Queues records for the listener thread without blocking.
+
+    Unlike ``QueueHandler`` it leaves the formatting to the listener: the
+    caller only renders the message and any traceback (their arguments may
+    change or hold frames) and stamps the request ID.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACKS.formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = _request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels().inc()
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Waits for room: nothing else is queued once the handler is removed
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    queue_size: int = 10000,
+    sample_rates: Mapping[str, float] = {},
+    stream: Optional[TextIO] = None,
+) -> None:
+    """Routes all logging through the queue to ``stream`` (stdout by default)."""
+    global _handler, _listener
+    stop_logging()
+    output = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    )
+    records = queue.Queue(queue_size)
+    _handler = ContextQueueHandler(records)
+    _listener = _Listener(records, output)
+    _listener.start()
+    set_sample_rates(sample_rates)
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level.upper())
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    # Uvicorn's own loggers go through the queue too; its access log is
+    # replaced by RequestLogMiddleware
+    for name in ("uvicorn", "uvicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").disabled = True
+
+
+def stop_logging() -> None:
+    """Removes the queue handler and writes out the records still queued."""
+    global _handler, _listener
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _client_request_id(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            request_id = value.decode("latin-1")
+            # Echoed in a header and logged: keep it short and printable
+            if 0 < len(request_id) <= 128 and request_id.isprintable():
+                return request_id
+            return None
+    return None
+
+
+class RequestLogMiddleware:
+    """
+    Pure ASGI middleware giving each request an ID and logging one access line.
+
+    The ID is the client's ``X-Request-ID`` or a new one; it is added to the
+    request headers (so mounted apps such as /mcp see it) and the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _client_request_id(scope)
+        if request_id is None:
+            request_id = secrets.token_hex(8)
+            scope = {
+                **scope,
+                "headers": [
+                    *scope["headers"],
+                    (REQUEST_ID_HEADER, request_id.encode()),
+                ],
+            }
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        token = _request_id.set(request_id)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            path = scope["path"]
+            if access_logger.isEnabledFor(logging.INFO) and (
+                status_code >= 500 or sampled(path)
+            ):
+                access_logger.info(
+                    "%s %s %d",
+                    scope["method"],
+                    path,
+                    status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": path,
+                        "status": status_code,
+                        "duration_ms": round(elapsed * 1000, 3),
+                    },
+                )
+            _request_id.reset(token)
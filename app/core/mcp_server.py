@@ -0,0 +1,427 @@
+"""
+Shared FastMCP server class for CGCG modules.
+
+Modules create their MCP server from ``InstrumentedFastMCP`` instead of the
+plain ``FastMCP`` so every tool call, resource read and prompt render is
+counted and timed in the application metrics, and shows up as a span when the
+originating HTTP request is being profiled. Each of them runs in a fresh
+request scope (see ``request_scope``).
+
+It also supports resource subscriptions: clients subscribe to a resource URI
+and ``notify_resource_updated(uri)`` sends them
+``notifications/resources/updated`` when its data changes, instead of them
+re-reading the resource on a timer.
+
+Streamable-HTTP sessions are bounded (``MCP_*`` settings): the SDK refuses
+sessions beyond ``MCP_MAX_SESSIONS`` with 503 and closes sessions idle for
+``MCP_SESSION_IDLE_TIMEOUT``; each session runs at most
+``MCP_MAX_INFLIGHT_PER_SESSION`` tool calls at once, queues up to
+``MCP_MAX_QUEUED_PER_SESSION`` more and rejects the rest, so one agent cannot
+monopolize the worker. Open sessions, in-flight and queued tool calls are
+exported as gauges.
+
+Clients that send a ``progressToken`` with a request get the progress the
+handler reports through ``tool_results.report_progress`` as
+``notifications/progress``.
+
+Calls run with the request ID of the HTTP request that carried them and log
+one line each, sampled under ``/mcp/<kind>/<name>`` (see ``logs``).
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.transport_security import TransportSecuritySettings
+from pydantic import AnyUrl
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logs import REQUEST_ID_HEADER, sampled, set_request_id
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram
+from app.core.profiling import activate, current_trace, span, trace_for_scope
+from app.core.request_scope import begin_request_scope
+from app.core.tool_results import ProgressReporter, progress_reporter
+
+logger = logging.getLogger(__name__)
+
+MCP_CALLS = Counter(
+    "mcp_calls_total",
+    "MCP tool calls, resource reads and prompt renders by name and outcome.",
+    ["kind", "name", "outcome"],
+)
+MCP_CALL_DURATION = Histogram(
+    "mcp_call_duration_seconds",
+    "Latency of MCP tool calls, resource reads and prompt renders by name.",
+    ["kind", "name"],
+)
+
+MCP_SESSIONS = Gauge(
+    "mcp_sessions_active",
+    "Open stateful MCP streamable-HTTP sessions.",
+    ["server"],
+)
+MCP_TOOL_CALLS_IN_FLIGHT = Gauge(
+    "mcp_tool_calls_in_flight",
+    "MCP tool calls currently running.",
+)
+MCP_TOOL_CALLS_QUEUED = Gauge(
+    "mcp_tool_calls_queued",
+    "MCP tool calls waiting for a free slot in their session.",
+)
+MCP_TOOL_CALLS_REJECTED = Counter(
+    "mcp_tool_calls_rejected_total",
+    "MCP tool calls rejected because their session's queue was full.",
+)
+
+
+class SessionLimiter:
+    """Bounds the tool calls one session runs at once and queues behind them."""
+
+    def __init__(self, max_in_flight: int, max_queued: int):
+        self.max_queued = max_queued
+        self.queued = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self.queued >= self.max_queued:
+                MCP_TOOL_CALLS_REJECTED.labels().inc()
+                raise ToolError(
+                    "Too many tool calls in progress for this session; retry later"
+                )
+            self.queued += 1
+            MCP_TOOL_CALLS_QUEUED.labels().inc()
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.queued -= 1
+                MCP_TOOL_CALLS_QUEUED.labels().dec()
+        else:
+            await self._semaphore.acquire()
+        MCP_TOOL_CALLS_IN_FLIGHT.labels().inc()
+        try:
+            yield
+        finally:
+            MCP_TOOL_CALLS_IN_FLIGHT.labels().dec()
+            self._semaphore.release()
+
+
+def _counting_lifespan(lifespan: Optional[Callable[[Any], Any]]):
+    """
+    Wraps a FastMCP ``lifespan`` (entered once per session) to count the
+    open stateful sessions; stateless requests each run one too, uncounted.
+    """
+
+    @asynccontextmanager
+    async def counted(server: "InstrumentedFastMCP") -> AsyncIterator[Any]:
+        stateful = not server.settings.stateless_http
+        if stateful:
+            server._open_sessions += 1
+        try:
+            if lifespan is None:
+                yield {}
+            else:
+                async with lifespan(server) as context:
+                    yield context
+        finally:
+            if stateful:
+                server._open_sessions -= 1
+
+    return counted
+
+
+def _limit(value: float) -> Optional[float]:
+    # Settings use 0 for "unlimited", the SDK uses None
+    return value if value > 0 else None
+
+
+def _transport_security() -> TransportSecuritySettings:
+    """
+    DNS-rebinding protection from settings.
+
+    FastMCP enables it for localhost by default, which rejects every request
+    whose Host is not localhost (e.g. the Fly hostname) with 421.
+    """
+    if not settings.MCP_ALLOWED_HOSTS:
+        return TransportSecuritySettings(enable_dns_rebinding_protection=False)
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=settings.MCP_ALLOWED_HOSTS,
+        allowed_origins=settings.MCP_ALLOWED_ORIGINS,
+    )
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP server that records call counts and latency per tool/resource/prompt."""
+
+    def __init__(
+        self,
+        name: str | None = None,
+        max_in_flight_per_session: Optional[int] = None,
+        max_queued_per_session: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        kwargs.setdefault("transport_security", _transport_security())
+        kwargs.setdefault("stateless_http", settings.MCP_STATELESS_HTTP)
+        kwargs.setdefault("json_response", settings.MCP_JSON_RESPONSE)
+        kwargs.setdefault("max_sessions", _limit(settings.MCP_MAX_SESSIONS))
+        kwargs.setdefault(
+            "session_idle_timeout", _limit(settings.MCP_SESSION_IDLE_TIMEOUT)
+        )
+        kwargs.setdefault("max_request_body_size", settings.MCP_MAX_REQUEST_BODY_BYTES)
+        self.max_in_flight_per_session = (
+            settings.MCP_MAX_INFLIGHT_PER_SESSION
+            if max_in_flight_per_session is None
+            else max_in_flight_per_session
+        )
+        self.max_queued_per_session = (
+            settings.MCP_MAX_QUEUED_PER_SESSION
+            if max_queued_per_session is None
+            else max_queued_per_session
+        )
+        # The FastMCP lifespan runs once per session, so it keeps the count
+        kwargs["lifespan"] = _counting_lifespan(kwargs.get("lifespan"))
+        self._open_sessions = 0
+        self._limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._tool_list = None
+        # Resource URI -> sessions subscribed to it; closed sessions drop out
+        self._subscriptions: dict[str, weakref.WeakSet] = {}
+        super().__init__(name, **kwargs)
+        REGISTRY.add_collector(_session_collector(weakref.ref(self)))
+
+    # tools/list is answered from a cached list of tool schemas that is only
+    # rebuilt when a tool is added or removed.
+
+    def add_tool(self, *args: Any, **kwargs: Any) -> None:
+        self._tool_list = None
+        super().add_tool(*args, **kwargs)
+
+    def remove_tool(self, name: str) -> None:
+        self._tool_list = None
+        super().remove_tool(name)
+
+    async def list_tools(self):
+        if self._tool_list is None:
+            self._tool_list = await super().list_tools()
+        return self._tool_list
+
+    # --- Resource subscriptions ---
+
+    def _setup_handlers(self) -> None:
+        super()._setup_handlers()
+        self._mcp_server.subscribe_resource()(self.subscribe_resource)
+        self._mcp_server.unsubscribe_resource()(self.unsubscribe_resource)
+        # The low-level server always advertises subscribe=False
+        get_capabilities = self._mcp_server.get_capabilities
+
+        def get_capabilities_with_subscribe(*args: Any, **kwargs: Any):
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        self._mcp_server.get_capabilities = get_capabilities_with_subscribe
+
+    async def subscribe_resource(self, uri) -> None:
+        session = self._mcp_server.request_context.session
+        self._subscriptions.setdefault(str(uri), weakref.WeakSet()).add(session)
+
+    async def unsubscribe_resource(self, uri) -> None:
+        sessions = self._subscriptions.get(str(uri))
+        if sessions is not None:
+            sessions.discard(self._mcp_server.request_context.session)
+
+    def subscriber_count(self, uri: str) -> int:
+        return len(self._subscriptions.get(uri, ()))
+
+    async def notify_resource_updated(self, uri: str) -> int:
+        """Tells the sessions subscribed to ``uri`` it changed; returns how many."""
+        sessions = list(self._subscriptions.get(uri, ()))
+        if not sessions:
+            return 0
+        results = await asyncio.gather(
+            *(session.send_resource_updated(AnyUrl(uri)) for session in sessions),
+            return_exceptions=True,
+        )
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                # The session's stream is gone; stop notifying it
+                self._subscriptions[uri].discard(session)
+        return sum(not isinstance(result, Exception) for result in results)
+
+    def _request_trace(self):
+        """Trace of the HTTP request carrying this MCP message, when profiled."""
+        if not settings.PROFILING_ENABLED:
+            return None
+        trace = current_trace()
+        if trace is not None:
+            return trace
+        try:
+            request = self._mcp_server.request_context.request
+        except LookupError:
+            return None
+        return trace_for_scope(request.scope) if request is not None else None
+
+    async def _observe(self, kind: str, name: str, call):
+        start = time.perf_counter()
+        outcome = "error"
+        trace = self._request_trace()
+        # Each message reads shared data (e.g. the job snapshot) at most once
+        begin_request_scope()
+        request_id = self._request_id()
+        if request_id is not None:
+            set_request_id(request_id)
+        try:
+            # MCP messages are dispatched on the session task, so the trace of
+            # the originating HTTP request is re-activated here.
+            with activate(trace), span(
+                f"mcp.{kind}", trace=trace, target=name
+            ), progress_reporter(self._progress_reporter()):
+                result = await call
+            outcome = "ok"
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            MCP_CALL_DURATION.labels(kind, name).observe(elapsed)
+            MCP_CALLS.labels(kind, name, outcome).inc()
+            if outcome != "ok" or (
+                logger.isEnabledFor(logging.INFO) and sampled(f"/mcp/{kind}/{name}")
+            ):
+                logger.log(
+                    logging.INFO if outcome == "ok" else logging.WARNING,
+                    "MCP %s %s %s",
+                    kind,
+                    name,
+                    outcome,
+                    extra={
+                        "kind": kind,
+                        "target": name,
+                        "outcome": outcome,
+                        "duration_ms": round(elapsed * 1000, 3),
+                    },
+                )
+
+    def _request_id(self) -> Optional[str]:
+        """ID of the HTTP request carrying this MCP message (see logs)."""
+        try:
+            request = self._mcp_server.request_context.request
+        except LookupError:
+            return None
+        if request is None:
+            return None
+        return request.headers.get(REQUEST_ID_HEADER.decode())
+
+    def _progress_reporter(self) -> Optional[ProgressReporter]:
+        """Sends progress for the current request, if its client asked for it."""
+        try:
+            context = self._mcp_server.request_context
+        except LookupError:
+            return None
+        token = context.meta.progressToken if context.meta is not None else None
+        if token is None:
+            return None
+
+        async def report(
+            progress: float, total: Optional[float], message: Optional[str]
+        ) -> None:
+            await context.session.send_progress_notification(
+                token,
+                progress,
+                total,
+                message,
+                related_request_id=str(context.request_id),
+            )
+
+        return report
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        return await self._observe(
+            "tool", name, self._limited_call_tool(name, arguments)
+        )
+
+    async def _limited_call_tool(self, name: str, arguments: dict[str, Any]):
+        limiter = self._session_limiter()
+        if limiter is None:
+            return await super().call_tool(name, arguments)
+        async with limiter.slot():
+            return await super().call_tool(name, arguments)
+
+    def _session_limiter(self) -> Optional[SessionLimiter]:
+        if self.max_in_flight_per_session <= 0:
+            return None
+        try:
+            session = self._mcp_server.request_context.session
+        except LookupError:
+            # Called directly, not from an MCP session
+            return None
+        limiter = self._limiters.get(session)
+        if limiter is None:
+            limiter = self._limiters[session] = SessionLimiter(
+                self.max_in_flight_per_session, self.max_queued_per_session
+            )
+        return limiter
+
+    def session_count(self) -> int:
+        """Open stateful streamable-HTTP sessions."""
+        return self._open_sessions
+
+    async def read_resource(self, uri):
+        return await self._observe("resource", str(uri), super().read_resource(uri))
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        return await self._observe("prompt", name, super().get_prompt(name, arguments))
+
+    # --- Streamable HTTP lifecycle ---
+
+    def http_app(self) -> "StreamableHTTPMount":
+        """ASGI app to mount in FastAPI; requires ``run_http()`` in the app lifespan."""
+        return StreamableHTTPMount(self)
+
+    @asynccontextmanager
+    async def run_http(self) -> AsyncIterator[None]:
+        """
+        Start a fresh streamable-HTTP session manager for one app lifespan.
+
+        FastAPI does not run the lifespan of mounted sub-applications, and a
+        session manager can only be run once, so a new one is built each time
+        the host application starts (e.g. once per TestClient context).
+        """
+        self._session_manager = None
+        self._streamable_app = self.streamable_http_app()
+        async with self.session_manager.run():
+            try:
+                yield
+            finally:
+                self._streamable_app = None
+
+
+def _session_collector(server_ref: "weakref.ref[InstrumentedFastMCP]"):
+    def collect() -> None:
+        server = server_ref()
+        if server is not None:
+            MCP_SESSIONS.labels(server.name).set(server.session_count())
+
+    return collect
+
+
+class StreamableHTTPMount:
+    """Delegates to the streamable-HTTP app of the currently running lifespan."""
+
+    def __init__(self, server: InstrumentedFastMCP):
+        self.server = server
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        streamable_app = getattr(self.server, "_streamable_app", None)
+        if streamable_app is None:
+            response = PlainTextResponse("MCP server is not running", status_code=503)
+            await response(scope, receive, send)
+            return
+        await streamable_app(scope, receive, send)
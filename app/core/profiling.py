@@ -0,0 +1,434 @@
+"""
+Opt-in request profiling and lightweight trace spans.
+
+A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>`` or when
+it is picked by the 1-in-N sampler (``PROFILING_SAMPLE_EVERY``). Profiled
+requests get:
+
+* a stack-sampling profile in folded-stack format (``flamegraph.pl``,
+  speedscope and inferno all read it) or a cProfile/pstats report;
+* trace spans for the handler, service calls, serialization and MCP dispatch,
+  returned in a ``Server-Timing`` header and stored with the profile.
+
+When profiling is disabled the middleware is not installed, routers do not
+wrap endpoints and ``span()`` is a single ContextVar lookup returning a shared
+no-op context manager.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from fastapi import APIRouter
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = "x-profile"
+PROFILE_MODE_HEADER = "x-profile-mode"
+PROFILE_MODES = ("sampling", "cprofile")
+
+_NOOP_SPAN = nullcontext()
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    duration: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Spans recorded for one profiled request."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self.endpoint_end: Optional[float] = None
+
+    def span(self, name: str, **attributes: Any) -> "_SpanContext":
+        return _SpanContext(self, name, attributes)
+
+    def add(self, name: str, start: float, end: float, **attributes: Any) -> None:
+        self.spans.append(Span(name, start - self.origin, end - start, attributes))
+
+    def server_timing(self) -> str:
+        """Render spans as a ``Server-Timing`` header value (durations in ms)."""
+        return ", ".join(
+            f'{s.name.replace(" ", "_")};dur={s.duration * 1000:.3f}'
+            for s in self.spans
+        )
+
+    def to_dict(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": s.name,
+                "start_ms": round(s.start * 1000, 3),
+                "duration_ms": round(s.duration * 1000, 3),
+                **({"attributes": s.attributes} if s.attributes else {}),
+            }
+            for s in self.spans
+        ]
+
+
+class _SpanContext:
+    __slots__ = ("trace", "name", "attributes", "start")
+
+    def __init__(self, trace: Trace, name: str, attributes: dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, self.start, time.perf_counter(), **self.attributes)
+        return False
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("cgcg_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the request being profiled, if any."""
+    return _current_trace.get()
+
+
+def span(name: str, trace: Optional[Trace] = None, **attributes: Any):
+    """
+    Context manager recording a span on the current trace.
+
+    Outside a profiled request this returns a shared no-op context manager.
+    """
+    trace = trace or _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return trace.span(name, **attributes)
+
+
+@contextmanager
+def activate(trace: Optional[Trace]) -> Iterator[None]:
+    """Make ``trace`` current for code running outside the request's task."""
+    if trace is None:
+        yield
+        return
+    token = _current_trace.set(trace)
+    try:
+        yield
+    finally:
+        _current_trace.reset(token)
+
+
+def trace_for_scope(scope: Scope) -> Optional[Trace]:
+    """Return the trace attached to an ASGI scope (used across task boundaries)."""
+    return scope.get("state", {}).get("trace")
+
+
+# --- Profilers ---
+
+
+_PATH_ROOTS = sorted(
+    {os.path.join(p, "") for p in sys.path if p and os.path.isdir(p)},
+    key=len,
+    reverse=True,
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for root in _PATH_ROOTS:
+        if filename.startswith(root):
+            filename = filename[len(root) :]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """
+    Sample the stack of one thread at a fixed interval into folded stacks.
+
+    The event loop runs on a single thread, so sampling it captures everything
+    the loop executes while the profiled request is in flight.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: StackCounter[str] = StackCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def output(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+class CProfiler:
+    """Deterministic cProfile run rendered as a pstats report."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def output(self) -> str:
+        buffer = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=buffer)
+        stats.sort_stats("cumulative").print_stats(50)
+        return buffer.getvalue()
+
+
+# --- Storage ---
+
+
+@dataclass
+class ProfileRecord:
+    id: str
+    method: str
+    path: str
+    mode: str
+    trace_id: str
+    duration_ms: float
+    spans: list[dict[str, Any]]
+    output: str
+
+
+class ProfileStore:
+    """Bounded in-memory store of recent profiles, optionally mirrored to disk."""
+
+    def __init__(self, max_items: int, output_dir: Optional[str] = None):
+        self.max_items = max_items
+        self.output_dir = output_dir
+        self._items: OrderedDict[str, ProfileRecord] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, record: ProfileRecord) -> None:
+        with self._lock:
+            self._items[record.id] = record
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            suffix = "folded" if record.mode == "sampling" else "pstats.txt"
+            path = os.path.join(self.output_dir, f"{record.id}.{suffix}")
+            with open(path, "w") as handle:
+                handle.write(record.output)
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        return self._items.get(profile_id)
+
+    def list(self) -> list[ProfileRecord]:
+        return list(reversed(self._items.values()))
+
+
+profile_store = ProfileStore(
+    settings.PROFILING_MAX_STORED, settings.PROFILING_OUTPUT_DIR
+)
+
+
+# --- Middleware ---
+
+
+def _parse_traceparent(value: Optional[str]) -> Optional[str]:
+    """Extract the trace id from a W3C ``traceparent`` header."""
+    if not value:
+        return None
+    parts = value.split("-")
+    if len(parts) == 4 and len(parts[1]) == 32:
+        return parts[1]
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that profiles selected requests.
+
+    Only one request is profiled at a time; requests selected while another
+    profile is running are served normally.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: Optional[str] = None,
+        sample_every: int = 0,
+        mode: str = "sampling",
+        interval: float = 0.001,
+        store: ProfileStore = profile_store,
+    ):
+        self.app = app
+        self.token = token
+        self.sample_every = sample_every
+        self.mode = mode
+        self.interval = interval
+        self.store = store
+        self._counter = itertools.count(1)
+        self._busy = threading.Lock()
+
+    def _selected(self, headers: dict[bytes, bytes]) -> bool:
+        given = headers.get(PROFILE_HEADER.encode())
+        if (
+            self.token
+            and given is not None
+            and secrets.compare_digest(given, self.token.encode())
+        ):
+            return True
+        return bool(self.sample_every) and next(self._counter) % self.sample_every == 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if not self._selected(headers) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._profile(scope, receive, send, headers)
+        finally:
+            self._busy.release()
+
+    async def _profile(
+        self, scope: Scope, receive: Receive, send: Send, headers
+    ) -> None:
+        mode = headers.get(PROFILE_MODE_HEADER.encode(), b"").decode() or self.mode
+        if mode not in PROFILE_MODES:
+            mode = self.mode
+        trace = Trace(_parse_traceparent(headers.get(b"traceparent", b"").decode()))
+        scope.setdefault("state", {})["trace"] = trace
+        profile_id = secrets.token_hex(8)
+        profiler = (
+            StackSampler(threading.get_ident(), self.interval)
+            if mode == "sampling"
+            else CProfiler()
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                trace.add("handler", trace.origin, now)
+                if trace.endpoint_end is not None:
+                    trace.add("serialize", trace.endpoint_end, now)
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Profile-Id"] = profile_id
+                response_headers["Server-Timing"] = trace.server_timing()
+            await send(message)
+
+        token = _current_trace.set(trace)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            _current_trace.reset(token)
+            end = time.perf_counter()
+            trace.add("request", trace.origin, end)
+            self.store.add(
+                ProfileRecord(
+                    id=profile_id,
+                    method=scope["method"],
+                    path=scope["path"],
+                    mode=mode,
+                    trace_id=trace.trace_id,
+                    duration_ms=round((end - trace.origin) * 1000, 3),
+                    spans=trace.to_dict(),
+                    output=profiler.output(),
+                )
+            )
+
+
+# --- Endpoint spans ---
+
+
+def traced_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap a route endpoint in an ``endpoint`` span.
+
+    The end timestamp is kept on the trace so the middleware can report the
+    time between the endpoint returning and the response starting, which is
+    FastAPI's response validation and serialization.
+    """
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return await endpoint(*args, **kwargs)
+            with trace.span("endpoint", function=endpoint.__name__):
+                result = await endpoint(*args, **kwargs)
+            trace.endpoint_end = time.perf_counter()
+            return result
+
+        async_wrapper.__traced__ = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return endpoint(*args, **kwargs)
+        with trace.span("endpoint", function=endpoint.__name__):
+            result = endpoint(*args, **kwargs)
+        trace.endpoint_end = time.perf_counter()
+        return result
+
+    sync_wrapper.__traced__ = True
+    return sync_wrapper
+
+
+class TracedAPIRouter(APIRouter):
+    """
+    APIRouter that wraps endpoints in trace spans when profiling is enabled.
+
+    Decorators such as ``@router.get`` still return the original function, so
+    stacking ``@mcp.tool()`` on top registers the unwrapped callable.
+    """
+
+    def add_api_route(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        if settings.PROFILING_ENABLED and not hasattr(endpoint, "__traced__"):
+            endpoint = traced_endpoint(endpoint)
+        super().add_api_route(path, endpoint, **kwargs)
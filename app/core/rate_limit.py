@@ -0,0 +1,88 @@
+"""
+Fixed-window rate limiting backed by the shared state backend.
+
+Counters live in ``app.core.backends`` so the limit holds across all workers
+(and machines, with Redis) instead of per process. Each client gets
+``RATE_LIMIT_PER_MINUTE`` requests per minute; further requests receive 429
+with a ``Retry-After`` header until the window rolls over.
+
+The counter update runs off the event loop. If the backend does not answer
+within BACKEND_TIMEOUT seconds (e.g. SQLite locked by another worker, Redis
+unreachable), or fails, the request is let through: the limiter fails open
+rather than stalling every request.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.backends import StateBackend, get_backend, run_blocking
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60
+BACKEND_TIMEOUT = 0.5
+EXEMPT_PATHS = frozenset({"/metrics"})
+
+
+def client_key(scope: Scope) -> str:
+    """Client identity: Fly's client IP header when proxied, else the peer address."""
+    for name, value in scope.get("headers", ()):
+        if name == b"fly-client-ip":
+            return value.decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware; the counter update is one atomic ``incr`` per request."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limit: int,
+        window: int = WINDOW_SECONDS,
+        backend: Optional[StateBackend] = None,
+    ):
+        self.app = app
+        self.limit = limit
+        self.window = window
+        self._backend = backend
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        backend = self._backend or get_backend()
+        now = time.time()
+        window_index = int(now // self.window)
+        key = f"ratelimit:{client_key(scope)}:{window_index}"
+
+        def count_request() -> int:
+            count = backend.incr(key)
+            if count == 1:
+                backend.expire(key, self.window * 2)
+            return count
+
+        try:
+            count = await asyncio.wait_for(
+                run_blocking(backend, count_request), BACKEND_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning("Rate limit check skipped: %r", e)
+            count = 0
+        if count > self.limit:
+            retry_after = int((window_index + 1) * self.window - now) + 1
+            response = JSONResponse(
+                {"detail": "Too Many Requests"},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
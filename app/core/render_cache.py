@@ -0,0 +1,107 @@
+"""
+Cache of rendered MCP resources and prompts, keyed by data version.
+
+Resources and prompts turn the current data into (sometimes large) text. The
+text only depends on the arguments and on the data, which carries a cheap
+version number (see ``http_cache``), so renders are cached per
+(name, arguments) for the current version:
+
+* a lookup with a newer version drops every entry rendered from older data,
+  so entries are invalidated exactly when the data changes;
+* entries are bounded by their total size in bytes, evicting the least
+  recently used first;
+* a render during which the version changed is returned but not stored, so
+  text built from newer data is never filed under an older version.
+"""
+
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.metrics import record_cache_lookup
+
+VersionGetter = Callable[[], Awaitable[Any]]
+
+
+class RenderCache:
+    """Size-bounded LRU of rendered text for one data version."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.version: Any = None
+        self.size = 0
+        self._items: OrderedDict[tuple, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: Any) -> Optional[str]:
+        with self._lock:
+            if version != self.version:
+                self._reset(version)
+                return None
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: tuple, version: Any, text: str) -> None:
+        size = len(text.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self.version:
+                self._reset(version)
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._items[key] = (text, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+
+    def _reset(self, version: Any) -> None:
+        self._items.clear()
+        self.size = 0
+        self.version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def cached_render(
+    cache: RenderCache, get_version: VersionGetter, name: Optional[str] = None
+):
+    """
+    Caches the text returned by an async resource/prompt function in ``cache``.
+
+    The wrapper keeps the function's signature, so it can be registered with
+    ``@mcp.resource()`` / ``@mcp.prompt()`` as usual.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[str]]):
+        cache_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> str:
+            if cache.max_bytes <= 0:
+                return await fn(*args, **kwargs)
+            key = (cache_name, args, tuple(sorted(kwargs.items())))
+            version = await get_version()
+            text = cache.get(key, version)
+            record_cache_lookup("mcp_render", text is not None)
+            if text is not None:
+                return text
+            text = await fn(*args, **kwargs)
+            if await get_version() == version:
+                cache.put(key, version, text)
+            return text
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,52 @@
+"""
+Request-scoped reuse of values read several times while serving one request.
+
+An HTTP request or an MCP message often reads the same data more than once:
+the ETag dependency reads the snapshot version, then the endpoint reads the
+jobs, then a helper reads them again. Inside a request scope the first read
+is remembered (``set_scoped``) and later reads return it (``get_scoped``), so
+the whole request sees one consistent snapshot even if it expires meanwhile.
+
+Scopes live in a context variable: ``begin_request_scope`` starts a fresh one
+for the current task, either as a router dependency (HTTP) or around an MCP
+message. Outside any scope nothing is remembered.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Hashable, Optional
+
+from fastapi import Depends
+
+_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def begin_request_scope() -> None:
+    """Starts an empty scope for the rest of the current task."""
+    # Every request runs in its own task (and context copy), so the scope
+    # ends with it and needs no reset
+    _scope.set({})
+
+
+def in_request_scope() -> bool:
+    """Whether the current task is serving a request (HTTP or MCP)."""
+    return _scope.get() is not None
+
+
+def get_scoped(key: Hashable) -> Any:
+    scope = _scope.get()
+    return scope.get(key) if scope is not None else None
+
+
+def set_scoped(key: Hashable, value: Any) -> None:
+    scope = _scope.get()
+    if scope is not None:
+        scope[key] = value
+
+
+async def _request_scope_dependency() -> None:
+    begin_request_scope()
+
+
+def request_scope():
+    """Router dependency giving each request its own scope; list it first."""
+    return Depends(_request_scope_dependency)
@@ -0,0 +1,113 @@
+"""
+Budgeted, resumable results for AI tools.
+
+Tools that can return a whole farm's worth of rows (``get_all_jobs``...) put a
+summary first and then as many rows as fit in ``TOOL_RESULT_MAX_BYTES`` of
+JSON, as FastMCP sends it. When rows are left over, the result carries an
+opaque continuation cursor that the caller passes back to get the next page,
+so an agent only pulls into its context the pages it actually needs.
+
+Cursors are stateless (URL-safe base64 JSON), so any worker can resume them.
+
+Long-running tools also report progress with ``report_progress``: inside an
+MCP call whose client asked for progress it sends
+``notifications/progress`` (see ``InstrumentedFastMCP``); anywhere else it
+does nothing.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressReporter = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar(
+    "progress_reporter", default=None
+)
+
+
+# --- Continuation cursors ---
+
+
+def encode_cursor(state: dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """The state in ``cursor``; ValueError if ``encode_cursor`` did not make it."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+    return state
+
+
+# --- Result size budget ---
+
+
+def json_size(value: Any, depth: int = 0) -> int:
+    """
+    Bytes ``value`` takes in a tool result, nested ``depth`` levels deep.
+
+    FastMCP sends results as JSON indented by two spaces per level, the
+    larger of the forms a tool's result is sent in (REST bodies are
+    compact), so that is what is measured.
+    """
+    text = json.dumps(value, indent=2, ensure_ascii=False, default=str)
+    return len(text.encode()) + text.count("\n") * 2 * depth
+
+
+def fit_to_budget(items: Iterable[Any], max_bytes: int, depth: int = 0) -> int:
+    """
+    How many leading ``items`` of a list nested ``depth`` levels deep fit
+    in ``max_bytes``.
+
+    At least one item is always taken, so paging makes progress even when a
+    single item is larger than the budget.
+    """
+    used = 0
+    count = 0
+    for item in items:
+        # Each item starts on its own indented line; every item after the
+        # first costs a separating comma too
+        used += json_size(item, depth) + 1 + 2 * depth + (count > 0)
+        if used > max_bytes and count > 0:
+            break
+        count += 1
+    return count
+
+
+# --- Progress notifications ---
+
+
+@contextmanager
+def progress_reporter(reporter: Optional[ProgressReporter]) -> Iterator[None]:
+    """Routes ``report_progress`` calls in this context to ``reporter``."""
+    token = _reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+async def report_progress(
+    progress: float, total: Optional[float] = None, message: Optional[str] = None
+) -> None:
+    reporter = _reporter.get()
+    if reporter is None:
+        return
+    try:
+        await reporter(progress, total, message)
+    except Exception as e:
+        # Progress is best effort; the client may already be gone
+        logger.warning("Progress notification failed: %s", e)
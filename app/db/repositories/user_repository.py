@@ -1,32 +1,161 @@
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
 from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.user_schemas import UserCreate, UserInDB
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
 from app.db.models.user import User
-from app.api.v1.schemas.user_schemas import UserCreate
+
+# Usernames per IN (...) query, well under SQLite's bound parameter limit
+USERNAME_CHUNK_SIZE = 500
+
+_MISSING = object()
+
+
+class UserCache:
+    """
+    Read-through cache of users by ID, email and username.
+
+    Entries are ``UserInDB`` snapshots (not ORM objects, which belong to the
+    session that loaded them), or ``None`` for a user that does not exist.
+    They expire after ``ttl`` seconds; past ``max_entries`` the least
+    recently used are evicted. The cache is per process: a user changed by
+    another worker may be served stale until its entries expire.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Optional[UserInDB]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """The cached user (or None), or ``_MISSING`` when not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                record_cache_lookup("users", True)
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        record_cache_lookup("users", False)
+        return _MISSING
+
+    def set(self, key: Hashable, user: Optional[UserInDB]) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add_user(self, user: UserInDB) -> None:
+        """Caches ``user`` under each of its keys."""
+        for key in _keys(user):
+            self.set(key, user)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _keys(user) -> list[tuple[str, object]]:
+    return [("id", user.id), ("email", user.email), ("username", user.username)]
+
+
+user_cache = UserCache(settings.USER_CACHE_TTL, settings.USER_CACHE_MAX_ENTRIES)
+
 
 class UserRepository:
-    def __init__(self, db_session: Session):
+    """
+    User storage; every method returns ``UserInDB`` snapshots, never the
+    session's ORM objects.
+
+    ``get_users_by_usernames`` is the bulk lookup for mapping the ``user`` of
+    Deadline jobs to CGCG accounts. Nothing calls it yet: the user endpoints
+    are still placeholders and the deadline module serves job users as plain
+    strings.
+    """
+
+    def __init__(self, db_session: Session, cache: UserCache = user_cache):
         self.db = db_session
+        self.cache = cache
 
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    def _get_user_by(self, field: str, column, value) -> Optional[UserInDB]:
+        cached = self.cache.get((field, value))
+        if cached is not _MISSING:
+            return cached
+        db_user = self.db.query(User).filter(column == value).first()
+        if db_user is None:
+            self.cache.set((field, value), None)
+            return None
+        user = UserInDB.model_validate(db_user)
+        self.cache.add_user(user)
+        return user
 
-    def get_user_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+    def get_user_by_id(self, user_id: int) -> Optional[UserInDB]:
+        return self._get_user_by("id", User.id, user_id)
 
-    def get_user_by_username(self, username: str) -> Optional[User]:
-        return self.db.query(User).filter(User.username == username).first()
+    def get_user_by_email(self, email: str) -> Optional[UserInDB]:
+        return self._get_user_by("email", User.email, email)
 
-    def create_user(self, user: UserCreate, hashed_password: str) -> User:
+    def get_user_by_username(self, username: str) -> Optional[UserInDB]:
+        return self._get_user_by("username", User.username, username)
+
+    def get_users_by_usernames(self, usernames: Iterable[str]) -> dict[str, UserInDB]:
+        """
+        Users by username for a whole batch (e.g. the ``user`` of every job in
+        a page): cached users are served as is and the rest are loaded with
+        one IN query per USERNAME_CHUNK_SIZE names. Unknown usernames are left
+        out of the result.
+        """
+        found: dict[str, UserInDB] = {}
+        missing = []
+        for username in dict.fromkeys(usernames):
+            cached = self.cache.get(("username", username))
+            if cached is _MISSING:
+                missing.append(username)
+            elif cached is not None:
+                found[username] = cached
+        for start in range(0, len(missing), USERNAME_CHUNK_SIZE):
+            chunk = missing[start : start + USERNAME_CHUNK_SIZE]
+            for db_user in self.db.query(User).filter(User.username.in_(chunk)):
+                user = UserInDB.model_validate(db_user)
+                self.cache.add_user(user)
+                found[user.username] = user
+            for username in chunk:
+                if username not in found:
+                    self.cache.set(("username", username), None)
+        return found
+
+    def create_user(self, user: UserCreate, hashed_password: str) -> UserInDB:
         db_user = User(
             username=user.username,
             email=user.email,
             full_name=user.full_name,
-            hashed_password=hashed_password
+            hashed_password=hashed_password,
         )
         self.db.add(db_user)
         self.db.commit()
         self.db.refresh(db_user)
-        return db_user
+        # Replaces the cached "no such user" answers for the new user
+        created = UserInDB.model_validate(db_user)
+        self.cache.add_user(created)
+        return created
+
 
 def get_user_repository(db: Session):
     return UserRepository(db)
@@ -1 +1,5 @@
 # Placeholder for database session management (e.g., SQLAlchemy)
+from sqlalchemy.orm import declarative_base
+
+# Declarative base of the ORM models (app/db/models)
+Base = declarative_base()
@@ -0,0 +1,289 @@
+"""
+Render farm analytics: progress rates, ETAs, throughput and queue waits.
+
+``FarmAnalytics`` observes every new job snapshot (the service calls it in a
+worker thread when a refresh brings new content) and updates its state
+incrementally instead of recomputing from scratch:
+
+* progress rates: each job's progress is matched to its previous observation
+  by ID; the change over the elapsed time updates an exponentially weighted
+  rate (percent per second). Jobs not yet observed twice fall back to their
+  average rate since submission, from ``created_at``/``updated_at``;
+* queue waits: a job seen queued and then active waited from ``created_at``
+  until that observation; recent waits are kept in a bounded window.
+
+Everything else is computed in bulk over the snapshot columns on request:
+ETAs for all active jobs at once, completions per hour from the ``updated_at``
+of completed jobs, the farm's current progress throughput as the sum of the
+rates, and the ages of the jobs still queued.
+
+State is per process; with several workers each keeps its own estimates.
+The service imports this module on the first refresh, off the event loop, so
+NumPy stays out of the startup path.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from .snapshot import JobSnapshot
+
+ACTIVE_STATUSES = ["rendering", "processing"]
+QUEUED_STATUSES = ["queued", "pending"]
+COMPLETED_STATUSES = ["completed"]
+
+# Weight of the newest observed rate in the moving average
+RATE_ALPHA = 0.3
+MAX_RECENT_WAITS = 10_000
+WAIT_WINDOW = 24 * 3600
+
+
+def _stats(values: np.ndarray) -> dict:
+    """Count, mean, median, 90th percentile and max of ``values`` (seconds)."""
+    if not len(values):
+        return {"count": 0, "mean": None, "p50": None, "p90": None, "max": None}
+    p50, p90 = np.percentile(values, [50, 90])
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "max": float(values.max()),
+    }
+
+
+class FarmAnalytics:
+    """Per-job rate tracking plus bulk aggregates; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Optional[JobSnapshot] = None
+        self._index: dict[str, int] = {}
+        self._progress = np.empty(0)
+        self._rate = np.empty(0)
+        self._queued = np.empty(0, dtype=bool)
+        self._observed_at = math.nan
+        # (observed_at, wait seconds, user) of jobs seen leaving the queue
+        self._waits: deque[tuple[float, float, str]] = deque(maxlen=MAX_RECENT_WAITS)
+
+    def observe(self, jobs: JobSnapshot, now: Optional[float] = None) -> None:
+        """Folds a new snapshot into the tracked rates and queue waits."""
+        now = time.time() if now is None else now
+        query = jobs.query
+        progress = query.numeric["progress"]
+        active = query.mask(status=ACTIVE_STATUSES)
+        queued = query.mask(status=QUEUED_STATUSES)
+        with self._lock:
+            if jobs is self._jobs:
+                return
+            previous = np.fromiter(
+                (self._index.get(job_id, -1) for job_id in jobs.ids),
+                dtype=np.intp,
+                count=len(jobs),
+            )
+            known = previous >= 0
+            rate = np.full(len(jobs), np.nan)
+            rate[known] = self._rate[previous[known]]
+
+            elapsed = now - self._observed_at
+            if elapsed > 0:
+                gained = np.full(len(jobs), np.nan)
+                gained[known] = progress[known] - self._progress[previous[known]]
+                moved = known & active & (gained > 0)
+                observed = gained[moved] / elapsed
+                old = rate[moved]
+                rate[moved] = np.where(
+                    np.isnan(old),
+                    observed,
+                    RATE_ALPHA * observed + (1 - RATE_ALPHA) * old,
+                )
+
+                # Jobs that were queued last time and are active now left the queue
+                was_queued = np.zeros(len(jobs), dtype=bool)
+                was_queued[known] = self._queued[previous[known]]
+                started = np.flatnonzero(active & was_queued)
+                created = query.numeric["created_at"][started]
+                users = jobs.categories["user"]
+                for row, submitted in zip(started.tolist(), created.tolist()):
+                    if not math.isnan(submitted):
+                        self._waits.append(
+                            (now, max(0.0, now - submitted), users.value(row))
+                        )
+
+            self._jobs = jobs
+            self._index = jobs.row_index
+            self._progress = progress.copy()
+            self._rate = rate
+            self._queued = queued.copy()
+            self._observed_at = now
+
+    def rates(self, jobs: JobSnapshot) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Progress rate (percent per second) of every row of ``jobs``, and
+        whether it was observed across snapshots rather than estimated.
+        """
+        query = jobs.query
+        with self._lock:
+            if jobs is self._jobs:
+                tracked = self._rate.copy()
+            else:
+                previous = np.fromiter(
+                    (self._index.get(job_id, -1) for job_id in jobs.ids),
+                    dtype=np.intp,
+                    count=len(jobs),
+                )
+                tracked = np.full(len(jobs), np.nan)
+                tracked[previous >= 0] = self._rate[previous[previous >= 0]]
+        observed = ~np.isnan(tracked)
+        # Fallback: average rate since submission
+        progress = query.numeric["progress"]
+        span = query.numeric["updated_at"] - query.numeric["created_at"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            average = np.where((progress > 0) & (span > 0), progress / span, np.nan)
+        return np.where(observed, tracked, average), observed
+
+    def estimates(
+        self, jobs: JobSnapshot, now: Optional[float] = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Bulk ETAs for every row: remaining seconds and completion time
+        (NaN when unknown), plus the rates they are based on.
+
+        Completed jobs have zero remaining time and their ``updated_at`` as
+        completion time; only active jobs with a known rate get an estimate.
+        """
+        now = time.time() if now is None else now
+        query = jobs.query
+        rate, observed = self.rates(jobs)
+        progress = query.numeric["progress"]
+        active = query.mask(status=ACTIVE_STATUSES)
+        completed = query.mask(status=COMPLETED_STATUSES)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            remaining = np.where(active & (rate > 0), (100.0 - progress) / rate, np.nan)
+        remaining = np.maximum(remaining, 0.0)
+        remaining[completed] = 0.0
+        # Completed jobs report when they finished, as far as Deadline says
+        completion = np.where(completed, query.numeric["updated_at"], now + remaining)
+        return {
+            "rate": rate,
+            "observed": observed,
+            "remaining": remaining,
+            "completion": completion,
+        }
+
+    def throughput(
+        self,
+        jobs: JobSnapshot,
+        hours: float = 24.0,
+        user: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> dict:
+        """Completions per hour, current progress throughput and queue waits."""
+        now = time.time() if now is None else now
+        query = jobs.query
+        window = hours * 3600
+        selection = query.mask(user=user) if user else None
+
+        def restrict(mask: np.ndarray) -> np.ndarray:
+            return mask if selection is None else mask & selection
+
+        updated = query.numeric["updated_at"]
+        completed = restrict(query.mask(status=COMPLETED_STATUSES)) & (
+            updated >= now - window
+        )
+        per_user = query.count_by("user", completed)
+
+        active = restrict(query.mask(status=ACTIVE_STATUSES))
+        rate, _ = self.rates(jobs)
+        active_rates = rate[active]
+        # Percent per second summed over active jobs, as whole jobs per hour
+        jobs_per_hour = float(np.nansum(active_rates)) * 3600 / 100
+
+        queued = restrict(query.mask(status=QUEUED_STATUSES))
+        created = query.numeric["created_at"][queued]
+        ages = now - created[~np.isnan(created)]
+        with self._lock:
+            waits = np.array(
+                [
+                    wait
+                    for seen, wait, owner in self._waits
+                    if seen >= now - WAIT_WINDOW
+                    and (not user or owner.lower() == user.lower())
+                ],
+                dtype=np.float64,
+            )
+        return {
+            "hours": hours,
+            "user": user,
+            "completed": int(np.count_nonzero(completed)),
+            "completed_per_hour": (
+                float(np.count_nonzero(completed)) / hours if hours else 0.0
+            ),
+            "completed_by_user": per_user,
+            "active_jobs": int(np.count_nonzero(active)),
+            "active_jobs_with_rate": int(np.count_nonzero(~np.isnan(active_rates))),
+            "progress_jobs_per_hour": jobs_per_hour,
+            "queued_jobs": int(np.count_nonzero(queued)),
+            "queued_age_seconds": _stats(ages),
+            "recent_wait_seconds": _stats(waits),
+        }
+
+    def estimate_completion(
+        self,
+        jobs: JobSnapshot,
+        job_id: Optional[str] = None,
+        user: Optional[str] = None,
+        limit: int = 20,
+        now: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        ETA records for one job, or for the active jobs (optionally of one
+        user) finishing soonest, unknown estimates last.
+        """
+        now = time.time() if now is None else now
+        estimates = self.estimates(jobs, now)
+        if job_id is not None:
+            row = jobs.index_of(job_id)
+            rows = [] if row is None else [row]
+        else:
+            query = jobs.query
+            active = query.mask(status=ACTIVE_STATUSES, user=user or None)
+            candidates = np.flatnonzero(active)
+            completion = np.nan_to_num(estimates["completion"][candidates], nan=np.inf)
+            rows = candidates[np.lexsort((candidates, completion))][:limit].tolist()
+        return [self._estimate_record(jobs, row, estimates) for row in rows]
+
+    @staticmethod
+    def _estimate_record(
+        jobs: JobSnapshot, row: int, estimates: dict[str, np.ndarray]
+    ) -> dict:
+        rate = float(estimates["rate"][row])
+        remaining = float(estimates["remaining"][row])
+        completion = float(estimates["completion"][row])
+        status = jobs.categories["status"].value(row)
+        if status.lower() in COMPLETED_STATUSES:
+            basis = "completed"
+        elif math.isnan(remaining):
+            basis = "unknown"
+        else:
+            basis = "observed" if estimates["observed"][row] else "average"
+        record = jobs.records([row], ["id", "name", "user", "status", "progress"])[0]
+        return {
+            "job_id": record.pop("id"),
+            **record,
+            "rate_per_hour": None if math.isnan(rate) else rate * 3600,
+            "remaining_seconds": None if math.isnan(remaining) else remaining,
+            "estimated_completion": (
+                None
+                if math.isnan(completion)
+                else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(completion))
+            ),
+            "basis": basis,
+        }
+
+
+farm_analytics = FarmAnalytics()
@@ -0,0 +1,383 @@
+"""
+Embedded time-series history of farm aggregates.
+
+A background sampler records, every ``HISTORY_SAMPLE_INTERVAL`` seconds, the
+aggregates of the current job snapshot (when it was fetched within the
+interval): total jobs, jobs per status, running
+jobs and running jobs per user. Each sample is folded into fixed-width
+buckets at several resolutions at once (count, sum, min and max per bucket),
+so a range query over weeks reads a few hundred pre-aggregated hourly rows
+instead of every sample:
+
+    resolution   retention
+    1 minute     2 days
+    5 minutes    14 days
+    1 hour       400 days
+
+Buckets live in one SQLite table keyed by (resolution, metric, label, bucket)
+in WAL mode, so range queries are index range scans and readers never block
+the sampler. Older buckets are pruned per resolution. With several workers,
+the shared state backend elects one writer per sampling interval.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, Mapping, Optional
+
+from app.core.backends import get_backend, run_blocking
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (bucket width, retention) in seconds, finest first
+RESOLUTIONS = (
+    (60, 2 * 24 * 3600),
+    (300, 14 * 24 * 3600),
+    (3600, 400 * 24 * 3600),
+)
+MAX_POINTS = 500
+PRUNE_INTERVAL = 3600
+# A current value above this share of the recent hourly averages is "busier than usual"
+BUSY_PERCENTILE = 75.0
+SAMPLE_LOCK_KEY = "deadline:history:sample:{bucket}"
+
+Metrics = Mapping[tuple[str, str], float]
+
+
+class HistoryStore:
+    """SQLite-backed multi-resolution rollups; see the module docstring."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._pruned_at = 0.0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS rollups (
+                resolution INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                label TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                sum REAL NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                PRIMARY KEY (resolution, metric, label, bucket)
+            ) WITHOUT ROWID;
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads; an
+        # in-memory database is shared by keeping a single connection
+        if self.path == ":memory:":
+            conn = self.__dict__.get("_memory_conn")
+            if conn is None:
+                conn = self._memory_conn = sqlite3.connect(
+                    ":memory:", isolation_level=None, check_same_thread=False
+                )
+            return conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, timestamp: float, metrics: Metrics) -> None:
+        """Folds one sample of every metric into the bucket of each resolution."""
+        rows = [
+            (
+                resolution,
+                metric,
+                label,
+                int(timestamp // resolution) * resolution,
+                value,
+                value,
+                value,
+            )
+            for resolution, _ in RESOLUTIONS
+            for (metric, label), value in metrics.items()
+        ]
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO rollups
+                    (resolution, metric, label, bucket, count, sum, min, max)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT (resolution, metric, label, bucket) DO UPDATE SET
+                    count = count + 1,
+                    sum = sum + excluded.sum,
+                    min = min(min, excluded.min),
+                    max = max(max, excluded.max)
+                """,
+                rows,
+            )
+            if timestamp - self._pruned_at >= PRUNE_INTERVAL:
+                for resolution, retention in RESOLUTIONS:
+                    conn.execute(
+                        "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                        (resolution, timestamp - retention),
+                    )
+                self._pruned_at = timestamp
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def pick_resolution(
+        self, start: float, end: float, now: Optional[float] = None
+    ) -> int:
+        """Finest resolution still retained at ``start`` that fits MAX_POINTS."""
+        now = time.time() if now is None else now
+        for resolution, retention in RESOLUTIONS:
+            if start >= now - retention and (end - start) / resolution <= MAX_POINTS:
+                return resolution
+        return RESOLUTIONS[-1][0]
+
+    def query(
+        self,
+        metric: str,
+        label: str = "",
+        start: float = 0.0,
+        end: Optional[float] = None,
+        resolution: Optional[int] = None,
+    ) -> tuple[int, list[dict]]:
+        """
+        Points of one series between ``start`` and ``end`` (epoch seconds).
+
+        Returns the resolution used and, per bucket, its start time and the
+        average, minimum and maximum of the samples in it. Buckets with no
+        samples are absent.
+        """
+        end = time.time() if end is None else end
+        if resolution is None:
+            resolution = self.pick_resolution(start, end)
+        rows = (
+            self._connection()
+            .execute(
+                """
+            SELECT bucket, sum / count, min, max FROM rollups
+            WHERE resolution = ? AND metric = ? AND label = ?
+                AND bucket >= ? AND bucket <= ?
+            ORDER BY bucket
+            """,
+                (resolution, metric, label, int(start // resolution) * resolution, end),
+            )
+            .fetchall()
+        )
+        return resolution, [
+            {"timestamp": bucket, "avg": avg, "min": low, "max": high}
+            for bucket, avg, low, high in rows
+        ]
+
+    def latest(self, metric: str, label: str = "") -> Optional[dict]:
+        """The most recent finest-resolution point of a series."""
+        row = (
+            self._connection()
+            .execute(
+                """
+            SELECT bucket, sum / count, min, max FROM rollups
+            WHERE resolution = ? AND metric = ? AND label = ?
+            ORDER BY bucket DESC LIMIT 1
+            """,
+                (RESOLUTIONS[0][0], metric, label),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        bucket, avg, low, high = row
+        return {"timestamp": bucket, "avg": avg, "min": low, "max": high}
+
+    def compare(
+        self,
+        metric: str,
+        label: str = "",
+        days: float = 7.0,
+        now: Optional[float] = None,
+    ) -> dict:
+        """
+        Latest value of a series against its hourly averages over the past ``days``.
+
+        ``percentile`` is the share of those hours at or below the current
+        value; ``low``/``high`` are the 10th and 90th percentiles of the hours.
+        """
+        now = time.time() if now is None else now
+        latest = self.latest(metric, label)
+        _, points = self.query(
+            metric, label, now - days * 24 * 3600, now, RESOLUTIONS[-1][0]
+        )
+        hourly = sorted(point["avg"] for point in points)
+        current = latest["avg"] if latest else None
+        rank = percentile_rank(current, hourly) if current is not None else math.nan
+        return {
+            "metric": metric,
+            "label": label,
+            "days": days,
+            "current": current,
+            "usual": sum(hourly) / len(hourly) if hourly else None,
+            "low": _quantile(hourly, 0.1),
+            "high": _quantile(hourly, 0.9),
+            "percentile": None if math.isnan(rank) else round(rank, 1),
+            "busier_than_usual": not math.isnan(rank) and rank > BUSY_PERCENTILE,
+        }
+
+    def series(self) -> dict[str, list[str]]:
+        """Recorded metric names and the labels of each."""
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT DISTINCT metric, label FROM rollups"
+                " WHERE resolution = ? ORDER BY metric, label",
+                (RESOLUTIONS[-1][0],),
+            )
+            .fetchall()
+        )
+        result: dict[str, list[str]] = {}
+        for metric, label in rows:
+            result.setdefault(metric, []).append(label)
+        return result
+
+    def close(self) -> None:
+        conn = self.__dict__.pop("_memory_conn", None) or getattr(
+            self._local, "conn", None
+        )
+        if conn is not None:
+            conn.close()
+        self._local = threading.local()
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds of an ISO 8601 time (UTC when no offset is given)."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def snapshot_metrics(
+    jobs, running_statuses: Iterable[str]
+) -> dict[tuple[str, str], float]:
+    """Aggregates of one job snapshot, keyed by (metric, label)."""
+    query = jobs.query
+    running = query.mask(status=list(running_statuses))
+    metrics: dict[tuple[str, str], float] = {
+        ("jobs", ""): len(jobs),
+        ("running", ""): query.count(running),
+    }
+    for status, count in query.count_by("status").items():
+        metrics[("status", status)] = count
+    for user, count in query.count_by("user", running).items():
+        metrics[("user_running", user)] = count
+    return metrics
+
+
+def _quantile(ordered: list[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def percentile_rank(value: float, ordered: list[float]) -> float:
+    """Share (0-100) of the sorted ``ordered`` values that are at or below ``value``."""
+    if not ordered:
+        return math.nan
+    return 100.0 * bisect_right(ordered, value) / len(ordered)
+
+
+class HistorySampler:
+    """Background task recording the snapshot aggregates every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        service,
+        store: HistoryStore,
+        interval: float,
+        running_statuses: Iterable[str],
+    ):
+        self.service = service
+        self.store = store
+        self.interval = interval
+        self.running_statuses = list(running_statuses)
+        self._task: Optional[asyncio.Task] = None
+
+    async def sample(self, now: Optional[float] = None) -> bool:
+        """
+        Records one sample unless another worker already did for this
+        interval, or no snapshot was fetched from Deadline since the last one.
+
+        The sampler only reads the snapshot requests and the sync scheduler
+        keep up to date; it never calls Deadline itself, so an idle machine
+        stays idle (and leaves a gap in the history).
+        """
+        snapshot = self.service.cached_snapshot
+        if (
+            snapshot is None
+            or snapshot.restored
+            or self.service.last_fetch_failed
+            or time.monotonic() - snapshot.fetched_at >= self.interval
+        ):
+            return False
+        now = time.time() if now is None else now
+        bucket = int(now // self.interval)
+        backend = get_backend()
+        claimed = await run_blocking(
+            backend,
+            lambda: backend.set(
+                SAMPLE_LOCK_KEY.format(bucket=bucket),
+                "1",
+                ex=self.interval * 2,
+                nx=True,
+            ),
+        )
+        if not claimed:
+            return False
+        metrics = snapshot_metrics(snapshot.jobs, self.running_statuses)
+        await asyncio.to_thread(self.store.record, now, metrics)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.exception("History sample failed: %s", e)
+            await asyncio.sleep(self.interval - time.time() % self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """The history store for this process, opened from settings on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore(settings.HISTORY_DB_PATH)
+    return _store
@@ -0,0 +1,157 @@
+"""
+Local mock of the Deadline web service.
+
+Generates N synthetic jobs (deterministic for a given seed) and serves them
+from ``GET /api/jobs`` in the same shape ``DeadlineService`` expects, and
+accepts job commands on ``PUT /api/jobs`` (``{"Command": "suspend", "JobID":
+...}``; also ``resume``, ``requeue`` and ``priority`` with a ``Priority``). Used by
+the benchmark suite and tests so everything can run offline, either
+in-process through ``httpx.ASGITransport`` or as a standalone server:
+
+    python -m app.modules.deadline.mock_server --jobs 10000 --port 8082
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Body, FastAPI, HTTPException, Query, Response
+
+# Status a job is left in by each command (None: unchanged)
+COMMAND_STATUSES = {
+    "suspend": "Suspended",
+    "resume": "Queued",
+    "requeue": "Queued",
+    "priority": None,
+}
+STATUSES = ["Rendering", "Queued", "Completed", "Failed", "Suspended", "Pending"]
+STATUS_WEIGHTS = [20, 25, 40, 5, 5, 5]
+REGIONS = ["us-east", "eu-west", "asia-pacific"]
+TASKS = ["comp", "light", "fx", "anim", "lookdev"]
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def generate_jobs(count: int, seed: int = 0, users: int = 50) -> list[dict]:
+    """Builds ``count`` synthetic job dicts with a realistic status/user mix."""
+    rng = random.Random(seed)
+    user_pool = [f"artist_{i:03d}" for i in range(users)]
+    jobs = []
+    for i in range(count):
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        created = EPOCH + timedelta(seconds=rng.randrange(0, 90 * 24 * 3600))
+        updated = created + timedelta(seconds=rng.randrange(0, 48 * 3600))
+        if status == "Completed":
+            progress = 100.0
+        elif status in ("Queued", "Pending"):
+            progress = 0.0
+        else:
+            progress = round(rng.uniform(0, 99), 1)
+        jobs.append(
+            {
+                "id": f"job-{i:07d}",
+                "name": (
+                    f"Scene_{rng.randrange(1, 60):02d}_Shot_{rng.randrange(1, 400):03d}"
+                    f"_{rng.choice(TASKS)}_v{rng.randrange(1, 30):03d}"
+                ),
+                "status": status,
+                "user": rng.choice(user_pool),
+                "region": rng.choice(REGIONS),
+                "priority": rng.randrange(0, 101),
+                "progress": progress,
+                "created_at": _timestamp(created),
+                "updated_at": _timestamp(updated),
+            }
+        )
+    return jobs
+
+
+def create_mock_app(
+    job_count: int = 1000, seed: int = 0, latency: float = 0.0
+) -> FastAPI:
+    """
+    Creates a mock Deadline web service holding ``job_count`` jobs.
+
+    ``latency`` adds an artificial delay (seconds) to every upstream call so
+    benchmarks can model a remote Deadline server.
+    """
+    app = FastAPI(title="Mock Deadline Web Service")
+    app.state.jobs = generate_jobs(job_count, seed)
+    app.state.requests = 0
+    app.state.body = json.dumps(app.state.jobs).encode()
+    app.state.commands = []
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+
+    @app.get("/api/jobs")
+    async def list_jobs(job_id: Optional[str] = Query(None, alias="JobID")):
+        app.state.requests += 1
+        if latency:
+            await asyncio.sleep(latency)
+        if job_id is None:
+            if app.state.body is None:
+                app.state.body = json.dumps(app.state.jobs).encode()
+            return Response(content=app.state.body, media_type="application/json")
+        wanted = set(job_id.split(","))
+        return [job for job in app.state.jobs if job["id"] in wanted]
+
+    @app.put("/api/jobs")
+    async def job_command(command: dict = Body(...)):
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            if latency:
+                await asyncio.sleep(latency)
+            name = command.get("Command")
+            if name not in COMMAND_STATUSES:
+                raise HTTPException(status_code=400, detail=f"Unknown command: {name}")
+            job = next(
+                (job for job in app.state.jobs if job["id"] == command.get("JobID")),
+                None,
+            )
+            if job is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            app.state.commands.append(command)
+            # Like Deadline, resume only requeues suspended jobs
+            if COMMAND_STATUSES[name] is not None and (
+                name != "resume" or job["status"].lower() == "suspended"
+            ):
+                job["status"] = COMMAND_STATUSES[name]
+            if name == "requeue":
+                job["progress"] = 0.0
+            if name == "priority":
+                job["priority"] = int(command["Priority"])
+            # Re-serialized on the next listing
+            app.state.body = None
+            return "Success"
+        finally:
+            app.state.in_flight -= 1
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8082)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_mock_app(args.jobs, args.seed, args.latency),
+        host="127.0.0.1",
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+On-disk copy of the Deadline job snapshot for warm restarts.
+
+A machine that was stopped (e.g. by Fly's auto-stop) would otherwise answer
+its first requests only after a full Deadline fetch. ``SnapshotPersister``
+saves the current snapshot and its aggregates every
+DEADLINE_SNAPSHOT_SAVE_INTERVAL seconds (and on shutdown) when its content
+changed; at startup ``load()`` puts the saved copy back in the service, which
+serves it straight away and refreshes it from Deadline in the background.
+
+The file is the snapshot's own columnar layout:
+
+* a magic line and a 4-byte header length;
+* a JSON header with the metadata (fingerprint, version, save time), the
+  job IDs and names, the category tables, non-canonical timestamps, the
+  aggregates and the position of every numeric column;
+* the numeric columns (category codes, priority, progress, timestamps) as the
+  raw bytes of their ``array``, read back with one ``frombytes`` each.
+
+Files are replaced atomically, so a reader (or a crash) never sees half of one.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import time
+from array import array
+from dataclasses import asdict
+from typing import Optional
+
+from .service import DeadlineSnapshot, JobStatistics
+from .snapshot import CATEGORY_COLUMNS, TIMESTAMP_COLUMNS, Category, JobSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CGCG-DEADLINE-SNAPSHOT 1\n"
+HEADER_LENGTH = struct.Struct("<I")
+# Fingerprints of data not worth keeping: failed fetches and the sample jobs
+UNSAVED_FINGERPRINTS = {"empty", "sample"}
+
+
+def _columns(jobs: JobSnapshot) -> dict[str, array]:
+    columns = {
+        f"{name}_codes": jobs.categories[name].codes for name in CATEGORY_COLUMNS
+    }
+    columns["priority"] = jobs.priority
+    columns["progress"] = jobs.progress
+    for name in TIMESTAMP_COLUMNS:
+        columns[name] = jobs.timestamps[name]
+    return columns
+
+
+def dump_snapshot(
+    snapshot: DeadlineSnapshot, statistics: Optional[JobStatistics] = None
+) -> bytes:
+    jobs = snapshot.jobs
+    layout = []
+    blobs = []
+    offset = 0
+    for name, column in _columns(jobs).items():
+        blob = column.tobytes()
+        layout.append([name, column.typecode, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+    header = {
+        "fingerprint": snapshot.fingerprint,
+        "version": snapshot.version,
+        "saved_at": time.time(),
+        "byteorder": sys.byteorder,
+        "ids": jobs.ids,
+        "names": jobs.names,
+        "categories": {name: jobs.categories[name].values for name in CATEGORY_COLUMNS},
+        "raw_timestamps": [
+            [column, row, text] for (column, row), text in jobs.raw_timestamps.items()
+        ],
+        "statistics": asdict(statistics) if statistics is not None else None,
+        "columns": layout,
+    }
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+    return b"".join([MAGIC, HEADER_LENGTH.pack(len(encoded)), encoded, *blobs])
+
+
+def load_snapshot(
+    data: bytes,
+) -> tuple[DeadlineSnapshot, Optional[JobStatistics], float]:
+    """
+    The snapshot, its aggregates and the time it was saved.
+
+    Raises ValueError if ``data`` is not a complete snapshot file.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a Deadline snapshot file")
+    start = len(MAGIC) + HEADER_LENGTH.size
+    try:
+        (length,) = HEADER_LENGTH.unpack_from(data, len(MAGIC))
+        header = json.loads(data[start : start + length])
+    except (struct.error, ValueError):
+        raise ValueError("Corrupt Deadline snapshot header") from None
+
+    view = memoryview(data)[start + length :]
+    rows = len(header["ids"])
+    columns = {}
+    for name, typecode, offset, size in header["columns"]:
+        column = array(typecode)
+        column.frombytes(view[offset : offset + size])
+        if len(column) != rows:
+            raise ValueError(f"Truncated Deadline snapshot column: {name}")
+        if header["byteorder"] != sys.byteorder:
+            column.byteswap()
+        columns[name] = column
+
+    jobs = JobSnapshot()
+    jobs.ids = header["ids"]
+    jobs.names = header["names"]
+    for name in CATEGORY_COLUMNS:
+        category = Category()
+        category.values = header["categories"][name]
+        category.index = {value: code for code, value in enumerate(category.values)}
+        category.codes = columns[f"{name}_codes"]
+        jobs.categories[name] = category
+    jobs.priority = columns["priority"]
+    jobs.progress = columns["progress"]
+    jobs.timestamps = {name: columns[name] for name in TIMESTAMP_COLUMNS}
+    jobs.raw_timestamps = {
+        (column, row): text for column, row, text in header["raw_timestamps"]
+    }
+
+    snapshot = DeadlineSnapshot(
+        version=header["version"],
+        jobs=jobs,
+        fingerprint=header["fingerprint"],
+        fetched_at=time.monotonic(),
+    )
+    statistics = JobStatistics(**header["statistics"]) if header["statistics"] else None
+    return snapshot, statistics, header["saved_at"]
+
+
+class SnapshotPersister:
+    """Saves the service's snapshot to ``path`` every ``interval`` s and restores it."""
+
+    def __init__(self, service, path: str, interval: float):
+        self.service = service
+        self.path = path
+        self.interval = interval
+        self.saved_fingerprint: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> bool:
+        """Restores the saved snapshot into the service; False if none is usable."""
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+            snapshot, statistics, saved_at = load_snapshot(data)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring saved Deadline snapshot %s: %s", self.path, e)
+            return False
+        self.saved_fingerprint = snapshot.fingerprint
+        self.service.restore(snapshot, statistics)
+        logger.info(
+            "Restored %d Deadline jobs saved %.0fs ago",
+            len(snapshot.jobs),
+            time.time() - saved_at,
+        )
+        return True
+
+    async def save(self) -> bool:
+        """Writes the current snapshot if its content changed since the last save."""
+        snapshot = self.service.cached_snapshot
+        if (
+            snapshot is None
+            or snapshot.restored
+            or snapshot.fingerprint in UNSAVED_FINGERPRINTS
+            or snapshot.fingerprint == self.saved_fingerprint
+        ):
+            return False
+        await asyncio.to_thread(self._write, snapshot)
+        self.saved_fingerprint = snapshot.fingerprint
+        return True
+
+    def _write(self, snapshot: DeadlineSnapshot) -> None:
+        statistics = self.service.statistics_for(snapshot.jobs)
+        data = dump_snapshot(snapshot, statistics)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.exception("Saving the Deadline snapshot failed: %s", e)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the periodic saves and saves one last time."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.save()
+        except Exception as e:
+            logger.exception("Saving the Deadline snapshot failed: %s", e)
@@ -0,0 +1,325 @@
+"""
+Vectorized filter and aggregate engine over a ``JobSnapshot``.
+
+The engine wraps the snapshot's ``array`` columns as NumPy arrays without
+copying (``np.frombuffer``) and answers the questions endpoints ask of the job
+list with whole-column operations instead of per-row Python loops:
+
+* filters are boolean masks built from categorical codes: a status/user/region
+  selector is resolved against the small category table once, then compared
+  to the int32 code column with ``==`` / ``np.isin``;
+* group-by counts are one ``np.bincount`` over the codes;
+* top-N uses ``np.partition`` so only N rows are fully sorted;
+* numeric and time ranges are comparisons on the float columns, name prefixes
+  a binary search in a sorted name index, and multi-key sorts one
+  ``np.lexsort`` over per-column rank arrays.
+
+Masks for a selector are cached per engine; a snapshot never changes once
+built, so they stay valid for its lifetime. ``JobSnapshot.query`` imports this
+module on first use, which keeps NumPy out of the startup path.
+"""
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from .snapshot import (
+    CATEGORY_COLUMNS,
+    MISSING_CODE,
+    MISSING_INT,
+    JobSnapshot,
+    Selector,
+    _parse_timestamp,
+)
+
+if TYPE_CHECKING:
+    from .schemas import JobQueryParams
+
+NUMERIC_COLUMNS = ("priority", "progress", "created_at", "updated_at")
+MASK_CACHE_SIZE = 64
+
+# A boolean mask or an array of row indices
+Selection = Union[np.ndarray, Iterable[int], None]
+
+
+def _as_selection(selection: Selection) -> Optional[np.ndarray]:
+    if selection is None:
+        return None
+    if isinstance(selection, np.ndarray):
+        return selection
+    if not isinstance(selection, (list, tuple)):
+        selection = list(selection)
+    if selection and isinstance(selection[0], (bool, np.bool_)):
+        return np.asarray(selection, dtype=bool)
+    return np.asarray(selection, dtype=np.intp)
+
+
+class JobQuery:
+    """NumPy views over one snapshot's columns; see the module docstring."""
+
+    def __init__(self, snapshot: JobSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot)
+        self.codes = {
+            column: np.frombuffer(snapshot.categories[column].codes, dtype=np.intc)
+            for column in CATEGORY_COLUMNS
+        }
+        self.numeric = {
+            "priority": np.frombuffer(snapshot.priority, dtype=np.longlong),
+            "progress": np.frombuffer(snapshot.progress, dtype=np.float64),
+            **{
+                column: np.frombuffer(values, dtype=np.float64)
+                for column, values in snapshot.timestamps.items()
+            },
+        }
+        self._masks: dict[tuple, np.ndarray] = {}
+        self._ranks: dict[str, np.ndarray] = {}
+        self._name_index: Optional[tuple[list[str], np.ndarray]] = None
+
+    # --- Filters ---
+
+    def mask(
+        self,
+        status: Selector = None,
+        user: Selector = None,
+        region: Selector = None,
+    ) -> np.ndarray:
+        """Boolean mask of rows matching every given selector (case-insensitive)."""
+        result = None
+        for column, selector in (
+            ("status", status),
+            ("user", user),
+            ("region", region),
+        ):
+            if selector is None:
+                continue
+            values = [selector] if isinstance(selector, str) else selector
+            column_mask = self._category_mask(column, values)
+            result = column_mask if result is None else result & column_mask
+        if result is None:
+            return np.ones(self.size, dtype=bool)
+        return result
+
+    def _category_mask(self, column: str, values: Iterable[str]) -> np.ndarray:
+        codes = self.snapshot.categories[column].codes_matching(values)
+        key = (column, frozenset(codes))
+        cached = self._masks.get(key)
+        if cached is not None:
+            return cached
+        column_codes = self.codes[column]
+        if not codes:
+            mask = np.zeros(self.size, dtype=bool)
+        elif len(codes) == 1:
+            mask = column_codes == next(iter(codes))
+        else:
+            mask = np.isin(column_codes, np.fromiter(codes, dtype=np.intc))
+        # Shared between callers, so never modified in place
+        mask.flags.writeable = False
+        if len(self._masks) >= MASK_CACHE_SIZE:
+            self._masks.clear()
+        self._masks[key] = mask
+        return mask
+
+    def range_mask(self, column: str, low=None, high=None) -> np.ndarray:
+        """
+        Rows whose numeric or timestamp value lies in ``[low, high]``.
+
+        Timestamp bounds are ISO 8601 strings; rows with a missing value never
+        match.
+        """
+        values = self.numeric[column]
+        mask = self._present(column)
+        for bound, keep in ((low, np.greater_equal), (high, np.less_equal)):
+            if bound is None:
+                continue
+            if isinstance(bound, str):
+                bound, _ = _parse_timestamp(bound)
+                if np.isnan(bound):
+                    raise ValueError(f"Invalid timestamp for {column}")
+            mask = mask & keep(values, bound)
+        return mask
+
+    def name_mask(
+        self, prefix: Optional[str] = None, contains: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Rows whose name starts with ``prefix`` and/or contains ``contains``.
+
+        Both ignore case; ``contains`` also treats the word separators
+        ``-``, ``.``, ``/``, space and ``_`` as equal (see ``search``).
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if prefix:
+            names, order = self._names()
+            prefix = prefix.lower()
+            start = bisect_left(names, prefix)
+            end = bisect_left(names, prefix + "\U0010ffff", start)
+            mask = np.zeros(self.size, dtype=bool)
+            mask[order[start:end]] = True
+        if contains:
+            # Trigram index lookup instead of a scan over every name
+            rows = self.snapshot.name_index.matching_rows([contains])
+            contained = np.zeros(self.size, dtype=bool)
+            contained[rows] = True
+            mask = mask & contained
+        return mask
+
+    def _names(self) -> tuple[list[str], np.ndarray]:
+        # Lower-cased names in sorted order plus the row of each entry
+        if self._name_index is None:
+            lowered = [name.lower() for name in self.snapshot.names]
+            order = sorted(range(self.size), key=lowered.__getitem__)
+            self._name_index = (
+                [lowered[row] for row in order],
+                np.array(order, dtype=np.intp),
+            )
+        return self._name_index
+
+    def rows(
+        self, selection: Selection = None, limit: Optional[int] = None
+    ) -> np.ndarray:
+        """Row indices in snapshot order."""
+        selection = _as_selection(selection)
+        if selection is None:
+            rows = np.arange(self.size)
+        else:
+            rows = np.flatnonzero(selection) if selection.dtype == bool else selection
+        return rows[:limit] if limit is not None else rows
+
+    def execute(self, params: "JobQueryParams") -> tuple[np.ndarray, int]:
+        """Rows of the requested page and the total number of matches."""
+        mask = self.mask(status=params.status, user=params.user, region=params.region)
+        ranges = (
+            ("priority", params.priority_min, params.priority_max),
+            ("progress", params.progress_min, params.progress_max),
+            ("created_at", params.created_after, params.created_before),
+            ("updated_at", params.updated_after, params.updated_before),
+        )
+        for column, low, high in ranges:
+            if low is not None or high is not None:
+                mask = mask & self.range_mask(column, low, high)
+        if params.name_prefix or params.name_contains:
+            mask = mask & self.name_mask(params.name_prefix, params.name_contains)
+
+        rows = self.rows(mask)
+        if params.sort:
+            rows = self.sort(rows, params.sort)
+        return rows[params.offset : params.offset + params.limit], len(rows)
+
+    # --- Ordering ---
+
+    def sort(self, rows: Selection, keys: Sequence[str]) -> np.ndarray:
+        """
+        Rows ordered by ``keys`` (field names, ``-`` prefix for descending).
+
+        Missing values sort last in either direction and remaining ties keep
+        snapshot order.
+        """
+        rows = self.rows(rows)
+        columns = [rows]
+        for key in reversed(keys):
+            descending = key.startswith("-")
+            rank = self._rank(key.lstrip("+-"))[rows]
+            columns.append(
+                np.where(np.isnan(rank), np.inf, -rank if descending else rank)
+            )
+        return rows[np.lexsort(columns)]
+
+    def _rank(self, column: str) -> np.ndarray:
+        """Float sort key per row (NaN when missing), ordered like the column values."""
+        rank = self._ranks.get(column)
+        if rank is not None:
+            return rank
+        if column in self.numeric:
+            rank = self.numeric[column].astype(np.float64)
+            if column == "priority":
+                rank[~self._present(column)] = np.nan
+        elif column in self.codes:
+            values = self.snapshot.categories[column].values
+            order = sorted(range(len(values)), key=lambda code: values[code].lower())
+            code_rank = np.empty(len(values) + 1, dtype=np.float64)
+            code_rank[order] = np.arange(len(values))
+            code_rank[-1] = np.nan  # MISSING_CODE indexes the last slot
+            rank = code_rank[self.codes[column]]
+        else:
+            strings = (
+                self._names()[1]
+                if column == "name"
+                else np.array(
+                    sorted(range(self.size), key=self.snapshot.ids.__getitem__),
+                    dtype=np.intp,
+                )
+            )
+            rank = np.empty(self.size, dtype=np.float64)
+            rank[strings] = np.arange(self.size)
+        self._ranks[column] = rank
+        return rank
+
+    # --- Aggregates ---
+
+    def count(self, selection: Selection = None) -> int:
+        selection = _as_selection(selection)
+        if selection is None:
+            return self.size
+        return (
+            int(np.count_nonzero(selection))
+            if selection.dtype == bool
+            else len(selection)
+        )
+
+    def count_by(self, column: str, selection: Selection = None) -> dict[str, int]:
+        """Counts per category value present in the rows, in first-seen order."""
+        values = self.snapshot.categories[column].values
+        codes = self.codes[column]
+        selection = _as_selection(selection)
+        if selection is not None:
+            codes = codes[selection]
+        codes = codes[codes != MISSING_CODE]
+        counts = np.bincount(codes, minlength=len(values))
+        return {values[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def distinct(self, column: str, selection: Selection = None) -> list[str]:
+        return list(self.count_by(column, selection))
+
+    def top_n(
+        self,
+        column: str,
+        n: int,
+        selection: Selection = None,
+        descending: bool = True,
+    ) -> np.ndarray:
+        """
+        Row indices of the ``n`` largest (or smallest) values of a numeric column.
+
+        Rows where the value is missing are skipped; ties are broken by row
+        order so results are deterministic.
+        """
+        values = self.numeric[column]
+        candidates = self._present(column)
+        selection = _as_selection(selection)
+        if selection is not None:
+            if selection.dtype != bool:
+                selection = np.isin(np.arange(self.size), selection)
+            candidates = candidates & selection
+        candidates = np.flatnonzero(candidates)
+        if n <= 0 or not len(candidates):
+            return candidates[:0]
+
+        keys = values[candidates].astype(np.float64)
+        if descending:
+            keys = -keys
+        if n < len(candidates):
+            kth = np.partition(keys, n - 1)[n - 1]
+            better = keys < kth
+            ties = np.flatnonzero(keys == kth)[: n - int(np.count_nonzero(better))]
+            chosen = np.concatenate([np.flatnonzero(better), ties])
+            candidates, keys = candidates[chosen], keys[chosen]
+        order = np.lexsort((candidates, keys))
+        return candidates[order]
+
+    def _present(self, column: str) -> np.ndarray:
+        values = self.numeric[column]
+        if column == "priority":
+            return values != MISSING_INT
+        return ~np.isnan(values)
@@ -0,0 +1,65 @@
+"""
+Deadline analytics REST endpoints: job ETAs and farm throughput.
+"""
+
+from typing import List, Optional
+
+from fastapi import HTTPException, Query
+
+from app.core.profiling import TracedAPIRouter
+from app.core.request_scope import request_scope
+
+from ..schemas import JobEstimate, ThroughputReport
+from ..service import deadline_service
+
+# Estimates are relative to the current time, so they carry no snapshot ETag
+analytics_router = TracedAPIRouter(
+    tags=["Deadline REST API"], dependencies=[request_scope()]
+)
+
+
+@analytics_router.get("/analytics/eta", response_model=List[JobEstimate])
+async def get_job_estimates(
+    user: Optional[str] = Query(None, description="Only this user's active jobs"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of jobs to return"
+    ),
+):
+    """
+    Get completion estimates for the active jobs, soonest first.
+    """
+    # NumPy-backed; imported on first use to keep it out of startup
+    from ..analytics import farm_analytics
+
+    jobs = await deadline_service.get_jobs()
+    return farm_analytics.estimate_completion(jobs, user=user, limit=limit)
+
+
+@analytics_router.get("/analytics/eta/{job_id}", response_model=JobEstimate)
+async def get_job_estimate(job_id: str):
+    """
+    Get the progress rate and completion estimate of one job.
+    """
+    from ..analytics import farm_analytics
+
+    jobs = await deadline_service.get_jobs()
+    estimates = farm_analytics.estimate_completion(jobs, job_id=job_id)
+    if not estimates:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return estimates[0]
+
+
+@analytics_router.get("/analytics/throughput", response_model=ThroughputReport)
+async def get_farm_throughput(
+    hours: float = Query(
+        24, gt=0, le=24 * 400, description="Window for counting completed jobs"
+    ),
+    user: Optional[str] = Query(None, description="Only this user's jobs"),
+):
+    """
+    Get completions per hour, the current rendering speed and queue waits.
+    """
+    from ..analytics import farm_analytics
+
+    jobs = await deadline_service.get_jobs()
+    return farm_analytics.throughput(jobs, hours, user)
@@ -0,0 +1,60 @@
+"""
+Deadline job control REST endpoints: suspend, resume, requeue, reprioritize.
+
+Each endpoint takes a list of job IDs and returns the outcome per job; the
+commands are sent to Deadline in parallel batches (see
+``DeadlineService.control_jobs``).
+"""
+
+from fastapi import HTTPException
+
+from app.core.profiling import TracedAPIRouter
+from app.core.request_scope import request_scope
+
+from ..schemas import JobControlRequest, JobControlResponse
+from ..service import deadline_service
+
+control_router = TracedAPIRouter(
+    tags=["Deadline REST API"], dependencies=[request_scope()]
+)
+
+
+async def _control(command: str, request: JobControlRequest) -> JobControlResponse:
+    try:
+        return await deadline_service.control_jobs(
+            command, request.job_ids, request.priority
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@control_router.post("/jobs/suspend", response_model=JobControlResponse)
+async def suspend_deadline_jobs(request: JobControlRequest):
+    """
+    Suspend jobs.
+    """
+    return await _control("suspend", request)
+
+
+@control_router.post("/jobs/resume", response_model=JobControlResponse)
+async def resume_deadline_jobs(request: JobControlRequest):
+    """
+    Resume suspended jobs.
+    """
+    return await _control("resume", request)
+
+
+@control_router.post("/jobs/requeue", response_model=JobControlResponse)
+async def requeue_deadline_jobs(request: JobControlRequest):
+    """
+    Requeue jobs so they render again from the start.
+    """
+    return await _control("requeue", request)
+
+
+@control_router.post("/jobs/priority", response_model=JobControlResponse)
+async def set_deadline_job_priority(request: JobControlRequest):
+    """
+    Set the priority (0-100) of jobs.
+    """
+    return await _control("priority", request)
@@ -3,52 +3,168 @@ Deadline REST API endpoints for human users.
 These endpoints provide standard CRUD operations and user-friendly responses.
 """
 
-from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
+
+from fastapi import HTTPException, Query
+from pydantic import ValidationError
+
+from app.core.http_cache import conditional_get
+from app.core.profiling import TracedAPIRouter
+from app.core.request_scope import request_scope
+
+from ..schemas import DeadlineRead, JobQueryParams, JobQueryResult, JobSearchResult
 from ..service import deadline_service
-from ..schemas import DeadlineRead
 
-rest_router = APIRouter(tags=["Deadline REST API"])
+# Every read carries an ETag from the job snapshot version; unchanged polls get
+# 304. The request scope makes the ETag and the body come from one snapshot.
+rest_router = TracedAPIRouter(
+    tags=["Deadline REST API"],
+    dependencies=[
+        request_scope(),
+        conditional_get("deadline", deadline_service.get_version),
+    ],
+)
 
 
 @rest_router.get("/jobs", response_model=List[DeadlineRead])
 async def get_deadline_jobs(
     status: Optional[str] = Query(None, description="Filter by job status"),
     user: Optional[str] = Query(None, description="Filter by user"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs to return")
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of jobs to return"
+    ),
 ):
     """
     Get deadline jobs with optional filtering.
-    
+
     This endpoint is designed for human users and web interfaces.
     Provides pagination and filtering capabilities.
     """
-    jobs = await deadline_service.get_jobs()
-    
-    # Apply filters
-    if status:
-        jobs = [job for job in jobs if job.status.lower() == status.lower()]
-    
-    if user:
-        jobs = [job for job in jobs if job.user.lower() == user.lower()]
-    
-    # Apply limit
-    return jobs[:limit]
+    # Filter on the snapshot columns and materialize only the returned rows
+    jobs, rows = await deadline_service.select_jobs(
+        status=status or None, user=user or None, limit=limit
+    )
+    return jobs.rows(rows)
+
+
+# Declared before /jobs/{job_id} so "search" and "query" are not taken for job IDs
+@rest_router.get("/jobs/search", response_model=JobSearchResult)
+async def search_deadline_jobs(
+    q: str = Query(
+        ..., min_length=1, description="Name fragments, e.g. 'Scene_02 comp'"
+    ),
+    limit: int = Query(
+        20, ge=1, le=200, description="Maximum number of jobs to return"
+    ),
+):
+    """
+    Search jobs by partial name.
+
+    Every whitespace-separated term must appear in the name (case and the
+    separators ``_ - . /`` are ignored). Matches at the start of the name or of
+    a word rank first.
+    """
+    return await deadline_service.search_jobs(q, limit)
+
+
+@rest_router.get("/jobs/query", response_model=JobQueryResult)
+async def query_deadline_jobs(
+    status: Optional[str] = Query(
+        None, description="Statuses, comma-separated (any match)"
+    ),
+    user: Optional[str] = Query(None, description="Users, comma-separated (any match)"),
+    region: Optional[str] = Query(
+        None, description="Regions, comma-separated (any match)"
+    ),
+    priority_min: Optional[int] = Query(
+        None, description="Minimum priority (inclusive)"
+    ),
+    priority_max: Optional[int] = Query(
+        None, description="Maximum priority (inclusive)"
+    ),
+    progress_min: Optional[float] = Query(
+        None, description="Minimum progress (inclusive)"
+    ),
+    progress_max: Optional[float] = Query(
+        None, description="Maximum progress (inclusive)"
+    ),
+    created_after: Optional[str] = Query(
+        None, description="ISO 8601 lower bound on created_at"
+    ),
+    created_before: Optional[str] = Query(
+        None, description="ISO 8601 upper bound on created_at"
+    ),
+    updated_after: Optional[str] = Query(
+        None, description="ISO 8601 lower bound on updated_at"
+    ),
+    updated_before: Optional[str] = Query(
+        None, description="ISO 8601 upper bound on updated_at"
+    ),
+    name_prefix: Optional[str] = Query(
+        None, description="Job name prefix (case-insensitive)"
+    ),
+    name_contains: Optional[str] = Query(
+        None, description="Job name substring (case-insensitive)"
+    ),
+    sort: Optional[str] = Query(
+        None, description="Sort keys, comma-separated, '-' for descending"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Fields to return, comma-separated"
+    ),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of jobs to return"
+    ),
+    offset: int = Query(0, ge=0, description="Number of matching jobs to skip"),
+):
+    """
+    Query deadline jobs with multi-field filters, sorting and projection.
+
+    Filters are evaluated server-side against the snapshot indexes, so only
+    the requested page and fields are sent, e.g.
+    ``?status=Failed,Suspended&priority_min=50&sort=-priority&fields=id,name``.
+    """
+    try:
+        params = JobQueryParams(
+            status=status,
+            user=user,
+            region=region,
+            priority_min=priority_min,
+            priority_max=priority_max,
+            progress_min=progress_min,
+            progress_max=progress_max,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            name_prefix=name_prefix,
+            name_contains=name_contains,
+            sort=sort,
+            fields=fields,
+            limit=limit,
+            offset=offset,
+        )
+        return await deadline_service.query_jobs(params)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422, detail=exc.errors(include_url=False, include_context=False)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 
 @rest_router.get("/jobs/{job_id}", response_model=DeadlineRead)
 async def get_deadline_job(job_id: str):
     """
     Get a specific deadline job by ID.
-    
+
     Returns detailed information about a single job.
     """
-    jobs = await deadline_service.get_jobs()
-    job = next((j for j in jobs if j.id == job_id), None)
-    
+    job = await deadline_service.get_job(job_id)
+
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-    
+
     return job
 
 
@@ -56,39 +172,28 @@ async def get_deadline_job(job_id: str):
 async def get_deadline_users():
     """
     Get list of all users who have deadline jobs.
-    
+
     Useful for filtering and user management interfaces.
     """
-    jobs = await deadline_service.get_jobs()
-    users = list(set(job.user for job in jobs))
-    return sorted(users)
+    return await deadline_service.list_users()
 
 
 @rest_router.get("/status")
 async def get_deadline_status():
     """
     Get deadline service status and statistics.
-    
+
     Provides service health information and job statistics.
     """
-    jobs = await deadline_service.get_jobs()
-    
-    # Calculate statistics
-    total_jobs = len(jobs)
-    status_counts = {}
-    user_counts = {}
-    
-    for job in jobs:
-        status_counts[job.status] = status_counts.get(job.status, 0) + 1
-        user_counts[job.user] = user_counts.get(job.user, 0) + 1
-    
+    statistics = await deadline_service.get_statistics()
+
     return {
         "service_available": True,
         "message": "Deadline service is running",
         "statistics": {
-            "total_jobs": total_jobs,
-            "status_breakdown": status_counts,
-            "user_breakdown": user_counts,
-            "active_users": len(user_counts)
-        }
+            "total_jobs": statistics.total,
+            "status_breakdown": statistics.status_counts,
+            "user_breakdown": statistics.user_counts,
+            "active_users": len(statistics.user_counts),
+        },
     }
@@ -0,0 +1,83 @@
+"""
+Deadline history REST endpoints: trends of the farm aggregates over time.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Query
+
+from app.core.profiling import TracedAPIRouter
+from app.core.request_scope import request_scope
+
+from ..history import RESOLUTIONS, get_history_store, parse_time
+from ..schemas import HistorySeries, LoadComparison
+
+# History grows between snapshot versions, so these reads carry no snapshot ETag
+history_router = TracedAPIRouter(
+    tags=["Deadline REST API"], dependencies=[request_scope()]
+)
+
+
+@history_router.get("/history", response_model=Dict[str, List[str]])
+async def get_history_series():
+    """
+    List the recorded metrics and their labels.
+
+    ``jobs`` and ``running`` have an empty label; ``status`` is labelled by
+    job status and ``user_running`` by user.
+    """
+    return await asyncio.to_thread(get_history_store().series)
+
+
+@history_router.get("/history/{metric}", response_model=HistorySeries)
+async def get_history(
+    metric: str,
+    label: str = Query(
+        "", description="Status or user for per-status/per-user metrics"
+    ),
+    start: Optional[str] = Query(
+        None, description="ISO 8601 start (default: `hours` before end)"
+    ),
+    end: Optional[str] = Query(None, description="ISO 8601 end (default: now)"),
+    hours: float = Query(24, gt=0, description="Window length when start is not given"),
+    resolution: Optional[int] = Query(
+        None, description="Bucket width in seconds (default: automatic)"
+    ),
+):
+    """
+    Get one metric series over a time range.
+
+    The bucket width is picked automatically from the retained resolutions
+    (1 minute, 5 minutes, 1 hour) unless given.
+    """
+    if resolution is not None and resolution not in {width for width, _ in RESOLUTIONS}:
+        raise HTTPException(
+            status_code=422, detail=f"Unsupported resolution: {resolution}"
+        )
+    try:
+        end_time = parse_time(end) if end else time.time()
+        start_time = parse_time(start) if start else end_time - hours * 3600
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    used, points = await asyncio.to_thread(
+        get_history_store().query, metric, label, start_time, end_time, resolution
+    )
+    return HistorySeries(metric=metric, label=label, resolution=used, points=points)
+
+
+@history_router.get("/history/{metric}/compare", response_model=LoadComparison)
+async def compare_history(
+    metric: str,
+    label: str = Query(
+        "", description="Status or user for per-status/per-user metrics"
+    ),
+    days: float = Query(
+        7, gt=0, le=400, description="Days of history to compare against"
+    ),
+):
+    """
+    Compare the latest value of a metric with its hourly history.
+    """
+    return await asyncio.to_thread(get_history_store().compare, metric, label, days)
@@ -1,6 +1,8 @@
 # Pydantic models for Deadline data
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
 
 class DeadlineJob(BaseModel):
     id: str
@@ -13,5 +15,219 @@ class DeadlineJob(BaseModel):
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+
 # Alias for compatibility
-DeadlineRead = DeadlineJob
\ No newline at end of file
+DeadlineRead = DeadlineJob
+
+JOB_FIELDS = tuple(DeadlineJob.model_fields)
+
+
+def _split_list(value: Any) -> Any:
+    # "Failed,Suspended" and ["Failed", "Suspended"] mean the same thing
+    if isinstance(value, str):
+        value = value.split(",")
+    if isinstance(value, (list, tuple)):
+        value = [item.strip() for item in value if item and item.strip()]
+        return value or None
+    return value
+
+
+class JobQueryParams(BaseModel):
+    """
+    Server-side job query: filters, sort keys and field projection.
+
+    List filters match any of their values (case-insensitive); ranges are
+    inclusive and timestamps are ISO 8601. ``sort`` keys are field names,
+    prefixed with ``-`` for descending order.
+    """
+
+    status: Optional[List[str]] = None
+    user: Optional[List[str]] = None
+    region: Optional[List[str]] = None
+    priority_min: Optional[int] = None
+    priority_max: Optional[int] = None
+    progress_min: Optional[float] = None
+    progress_max: Optional[float] = None
+    created_after: Optional[str] = None
+    created_before: Optional[str] = None
+    updated_after: Optional[str] = None
+    updated_before: Optional[str] = None
+    name_prefix: Optional[str] = None
+    name_contains: Optional[str] = None
+    sort: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
+    limit: int = Field(100, ge=1, le=1000)
+    offset: int = Field(0, ge=0)
+
+    _split = field_validator(
+        "status", "user", "region", "sort", "fields", mode="before"
+    )(_split_list)
+
+    @field_validator("sort")
+    @classmethod
+    def _check_sort(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        for key in value or []:
+            if key.lstrip("+-") not in JOB_FIELDS:
+                raise ValueError(f"Unknown sort field: {key}")
+        return value
+
+    @field_validator("fields")
+    @classmethod
+    def _check_fields(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        for field in value or []:
+            if field not in JOB_FIELDS:
+                raise ValueError(f"Unknown field: {field}")
+        return value
+
+
+class JobQueryResult(BaseModel):
+    """One page of query results with only the requested fields."""
+
+    total: int = Field(description="Number of jobs matching the filters")
+    offset: int = Field(description="Index of the first returned job")
+    jobs: List[Dict[str, Any]] = Field(
+        description="Matching jobs, projected to the requested fields"
+    )
+
+
+class JobSearchHit(DeadlineJob):
+    """A job matched by name search, with its relevance score."""
+
+    score: int = Field(description="Relevance; higher is better")
+
+
+class JobSearchResult(BaseModel):
+    """Best name-search matches, most relevant first."""
+
+    total: int = Field(description="Number of jobs whose name matches the query")
+    jobs: List[JobSearchHit] = Field(description="Matching jobs, most relevant first")
+
+
+class HistoryPoint(BaseModel):
+    """Aggregate of the samples in one time bucket."""
+
+    timestamp: int = Field(description="Bucket start, epoch seconds")
+    avg: float
+    min: float
+    max: float
+
+
+class HistorySeries(BaseModel):
+    """Range query result for one metric series."""
+
+    metric: str
+    label: str = Field(
+        description="Status or user for per-status/per-user metrics, else empty"
+    )
+    resolution: int = Field(description="Bucket width in seconds")
+    points: List[HistoryPoint]
+
+
+class LoadComparison(BaseModel):
+    """Current value of a metric compared with its recent hourly history."""
+
+    metric: str
+    label: str
+    days: float = Field(description="Length of the history compared against")
+    current: Optional[float] = Field(description="Latest sampled value")
+    usual: Optional[float] = Field(description="Mean of the hourly averages")
+    low: Optional[float] = Field(description="10th percentile of the hourly averages")
+    high: Optional[float] = Field(description="90th percentile of the hourly averages")
+    percentile: Optional[float] = Field(
+        description="Share of hours at or below the current value"
+    )
+    busier_than_usual: bool
+
+
+class JobEstimate(BaseModel):
+    """Progress rate and completion estimate of one job."""
+
+    job_id: str
+    name: str
+    user: str
+    status: str
+    progress: Optional[float] = None
+    rate_per_hour: Optional[float] = Field(
+        None, description="Progress percentage points per hour"
+    )
+    remaining_seconds: Optional[float] = None
+    estimated_completion: Optional[str] = Field(None, description="ISO 8601 UTC time")
+    basis: str = Field(
+        description="observed (rate seen across refreshes), "
+        "average (since submission), "
+        "completed or unknown"
+    )
+
+
+class DurationStats(BaseModel):
+    """Summary of a set of durations, in seconds."""
+
+    count: int
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    max: Optional[float] = None
+
+
+class ThroughputReport(BaseModel):
+    """Farm (or one user's) throughput over a recent window and queue waits."""
+
+    hours: float = Field(description="Window length for completions")
+    user: Optional[str] = None
+    completed: int = Field(description="Jobs completed within the window")
+    completed_per_hour: float
+    completed_by_user: Dict[str, int]
+    active_jobs: int
+    active_jobs_with_rate: int
+    progress_jobs_per_hour: float = Field(
+        description="Current rendering speed: summed progress rates of active "
+        "jobs, in whole jobs per hour"
+    )
+    queued_jobs: int
+    queued_age_seconds: DurationStats = Field(
+        description="How long the jobs still queued have waited"
+    )
+    recent_wait_seconds: DurationStats = Field(
+        description="Queue waits of jobs seen starting in the last 24 hours"
+    )
+
+
+# Job control commands and the local status each leaves a job in (None: unchanged)
+JOB_COMMANDS = {
+    "suspend": "Suspended",
+    "resume": "Queued",
+    "requeue": "Queued",
+    "priority": None,
+}
+MAX_CONTROL_JOBS = 1000
+
+
+class JobControlRequest(BaseModel):
+    """Jobs to apply one control command to."""
+
+    job_ids: List[str] = Field(min_length=1, max_length=MAX_CONTROL_JOBS)
+    priority: Optional[int] = Field(
+        None, ge=0, le=100, description="New priority (priority command only)"
+    )
+
+
+class JobControlResult(BaseModel):
+    """Outcome of a control command for one job."""
+
+    job_id: str
+    ok: bool
+    status: Optional[str] = Field(
+        None, description="Current status, with the command applied locally"
+    )
+    priority: Optional[int] = None
+    error: Optional[str] = None
+
+
+class JobControlResponse(BaseModel):
+    """Per-job results of a batched control command."""
+
+    command: str
+    requested: int
+    succeeded: int
+    failed: int
+    results: List[JobControlResult]
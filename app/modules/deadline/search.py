@@ -0,0 +1,209 @@
+"""
+Trigram index for substring search over job names.
+
+Artists look shots up by fragments such as ``Scene_02`` or ``comp_v014``.
+Instead of scanning every name, ``NameIndex`` keeps, for each three-byte
+sequence (trigram) of the normalized UTF-8 names, the sorted array of rows
+whose name contains it. A query term can only occur in rows that contain all
+of its trigrams, so the candidates are the intersection of those posting
+arrays (rarest first), and only the candidates are checked with a real
+substring test. Terms shorter than three bytes fall back to checking every
+row.
+
+Names and queries are normalized the same way: lower-cased, with the word
+separators ``-``, ``.``, ``/`` and space folded into ``_``. Ranking uses a
+sorted copy of the normalized names (prefix and exact matches are a binary
+search) and the trigram index again for matches at the start of a word.
+
+The index is built with whole-array NumPy operations over one buffer holding
+every name, and belongs to one immutable ``JobSnapshot``
+(``JobSnapshot.name_index``); it is rebuilt only when a refresh brings new
+content.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+GRAM = 3
+# Once the candidates are this many times smaller than the next posting
+# array, checking them directly is cheaper than intersecting further
+INTERSECT_RATIO = 8
+
+# Points per term by where it matches; the sum ranks the results
+PREFIX_POINTS = 3
+WORD_POINTS = 2
+SUBSTRING_POINTS = 1
+EXACT_BONUS = 1
+
+WORD_SEPARATORS = str.maketrans("-. /", "____")
+
+
+def normalize(text: str) -> str:
+    """Lower-cases ``text`` and folds word separators into ``_``."""
+    return text.lower().translate(WORD_SEPARATORS)
+
+
+def _gram_codes(data: np.ndarray) -> np.ndarray:
+    """Integer code of the trigram starting at each byte of ``data``."""
+    data = data.astype(np.int64)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+def _starts_run(values: np.ndarray) -> np.ndarray:
+    """Mask of the entries of a sorted array that differ from their predecessor."""
+    starts = np.ones(len(values), dtype=bool)
+    starts[1:] = values[1:] != values[:-1]
+    return starts
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two sorted, duplicate-free arrays by binary search."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    found = np.searchsorted(b, a)
+    found[found == len(b)] = 0
+    return a[b[found] == a]
+
+
+class NameIndex:
+    """Trigram posting arrays over one snapshot's names; see the module docstring."""
+
+    def __init__(self, names: Sequence[str]):
+        self.size = len(names)
+        self.names = [normalize(name) for name in names]
+        self.lengths = np.fromiter(map(len, self.names), dtype=np.intp, count=self.size)
+        order = sorted(range(self.size), key=self.names.__getitem__)
+        self.sorted_names = [self.names[row] for row in order]
+        self.sorted_rows = np.array(order, dtype=np.intp)
+
+        encoded = [name.encode() for name in self.names]
+        sizes = np.fromiter(map(len, encoded), dtype=np.int64, count=self.size)
+        data = np.frombuffer(b"".join(encoded) + b"\0\0", dtype=np.uint8)
+        ends = np.cumsum(sizes)
+        # Trigrams that stay inside one name: start + 3 <= end of that name
+        rows = np.repeat(np.arange(self.size, dtype=np.int64), sizes)
+        inside = np.arange(len(rows), dtype=np.int64) + GRAM <= ends[rows]
+        codes = _gram_codes(data)[: len(rows)][inside]
+        rows = rows[inside]
+
+        # Unique (trigram, row) pairs, sorted by trigram then row. Sorting and
+        # dropping repeats is much faster than np.unique's hashing here.
+        pairs = codes * max(self.size, 1) + rows
+        pairs.sort()
+        pairs = pairs[_starts_run(pairs)]
+        gram_codes, postings = np.divmod(pairs, max(self.size, 1))
+        self.postings = postings.astype(np.intp)
+        first = np.flatnonzero(_starts_run(gram_codes))
+        self.offsets = np.append(first, len(pairs))
+        self.grams = {
+            code: slot for slot, code in enumerate(gram_codes[first].tolist())
+        }
+
+    def _posting(self, code: int) -> Optional[np.ndarray]:
+        slot = self.grams.get(code)
+        if slot is None:
+            return None
+        return self.postings[self.offsets[slot] : self.offsets[slot + 1]]
+
+    def candidates(self, term: str) -> Optional[np.ndarray]:
+        """
+        Rows that may contain the normalized ``term``, or None when every row may.
+
+        Always a superset of the true matches; callers confirm with ``in``.
+        """
+        encoded = term.encode()
+        if len(encoded) < GRAM:
+            return None
+        postings = []
+        for code in set(_gram_codes(np.frombuffer(encoded, dtype=np.uint8)).tolist()):
+            posting = self._posting(code)
+            if posting is None:
+                return np.empty(0, dtype=np.intp)
+            postings.append(posting)
+        postings.sort(key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(posting) > INTERSECT_RATIO * len(rows):
+                break
+            rows = _intersect(rows, posting)
+            if not len(rows):
+                break
+        return rows
+
+    def matching_rows(self, terms: Iterable[str]) -> np.ndarray:
+        """Rows (ascending) whose name contains every term, ignoring case/separators."""
+        terms = sorted(
+            {normalize(term) for term in terms if term}, key=len, reverse=True
+        )
+        rows = None
+        for term in terms:
+            found = self.candidates(term)
+            if found is not None:
+                rows = found if rows is None else _intersect(rows, found)
+        names = self.names
+        matches = range(self.size) if rows is None else rows.tolist()
+        for term in terms:
+            matches = [row for row in matches if term in names[row]]
+        return np.array(matches, dtype=np.intp)
+
+    def _prefixed(self, text: str, exact: bool = False) -> np.ndarray:
+        """Rows whose normalized name starts with (or equals) ``text``."""
+        start = bisect_left(self.sorted_names, text)
+        if exact:
+            end = bisect_right(self.sorted_names, text, start)
+        else:
+            end = bisect_left(self.sorted_names, text + "\U0010ffff", start)
+        return self.sorted_rows[start:end]
+
+    def _member(self, rows: np.ndarray, found: np.ndarray) -> np.ndarray:
+        """Mask over ``rows`` of the entries that appear in ``found``."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[found] = True
+        return mask[rows]
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> tuple[list[tuple[int, int]], int]:
+        """
+        Ranked ``(row, score)`` matches for a whitespace-separated query and
+        the total number of matches.
+
+        Every term must occur in the name. A term scores more at the start of
+        the name than at the start of a word, and more there than elsewhere; a
+        name equal to the whole query gets a bonus. Ties go to shorter names,
+        then snapshot order.
+        """
+        terms = [normalize(term) for term in query.split()]
+        if not terms:
+            return [], 0
+        rows = self.matching_rows(terms)
+        if not len(rows):
+            return [], 0
+
+        names = self.names
+        scores = np.full(len(rows), SUBSTRING_POINTS * len(terms), dtype=np.intp)
+        for term in terms:
+            boundary = "_" + term
+            word = np.fromiter(
+                (boundary in names[row] for row in rows.tolist()),
+                dtype=bool,
+                count=len(rows),
+            )
+            prefix = self._member(rows, self._prefixed(term))
+            scores += np.where(
+                prefix,
+                PREFIX_POINTS - SUBSTRING_POINTS,
+                np.where(word, WORD_POINTS - SUBSTRING_POINTS, 0),
+            )
+        scores += EXACT_BONUS * self._member(
+            rows, self._prefixed("_".join(terms), exact=True)
+        )
+
+        order = np.lexsort((rows, self.lengths[rows], -scores))
+        if limit is not None:
+            order = order[:limit]
+        return list(zip(rows[order].tolist(), scores[order].tolist())), len(rows)
@@ -1,32 +1,661 @@
 # Business logic for Deadline interactions
-import httpx
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Union
+
+from ...core.backends import get_backend, run_blocking
+from ...core.batching import DataLoader
 from ...core.config import settings
+from ...core.metrics import Histogram, record_cache_lookup
+from ...core.profiling import span
+from ...core.request_scope import get_scoped, in_request_scope, set_scoped
 from . import schemas
+from .snapshot import JobSnapshot
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_UPSTREAM_DURATION = Histogram(
+    "deadline_upstream_request_duration_seconds",
+    "Latency of calls to the Deadline web service by operation.",
+    ["operation"],
+)
+
+# Status groups used by the summaries and the history (matched case-insensitively)
+RUNNING_STATUSES = ["rendering", "queued", "processing"]
+FAILED_STATUSES = ["failed", "error"]
+ATTENTION_STATUSES = ["failed", "error", "suspended"]
+
+# Built-in sample data used while DEADLINE_USE_MOCK_DATA is enabled
+SAMPLE_JOBS = [
+    schemas.DeadlineJob(
+        id="job-001", name="Scene_01_Render", status="Completed", user="lynloveyounever"
+    ),
+    schemas.DeadlineJob(
+        id="job-002", name="Scene_02_Render", status="Rendering", user="lynloveyounever"
+    ),
+]
+
+# Snapshot versions are allocated in the shared state backend, so every worker
+# reports the same version (and ETag) for the same upstream data
+VERSION_COUNTER_KEY = "deadline:snapshot_version"
+VERSION_KEY_TTL = 24 * 3600
+# Longest wait between attempts to confirm a restored snapshot with Deadline
+RECONCILE_MAX_BACKOFF = 60.0
+
+
+class JobKey:
+    """A job ID in one snapshot: a batched lookup key, equal by snapshot identity."""
+
+    __slots__ = ("jobs", "job_id")
+
+    def __init__(self, jobs: JobSnapshot, job_id: str):
+        self.jobs = jobs
+        self.job_id = job_id
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, JobKey)
+            and other.jobs is self.jobs
+            and other.job_id == self.job_id
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.jobs), self.job_id))
+
+
+SnapshotListener = Callable[[JobSnapshot, float], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class DeadlineSnapshot:
+    """Job list fetched from Deadline, with a version that changes with its content."""
+
+    version: int
+    jobs: JobSnapshot
+    fingerprint: str
+    fetched_at: float
+    # Loaded from disk at startup and not yet confirmed by Deadline
+    restored: bool = False
+
+
+@dataclass
+class JobStatistics:
+    """Job counts shared by the status, workload and busy-check views."""
+
+    total: int
+    status_counts: dict[str, int]
+    user_counts: dict[str, int]
+    running: int
+    completed: int
+    failed: int
+    # Users with running jobs, in first-seen order
+    active_users: list[str]
+
+
+def _count_matching(counts: dict[str, int], statuses: list[str]) -> int:
+    """Sum of the counts whose key is one of ``statuses``, ignoring case."""
+    return sum(count for value, count in counts.items() if value.lower() in statuses)
+
 
 class DeadlineService:
-    async def get_jobs(self) -> list[schemas.DeadlineJob]:
-        """Fetches job data from the Deadline web service."""
-        # This is a mock implementation. In a real scenario, you would query the actual API.
-        # For example: 
-        # async with httpx.AsyncClient() as client:
-        #     try:
-        #         response = await client.get(f"{settings.DEADLINE_WEBSERVICE_URL}/api/jobs")
-        #         response.raise_for_status()
-        #         # Assuming the API returns a list of jobs in the expected format
-        #         return [schemas.DeadlineJob(**job) for job in response.json()]
-        #     except httpx.HTTPStatusError as e:
-        #         # Handle HTTP errors (e.g., 404, 500)
-        #         print(f"HTTP error occurred: {e}")
-        #         return []
-        #     except Exception as e:
-        #         # Handle other errors (e.g., connection error)
-        #         print(f"An error occurred: {e}")
-        #         return []
-
-        # Returning mock data for demonstration
-        return [
-            schemas.DeadlineJob(id="job-001", name="Scene_01_Render", status="Completed", user="lynloveyounever"),
-            schemas.DeadlineJob(id="job-002", name="Scene_02_Render", status="Rendering", user="lynloveyounever"),
-        ]
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.base_url = base_url or settings.DEADLINE_WEBSERVICE_URL
+        self.transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._snapshot: Optional[DeadlineSnapshot] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_lock_loop = None
+        self._listeners: list[SnapshotListener] = []
+        self._demand_listeners: list[Callable[[], None]] = []
+        # Snapshot lifetime set by the sync scheduler while it keeps the
+        # snapshot up to date; DEADLINE_CACHE_TTL otherwise
+        self.max_age: Optional[float] = None
+        self.last_fetch_failed = False
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._reconcile_at = -math.inf
+        self._reconcile_failures = 0
+        self._job_loader: DataLoader[JobKey, schemas.DeadlineJob] = DataLoader(
+            self._lookup_jobs,
+            "deadline_job",
+            window=settings.DEADLINE_LOOKUP_BATCH_WINDOW,
+        )
+        self._statistics: Optional[tuple[JobSnapshot, JobStatistics]] = None
+
+    def add_snapshot_listener(self, listener: SnapshotListener) -> None:
+        """
+        Calls ``listener(jobs, observed_at)`` whenever a refresh brings new
+        content: coroutine functions on the event loop, others in a worker
+        thread.
+        """
+        self._listeners.append(listener)
+
+    def add_demand_listener(self, listener: Callable[[], None]) -> None:
+        """Calls ``listener()`` on the first snapshot read of every request."""
+        self._demand_listeners.append(listener)
+
+    def remove_demand_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._demand_listeners:
+            self._demand_listeners.remove(listener)
+
+    def configure(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ) -> None:
+        """Points the service at another Deadline web service (e.g. a local mock)."""
+        self.base_url = base_url or self.base_url
+        self.transport = transport
+        self._client = None
+        self._snapshot = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        # One pooled client per service instead of a new connection per call.
+        # httpx is imported here so startup does not pay for it in mock mode.
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=self.transport,
+                timeout=settings.DEADLINE_TIMEOUT,
+            )
+        return self._client
+
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        # asyncio locks are bound to one event loop (tests run several)
+        loop = asyncio.get_running_loop()
+        if self._refresh_lock_loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._refresh_lock_loop = loop
+        return self._refresh_lock
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP client; called on application shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_jobs(self) -> JobSnapshot:
+        """
+        Fetches job data from the Deadline web service.
+
+        Served from the cached, read-only columnar snapshot; it iterates as
+        ``DeadlineJob`` models, but filtering with ``where()`` and
+        materializing only the returned rows is much cheaper.
+        """
+        return (await self.get_snapshot()).jobs
+
+    # --- Shared views: REST endpoints, AI tools and MCP prompts all use these ---
+
+    async def select_jobs(
+        self,
+        status=None,
+        user=None,
+        region=None,
+        limit: Optional[int] = None,
+    ) -> tuple[JobSnapshot, list[int]]:
+        """
+        The current snapshot and its rows matching every given selector.
+
+        Selectors are values or lists of values, compared without regard to
+        case; callers materialize only the rows they return.
+        """
+        jobs = await self.get_jobs()
+        return jobs, jobs.where(status=status, user=user, region=region, limit=limit)
+
+    async def get_job(self, job_id: str) -> Optional[schemas.DeadlineJob]:
+        """
+        One job by ID. Lookups arriving together (dashboard bursts) are
+        batched: each distinct ID is resolved once, in one pass over the IDs.
+
+        The snapshot is read here, in the caller's request scope, and goes
+        with the ID into the batch, so the job comes from the same snapshot
+        as the rest of the request (e.g. its ETag).
+        """
+        with span("deadline.get_job"):
+            jobs = await self.get_jobs()
+            return await self._job_loader.load(JobKey(jobs, job_id))
+
+    async def _lookup_jobs(
+        self, keys: list["JobKey"]
+    ) -> dict["JobKey", schemas.DeadlineJob]:
+        # Grouped by snapshot; a batch spans two only across a refresh
+        groups: dict[int, tuple[JobSnapshot, list[JobKey]]] = {}
+        for key in keys:
+            groups.setdefault(id(key.jobs), (key.jobs, []))[1].append(key)
+        found = {}
+        with span("deadline.lookup_jobs", count=len(keys)):
+            for jobs, group in groups.values():
+                rows = jobs.index_of_many([key.job_id for key in group])
+                for key in group:
+                    row = rows.get(key.job_id)
+                    if row is not None:
+                        found[key] = jobs.job(row)
+        return found
+
+    async def count_by_status(self) -> dict[str, int]:
+        return dict((await self.get_statistics()).status_counts)
+
+    async def list_users(self) -> list[str]:
+        """Users with jobs in the snapshot, sorted."""
+        return sorted((await self.get_statistics()).user_counts)
+
+    async def get_statistics(self) -> JobStatistics:
+        """Counts of the current snapshot, computed once per snapshot."""
+        return self.statistics_for(await self.get_jobs())
+
+    def statistics_for(self, jobs: JobSnapshot) -> JobStatistics:
+        """Counts of ``jobs``, remembered for the latest snapshot asked about."""
+        cached = self._statistics
+        if cached is not None and cached[0] is jobs:
+            return cached[1]
+        with span("deadline.statistics"):
+            # One bincount per column; the status groups are sums over the
+            # few distinct statuses instead of extra passes over the rows
+            status_counts = jobs.count_by("status")
+            running_rows = jobs.query.mask(status=RUNNING_STATUSES)
+            statistics = JobStatistics(
+                total=len(jobs),
+                status_counts=status_counts,
+                user_counts=jobs.count_by("user"),
+                running=_count_matching(status_counts, RUNNING_STATUSES),
+                completed=_count_matching(status_counts, ["completed"]),
+                failed=_count_matching(status_counts, FAILED_STATUSES),
+                active_users=jobs.distinct("user", running_rows),
+            )
+        self._statistics = (jobs, statistics)
+        return statistics
+
+    # --- Job control ---
+
+    async def control_jobs(
+        self, command: str, job_ids: list[str], priority: Optional[int] = None
+    ) -> schemas.JobControlResponse:
+        """
+        Sends one control command for each job to Deadline and returns the
+        per-job outcome.
+
+        At most DEADLINE_CONTROL_CONCURRENCY commands are in flight at once.
+        Jobs the command succeeded for are updated in the cached snapshot
+        right away (as a new snapshot version) instead of waiting for the next
+        refresh; the refresh after DEADLINE_CACHE_TTL replaces the optimistic
+        values with Deadline's own.
+        """
+        if command not in schemas.JOB_COMMANDS:
+            raise ValueError(f"Unknown job command: {command}")
+        if command == "priority" and priority is None:
+            raise ValueError("The priority command needs a priority")
+        jobs = await self.get_jobs()
+        wanted = list(dict.fromkeys(job_ids))
+        rows = jobs.index_of_many(wanted)
+        semaphore = asyncio.Semaphore(max(1, settings.DEADLINE_CONTROL_CONCURRENCY))
+
+        async def send(job_id: str) -> Optional[str]:
+            if job_id not in rows:
+                return "Job not found"
+            async with semaphore:
+                return await self._send_command(command, job_id, priority)
+
+        with span(
+            "deadline.control_jobs", target=command
+        ), DEADLINE_UPSTREAM_DURATION.labels(f"control_{command}").time():
+            errors = await asyncio.gather(*(send(job_id) for job_id in wanted))
+
+        change = {}
+        if schemas.JOB_COMMANDS[command] is not None:
+            change["status"] = schemas.JOB_COMMANDS[command]
+        if command == "requeue":
+            change["progress"] = 0.0
+        if command == "priority":
+            change["priority"] = priority
+        done = [job_id for job_id, error in zip(wanted, errors) if error is None]
+        changes = {job_id: dict(change) for job_id in done}
+        if command == "resume":
+            # Only suspended jobs go back to the queue; rendering or finished
+            # jobs keep their status
+            statuses = jobs.records([rows[job_id] for job_id in done], ["status"])
+            for job_id, record in zip(done, statuses):
+                if (record["status"] or "").lower() != "suspended":
+                    del changes[job_id]
+        if changes:
+            jobs = await self._apply_locally(command, changes)
+
+        rows = jobs.index_of_many(wanted)
+        results = []
+        for job_id, error in zip(wanted, errors):
+            record = (
+                jobs.records([rows[job_id]], ["status", "priority"])[0]
+                if job_id in rows
+                else {}
+            )
+            results.append(
+                schemas.JobControlResult(
+                    job_id=job_id, ok=error is None, error=error, **record
+                )
+            )
+        return schemas.JobControlResponse(
+            command=command,
+            requested=len(wanted),
+            succeeded=len(done),
+            failed=len(wanted) - len(done),
+            results=results,
+        )
+
+    async def _send_command(
+        self, command: str, job_id: str, priority: Optional[int]
+    ) -> Optional[str]:
+        """Sends one job command upstream; returns the error, or None on success."""
+        if settings.DEADLINE_USE_MOCK_DATA:
+            return "Job control is unavailable with the built-in sample jobs"
+
+        import httpx
+
+        body = {"Command": command, "JobID": job_id}
+        if command == "priority":
+            body["Priority"] = priority
+        try:
+            response = await self._get_client().put("/api/jobs", json=body)
+            response.raise_for_status()
+            return None
+        except httpx.HTTPStatusError as e:
+            logger.warning(
+                "HTTP error %d for %s %s: %s",
+                e.response.status_code,
+                command,
+                job_id,
+                e,
+            )
+            return f"Deadline returned HTTP {e.response.status_code}"
+        except Exception as e:
+            logger.warning("Request failed for %s %s: %s", command, job_id, e)
+            return f"Request failed: {e.__class__.__name__}"
+
+    async def _apply_locally(
+        self, command: str, changes: dict[str, dict]
+    ) -> JobSnapshot:
+        """Replaces the cached snapshot with one with ``changes`` (by job ID) made."""
+        async with self._get_refresh_lock():
+            current = self._snapshot
+            if current is None:
+                return await self.get_jobs()
+            jobs = current.jobs
+            found = jobs.index_of_many(changes)
+            rows = {row: changes[job_id] for job_id, row in found.items()}
+            updated = jobs.with_changes(rows)
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(current.fingerprint.encode())
+            for job_id in sorted(changes):
+                digest.update(
+                    f"{command}:{job_id}:{sorted(changes[job_id].items())}".encode()
+                )
+            fingerprint = f"local-{digest.hexdigest()}"
+            await self._notify(updated)
+            version = await run_blocking(
+                get_backend(), lambda: self._version_for(fingerprint)
+            )
+            self._snapshot = DeadlineSnapshot(
+                version=version,
+                jobs=updated,
+                fingerprint=fingerprint,
+                # Still refreshed on the original schedule
+                fetched_at=current.fetched_at,
+            )
+            set_scoped((self, "snapshot"), self._snapshot)
+            return updated
+
+    async def query_jobs(
+        self, params: schemas.JobQueryParams
+    ) -> schemas.JobQueryResult:
+        """Runs a filter/sort/projection query against the current snapshot."""
+        jobs = await self.get_jobs()
+        with span("deadline.query_jobs"):
+            rows, total = jobs.query.execute(params)
+            return schemas.JobQueryResult(
+                total=total,
+                offset=params.offset,
+                jobs=jobs.records(rows.tolist(), params.fields),
+            )
+
+    async def search_jobs(self, query: str, limit: int = 20) -> schemas.JobSearchResult:
+        """Ranked job name search over the current snapshot."""
+        jobs = await self.get_jobs()
+        if not jobs.has_name_index:
+            # The first search after new content builds the index off the event loop
+            await asyncio.to_thread(lambda: jobs.name_index)
+        with span("deadline.search_jobs"):
+            hits, total = jobs.name_index.search(query, limit)
+            return schemas.JobSearchResult(
+                total=total,
+                jobs=[
+                    schemas.JobSearchHit(**jobs.records([row])[0], score=score)
+                    for row, score in hits
+                ],
+            )
+
+    async def get_version(self) -> int:
+        """Version of the current job snapshot, for ETags."""
+        return (await self.get_snapshot()).version
+
+    async def get_snapshot(self) -> DeadlineSnapshot:
+        """
+        Returns the cached job snapshot, refreshing it after DEADLINE_CACHE_TTL
+        (or ``max_age`` while the sync scheduler keeps it up to date). A
+        snapshot restored from disk is served as is while a background
+        refresh replaces it. When Deadline cannot be reached the last
+        snapshot is kept, and asked for again after another TTL.
+
+        Concurrent requests that find the snapshot expired share one upstream
+        fetch instead of each calling Deadline. Inside a request scope (see
+        ``app.core.request_scope``) the first snapshot read is kept for the
+        rest of the request.
+        """
+        # Within one request every read sees the snapshot it read first
+        scoped = get_scoped((self, "snapshot"))
+        if scoped is not None:
+            return scoped
+        if in_request_scope():
+            for listener in self._demand_listeners:
+                listener()
+        with span("deadline.get_jobs"):
+            snapshot = self._snapshot
+            restored = snapshot is not None and snapshot.restored
+            if restored:
+                # Data restored from disk is served while Deadline is asked
+                # in the background
+                self.reconcile()
+            if restored or self._is_fresh(snapshot):
+                record_cache_lookup("deadline_snapshot", True)
+                set_scoped((self, "snapshot"), snapshot)
+                return snapshot
+            record_cache_lookup("deadline_snapshot", False)
+            async with self._get_refresh_lock():
+                if self._snapshot is not snapshot and self._is_fresh(self._snapshot):
+                    set_scoped((self, "snapshot"), self._snapshot)
+                    return self._snapshot
+                await self._refresh_locked()
+                set_scoped((self, "snapshot"), self._snapshot)
+                return self._snapshot
+
+    async def refresh(self) -> DeadlineSnapshot:
+        """Fetches the jobs from Deadline now, whatever the snapshot's age."""
+        async with self._get_refresh_lock():
+            return await self._refresh_locked()
+
+    @property
+    def cached_snapshot(self) -> Optional[DeadlineSnapshot]:
+        """The snapshot held right now, without refreshing it."""
+        return self._snapshot
+
+    def restore(
+        self, snapshot: DeadlineSnapshot, statistics: Optional[JobStatistics] = None
+    ) -> None:
+        """
+        Serves ``snapshot`` (e.g. saved to disk before a restart) until the
+        first successful refresh replaces it.
+        """
+        if self._snapshot is not None:
+            return
+        # Keep the saved version (and so the ETags clients hold) unless this
+        # content already has one in the shared state backend
+        get_backend().set(
+            f"deadline:snapshot:{snapshot.fingerprint}",
+            str(snapshot.version),
+            ex=VERSION_KEY_TTL,
+            nx=True,
+        )
+        snapshot.version = self._version_for(snapshot.fingerprint)
+        snapshot.restored = True
+        self._snapshot = snapshot
+        if statistics is not None:
+            self._statistics = (snapshot.jobs, statistics)
+
+    def reconcile(self) -> None:
+        """
+        Refreshes the snapshot in a background task, unless one is running or
+        the last attempt was less than DEADLINE_CACHE_TTL ago (doubled after
+        every failed attempt, up to RECONCILE_MAX_BACKOFF).
+        """
+        if self._reconcile_task is not None and not self._reconcile_task.done():
+            return
+        backoff = min(
+            settings.DEADLINE_CACHE_TTL * 2**self._reconcile_failures,
+            RECONCILE_MAX_BACKOFF,
+        )
+        now = time.monotonic()
+        if now - self._reconcile_at < backoff:
+            return
+        self._reconcile_at = now
+        self._reconcile_task = asyncio.get_running_loop().create_task(self._reconcile())
+
+    async def _reconcile(self) -> None:
+        await self.refresh()
+        self._reconcile_failures = (
+            self._reconcile_failures + 1 if self.last_fetch_failed else 0
+        )
+
+    async def _refresh_locked(self) -> DeadlineSnapshot:
+        snapshot = self._snapshot
+        with DEADLINE_UPSTREAM_DURATION.labels("get_jobs").time():
+            jobs, fingerprint = await self._fetch_jobs()
+        if self.last_fetch_failed and snapshot is not None:
+            # The last good (or restored) jobs beat an empty list until
+            # Deadline answers; retried after another DEADLINE_CACHE_TTL
+            snapshot.fetched_at = time.monotonic()
+            return snapshot
+        # An empty list from a failed first fetch is not an observation
+        if not self.last_fetch_failed and (
+            snapshot is None or jobs is not snapshot.jobs
+        ):
+            await self._notify(jobs)
+        version = await run_blocking(
+            get_backend(), lambda: self._version_for(fingerprint)
+        )
+        self._snapshot = DeadlineSnapshot(
+            version=version,
+            jobs=jobs,
+            fingerprint=fingerprint,
+            fetched_at=time.monotonic(),
+        )
+        return self._snapshot
+
+    async def _notify(self, jobs: JobSnapshot) -> None:
+        observed_at = time.time()
+        for listener in self._listeners:
+            try:
+                if asyncio.iscoroutinefunction(listener):
+                    await listener(jobs, observed_at)
+                else:
+                    await asyncio.to_thread(listener, jobs, observed_at)
+            except Exception as e:
+                logger.exception("Snapshot listener failed: %s", e)
+
+    def _is_fresh(self, snapshot: Optional[DeadlineSnapshot]) -> bool:
+        max_age = settings.DEADLINE_CACHE_TTL if self.max_age is None else self.max_age
+        return snapshot is not None and time.monotonic() - snapshot.fetched_at < max_age
+
+    def _version_for(self, fingerprint: str) -> int:
+        """Maps a content fingerprint to its snapshot version."""
+        if self._snapshot is not None and self._snapshot.fingerprint == fingerprint:
+            return self._snapshot.version
+        backend = get_backend()
+        key = f"deadline:snapshot:{fingerprint}"
+        version = backend.get(key)
+        if version is None:
+            # The counter starts at the current time so a fresh backend never
+            # reissues a version (and ETag) clients may still hold. The first
+            # worker to see new data allocates its version.
+            backend.set(VERSION_COUNTER_KEY, str(int(time.time())), nx=True)
+            candidate = backend.incr(VERSION_COUNTER_KEY)
+            if backend.set(key, str(candidate), ex=VERSION_KEY_TTL, nx=True):
+                return candidate
+            version = backend.get(key)
+        return int(version)
+
+    async def _fetch_jobs(self) -> tuple[JobSnapshot, str]:
+        """
+        Performs the upstream request; callers go through get_snapshot().
+
+        Returns the jobs and a fingerprint of the upstream payload, computed
+        once per refresh rather than per response.
+        """
+        if settings.DEADLINE_USE_MOCK_DATA:
+            if self._snapshot is not None and self._snapshot.fingerprint == "sample":
+                return self._snapshot.jobs, "sample"
+            return JobSnapshot.from_jobs(SAMPLE_JOBS), "sample"
+
+        import httpx
+
+        client = self._get_client()
+        # Cleared only once the payload has been parsed, so a malformed one
+        # keeps the last good snapshot like an unreachable server does
+        self.last_fetch_failed = True
+        try:
+            response = await client.get("/api/jobs")
+            response.raise_for_status()
+            fingerprint = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            current = self._snapshot
+            if current is not None and current.fingerprint == fingerprint:
+                # Unchanged content keeps the parsed snapshot and the indexes
+                # already built on it
+                self.last_fetch_failed = False
+                return current.jobs, fingerprint
+            # Assuming the API returns a list of jobs in the expected format
+            jobs = JobSnapshot.from_records(response.json())
+            self.last_fetch_failed = False
+            return jobs, fingerprint
+        except httpx.HTTPStatusError as e:
+            # Handle HTTP errors (e.g., 404, 500)
+            logger.warning("HTTP error %d: %s", e.response.status_code, e)
+            return JobSnapshot.empty(), "empty"
+        except ValueError as e:
+            # Not JSON, or a job list with an invalid row
+            logger.warning("Invalid job payload: %s", e)
+            return JobSnapshot.empty(), "empty"
+        except Exception as e:
+            # Handle other errors (e.g., connection error)
+            logger.warning("Request failed: %s", e)
+            return JobSnapshot.empty(), "empty"
+
 
 deadline_service = DeadlineService()
+
+
+def _observe_snapshot(jobs: JobSnapshot, observed_at: float) -> None:
+    # Imported on first use so NumPy stays out of the startup path
+    from .analytics import farm_analytics
+
+    farm_analytics.observe(jobs, observed_at)
+
+
+deadline_service.add_snapshot_listener(_observe_snapshot)
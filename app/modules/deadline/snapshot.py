@@ -0,0 +1,384 @@
+"""
+Compact columnar representation of a Deadline job list.
+
+A ``DeadlineJob`` model per row costs about 1.5 KB once its nine fields,
+instance dict and duplicated strings are counted. ``JobSnapshot`` stores the
+same data by column instead:
+
+* ``id`` and ``name`` as plain lists of strings;
+* ``status``, ``user`` and ``region`` as ``array('i')`` codes into interned
+  category tables (a few dozen distinct values for 100k+ rows);
+* ``priority`` as ``array('q')``, ``progress`` as ``array('d')`` and the
+  timestamps as ``array('d')`` epoch seconds, with a sentinel for missing
+  values. Timestamps not in the canonical ``YYYY-MM-DDTHH:MM:SSZ`` form keep
+  their original text in a small overflow dict so rows round-trip exactly.
+
+The snapshot behaves like a read-only sequence of ``DeadlineJob``; models are
+only materialized for the rows that are actually indexed or iterated, so
+endpoints filter on the columns (through the NumPy engine in ``query``, the
+name index in ``name_index`` and the ID index in ``row_index``) and build
+models just for the rows they return.
+"""
+
+import math
+import time
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional, Union
+
+from .schemas import DeadlineJob
+
+if TYPE_CHECKING:
+    from .query import JobQuery
+    from .search import NameIndex
+
+MISSING_INT = -(2**63)
+MISSING_CODE = -1
+CATEGORY_COLUMNS = ("status", "user", "region")
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+Selector = Union[None, str, Iterable[str]]
+
+
+class Category:
+    """Interned string column: each row stores an int code into ``values``."""
+
+    __slots__ = ("values", "index", "codes")
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.index: dict[str, int] = {}
+        self.codes = array("i")
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.codes.append(MISSING_CODE)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def assign(self, row: int, value: str) -> None:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes[row] = code
+
+    def copy(self) -> "Category":
+        category = Category()
+        category.values = list(self.values)
+        category.index = dict(self.index)
+        category.codes = array("i", self.codes)
+        return category
+
+    def value(self, row: int) -> Optional[str]:
+        code = self.codes[row]
+        return self.values[code] if code != MISSING_CODE else None
+
+    def codes_matching(self, wanted: Iterable[str]) -> set[int]:
+        """Codes whose value equals one of ``wanted``, ignoring case."""
+        folded = {value.lower() for value in wanted}
+        return {
+            code for code, value in enumerate(self.values) if value.lower() in folded
+        }
+
+
+def _parse_timestamp(value: Optional[str]) -> tuple[float, bool]:
+    """Epoch seconds (NaN when unparseable) and whether ``value`` is canonical."""
+    if value is None:
+        return math.nan, True
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return math.nan, False
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    canonical = len(value) == 20 and value[10] == "T" and value[-1] == "Z"
+    return moment.timestamp(), canonical
+
+
+def _format_timestamp(epoch: float) -> str:
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(epoch))
+
+
+class JobSnapshot(Sequence):
+    """Read-only, column-oriented job list; see the module docstring."""
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.categories = {name: Category() for name in CATEGORY_COLUMNS}
+        self.priority = array("q")
+        self.progress = array("d")
+        self.timestamps = {name: array("d") for name in TIMESTAMP_COLUMNS}
+        # (column, row) -> original text of non-canonical timestamps
+        self.raw_timestamps: dict[tuple[str, int], str] = {}
+
+    # --- Construction ---
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> "JobSnapshot":
+        """
+        Builds a snapshot from job dicts (e.g. the upstream JSON payload).
+
+        Any invalid row raises ValueError and rejects the whole payload, so
+        the service keeps serving its previous snapshot rather than a list
+        missing some jobs.
+        """
+        snapshot = cls()
+        for record in records:
+            snapshot._append(record)
+        return snapshot
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[DeadlineJob]) -> "JobSnapshot":
+        return cls.from_records(job.model_dump() for job in jobs)
+
+    def _append(self, record: Mapping[str, Any]) -> None:
+        # Every field is checked and converted before any column is touched
+        # so a bad row cannot leave the columns with different lengths
+        try:
+            job_id, name = record["id"], record["name"]
+            status, user = record["status"], record["user"]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid job record: {record!r}") from None
+        for value in (job_id, name, status, user):
+            if not isinstance(value, str):
+                raise ValueError(f"Invalid job record: {record!r}")
+        region = record.get("region")
+        if region is not None and not isinstance(region, str):
+            raise ValueError(f"Invalid job record: {record!r}")
+        priority, progress = record.get("priority"), record.get("progress")
+        try:
+            priority = MISSING_INT if priority is None else int(priority)
+            progress = math.nan if progress is None else float(progress)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid job record: {record!r}") from None
+        if not MISSING_INT <= priority < 2**63:
+            raise ValueError(f"Invalid job record: {record!r}")
+        timestamps = [(column, record.get(column)) for column in TIMESTAMP_COLUMNS]
+        parsed = [_parse_timestamp(value) for _, value in timestamps]
+        row = len(self.ids)
+
+        self.ids.append(job_id)
+        self.names.append(name)
+        self.categories["status"].append(status)
+        self.categories["user"].append(user)
+        self.categories["region"].append(region)
+        self.priority.append(priority)
+        self.progress.append(progress)
+        for (column, value), (epoch, canonical) in zip(timestamps, parsed):
+            self.timestamps[column].append(epoch)
+            if not canonical:
+                self.raw_timestamps[(column, row)] = value
+
+    # --- Sequence of DeadlineJob ---
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.rows(range(*item.indices(len(self))))
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("job snapshot index out of range")
+        return self.job(item)
+
+    def __iter__(self) -> Iterator[DeadlineJob]:
+        for row in range(len(self)):
+            yield self.job(row)
+
+    def __eq__(self, other: object) -> bool:
+        # Compares like the list of models it replaces
+        if isinstance(other, (JobSnapshot, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def job(self, row: int) -> DeadlineJob:
+        """Materializes one row as a model."""
+        priority = self.priority[row]
+        progress = self.progress[row]
+        # Regular construction: pydantic-core validation is faster than the
+        # pure-Python model_construct()
+        return DeadlineJob(
+            id=self.ids[row],
+            name=self.names[row],
+            status=self.categories["status"].value(row),
+            user=self.categories["user"].value(row),
+            region=self.categories["region"].value(row),
+            priority=None if priority == MISSING_INT else priority,
+            progress=None if math.isnan(progress) else progress,
+            created_at=self._timestamp("created_at", row),
+            updated_at=self._timestamp("updated_at", row),
+        )
+
+    def _timestamp(self, column: str, row: int) -> Optional[str]:
+        raw = self.raw_timestamps.get((column, row))
+        if raw is not None:
+            return raw
+        epoch = self.timestamps[column][row]
+        return None if math.isnan(epoch) else _format_timestamp(epoch)
+
+    def rows(self, indices: Iterable[int]) -> list[DeadlineJob]:
+        return [self.job(row) for row in indices]
+
+    def records(
+        self, indices: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> list[dict[str, Any]]:
+        """Rows as plain dicts holding only ``fields`` (all fields by default)."""
+        getters = [(field, self._getters[field]) for field in (fields or self._getters)]
+        return [{field: get(self, row) for field, get in getters} for row in indices]
+
+    def _priority(self, row: int) -> Optional[int]:
+        priority = self.priority[row]
+        return None if priority == MISSING_INT else priority
+
+    def _progress(self, row: int) -> Optional[float]:
+        progress = self.progress[row]
+        return None if math.isnan(progress) else progress
+
+    # Field name -> reader of that field for one row, in DeadlineJob order
+    _getters = {
+        "id": lambda self, row: self.ids[row],
+        "name": lambda self, row: self.names[row],
+        "status": lambda self, row: self.categories["status"].value(row),
+        "user": lambda self, row: self.categories["user"].value(row),
+        "region": lambda self, row: self.categories["region"].value(row),
+        "priority": _priority,
+        "progress": _progress,
+        "created_at": lambda self, row: self._timestamp("created_at", row),
+        "updated_at": lambda self, row: self._timestamp("updated_at", row),
+    }
+
+    # --- Column queries ---
+
+    def index_of(self, job_id: str) -> Optional[int]:
+        return self.row_index.get(job_id)
+
+    def index_of_many(self, job_ids: Iterable[str]) -> dict[str, int]:
+        """Rows of the given job IDs that are in the snapshot."""
+        row_index = self.row_index
+        return {job_id: row_index[job_id] for job_id in job_ids if job_id in row_index}
+
+    def get(self, job_id: str) -> Optional[DeadlineJob]:
+        row = self.index_of(job_id)
+        return self.job(row) if row is not None else None
+
+    @property
+    def query(self) -> "JobQuery":
+        """Vectorized query engine over the columns, created on first use."""
+        engine = self.__dict__.get("_query")
+        if engine is None:
+            from .query import JobQuery
+
+            engine = self.__dict__["_query"] = JobQuery(self)
+        return engine
+
+    @property
+    def name_index(self) -> "NameIndex":
+        """Trigram index over the job names, built on first use."""
+        index = self.__dict__.get("_name_index")
+        if index is None:
+            from .search import NameIndex
+
+            index = self.__dict__["_name_index"] = NameIndex(self.names)
+        return index
+
+    @property
+    def row_index(self) -> dict[str, int]:
+        """Job ID -> row (the first one, should an ID repeat), built on first use."""
+        index = self.__dict__.get("_row_index")
+        if index is None:
+            # Filled back to front so the first row of a repeated ID wins
+            ids = self.ids
+            index = self.__dict__["_row_index"] = dict(
+                zip(reversed(ids), range(len(ids) - 1, -1, -1))
+            )
+        return index
+
+    @property
+    def has_name_index(self) -> bool:
+        return "_name_index" in self.__dict__
+
+    def where(
+        self,
+        status: Selector = None,
+        user: Selector = None,
+        region: Selector = None,
+        limit: Optional[int] = None,
+    ) -> list[int]:
+        """
+        Row indices matching every given selector, in snapshot order.
+
+        Each selector is a value or a collection of values compared without
+        regard to case, like the original list-comprehension filters.
+        """
+        mask = self.query.mask(status=status, user=user, region=region)
+        return self.query.rows(mask, limit).tolist()
+
+    def count_by(
+        self, column: str, rows: Optional[Iterable[int]] = None
+    ) -> dict[str, int]:
+        """Counts per category value present in the rows, in first-seen order."""
+        return self.query.count_by(column, rows)
+
+    def distinct(self, column: str, rows: Optional[Iterable[int]] = None) -> list[str]:
+        """Category values in the snapshot (or in ``rows``), in first-seen order."""
+        return list(self.count_by(column, rows))
+
+    @classmethod
+    def empty(cls) -> "JobSnapshot":
+        return cls()
+
+    # --- Copy-on-write updates ---
+
+    def with_changes(self, changes: Mapping[int, Mapping[str, Any]]) -> "JobSnapshot":
+        """
+        A new snapshot with ``status``/``priority``/``progress`` replaced on
+        some rows (``{row: {field: value}}``).
+
+        Snapshots are never modified in place (their query engine and name
+        index cache derived data), so the changed columns are copied and all
+        others are shared with this snapshot.
+        """
+        snapshot = JobSnapshot()
+        snapshot.ids = self.ids
+        snapshot.names = self.names
+        snapshot.categories = dict(self.categories)
+        snapshot.priority = self.priority
+        snapshot.progress = self.progress
+        snapshot.timestamps = self.timestamps
+        snapshot.raw_timestamps = self.raw_timestamps
+        if "_row_index" in self.__dict__:
+            # The IDs are shared, and so is their index
+            snapshot.__dict__["_row_index"] = self.__dict__["_row_index"]
+        fields = {field for change in changes.values() for field in change}
+        unknown = fields - {"status", "priority", "progress"}
+        if unknown:
+            raise ValueError(f"Unsupported job changes: {sorted(unknown)}")
+        if "status" in fields:
+            snapshot.categories["status"] = self.categories["status"].copy()
+        if "priority" in fields:
+            snapshot.priority = array("q", self.priority)
+        if "progress" in fields:
+            snapshot.progress = array("d", self.progress)
+
+        for row, change in changes.items():
+            if "status" in change:
+                snapshot.categories["status"].assign(row, change["status"])
+            if "priority" in change:
+                value = change["priority"]
+                snapshot.priority[row] = MISSING_INT if value is None else int(value)
+            if "progress" in change:
+                value = change["progress"]
+                snapshot.progress[row] = math.nan if value is None else float(value)
+        return snapshot
@@ -0,0 +1,215 @@
+"""
+Adaptive background sync of the Deadline job snapshot.
+
+Without it the snapshot is refreshed on demand: the first request after
+DEADLINE_CACHE_TTL waits for Deadline. ``SyncScheduler`` refreshes it in the
+background instead, at an interval it adjusts after every refresh:
+
+* change rate: the interval halves when a refresh brings new content and
+  grows by half when it does not, between DEADLINE_SYNC_MIN_INTERVAL and
+  DEADLINE_SYNC_MAX_INTERVAL;
+* client demand: the interval is not shorter than the average gap between
+  requests (nobody would read the extra refreshes), unless agents are
+  subscribed to job updates;
+* upstream health: the interval is at least ``LATENCY_FACTOR`` times the last
+  fetch duration, and doubles with every failed fetch.
+
+While it runs, requests are served from its snapshot (``service.max_age``)
+and never wait for Deadline. With no request for DEADLINE_SYNC_IDLE_TIMEOUT
+and no MCP session open it pauses, so an idle machine makes no upstream calls
+(the history sampler only records snapshots fetched by others) and can scale
+to zero; the next request refreshes on demand as before and wakes it up.
+
+Each decision is exported: the interval, whether it is paused, the smoothed
+change and request rates, refresh outcomes and the reason for every interval.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Optional
+
+from ...core.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Upstream busy at most 1/LATENCY_FACTOR of the time
+LATENCY_FACTOR = 10.0
+# Weight of the latest observation in the smoothed change and request rates
+SMOOTHING = 0.3
+
+SYNC_INTERVAL = Gauge(
+    "deadline_sync_interval_seconds",
+    "Current interval between background Deadline refreshes.",
+)
+SYNC_PAUSED = Gauge(
+    "deadline_sync_paused",
+    "1 while background Deadline refreshes are paused for lack of clients.",
+)
+SYNC_CHANGE_RATIO = Gauge(
+    "deadline_sync_change_ratio",
+    "Smoothed share of background refreshes that brought new job data.",
+)
+SYNC_DEMAND_RATE = Gauge(
+    "deadline_sync_demand_requests_per_second",
+    "Smoothed rate of requests reading the job snapshot.",
+)
+SYNC_REFRESHES = Counter(
+    "deadline_sync_refreshes_total",
+    "Background Deadline refreshes by outcome (changed, unchanged, error).",
+    ["outcome"],
+)
+SYNC_DECISIONS = Counter(
+    "deadline_sync_decisions_total",
+    "Sync interval decisions by the factor that set them.",
+    ["reason"],
+)
+
+
+class SyncScheduler:
+    """Background task refreshing the service's snapshot at an adaptive interval."""
+
+    def __init__(
+        self,
+        service,
+        min_interval: float,
+        max_interval: float,
+        idle_timeout: float,
+        clients: Callable[[], int] = lambda: 0,
+        subscribers: Callable[[], int] = lambda: 0,
+    ):
+        self.service = service
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.idle_timeout = idle_timeout
+        # Open client connections (MCP sessions) that keep the sync running
+        self.clients = clients
+        # Agents subscribed to job updates, which want changes pushed promptly
+        self.subscribers = subscribers
+        self.interval = min_interval
+        self.reason = "start"
+        self.paused = False
+        self.change_ratio = 0.0
+        self.demand_rate = 0.0
+        self.failures = 0
+        self.last_latency = 0.0
+        self._fingerprint: Optional[str] = None
+        self._requests = 0
+        self._counted_at = time.monotonic()
+        self._last_request = -math.inf
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def note_demand(self) -> None:
+        """Counts one request reading the snapshot; wakes the sync if paused."""
+        self._requests += 1
+        self._last_request = time.monotonic()
+        if self.paused and self._wake is not None:
+            self._wake.set()
+
+    def is_idle(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return (
+            now - self._last_request >= self.idle_timeout
+            and self.clients() == 0
+            and self.subscribers() == 0
+        )
+
+    async def sync_once(self) -> str:
+        """Refreshes the snapshot, adjusts the interval and returns the outcome."""
+        start = time.perf_counter()
+        snapshot = await self.service.refresh()
+        self.last_latency = time.perf_counter() - start
+        if self.service.last_fetch_failed:
+            self.failures += 1
+            outcome = "error"
+        else:
+            self.failures = 0
+            changed = (
+                self._fingerprint is not None
+                and snapshot.fingerprint != self._fingerprint
+            )
+            self._fingerprint = snapshot.fingerprint
+            self.change_ratio += SMOOTHING * (changed - self.change_ratio)
+            outcome = "changed" if changed else "unchanged"
+        SYNC_REFRESHES.labels(outcome).inc()
+        self.adjust(outcome)
+        return outcome
+
+    def adjust(self, outcome: str, now: Optional[float] = None) -> float:
+        """Picks the next interval after a refresh with ``outcome``."""
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self._counted_at, 1e-6)
+        self.demand_rate += SMOOTHING * (self._requests / elapsed - self.demand_rate)
+        self._requests = 0
+        self._counted_at = now
+
+        if outcome == "error":
+            interval, reason = self.interval * 2, "backoff"
+        elif outcome == "changed":
+            interval, reason = self.interval / 2, "change"
+        else:
+            interval, reason = self.interval * 1.5, "steady"
+        interval = max(self.min_interval, interval)
+        if self.last_latency * LATENCY_FACTOR > interval:
+            interval, reason = self.last_latency * LATENCY_FACTOR, "latency"
+        if (
+            self.subscribers() == 0
+            and self.demand_rate > 0
+            and 1 / self.demand_rate > interval
+        ):
+            interval, reason = 1 / self.demand_rate, "demand"
+        if interval > self.max_interval:
+            interval = self.max_interval
+            reason = "backoff" if outcome == "error" else "max_interval"
+
+        self.interval = interval
+        self._decide(reason)
+        return interval
+
+    def _decide(self, reason: str) -> None:
+        self.reason = reason
+        # A late refresh still serves requests instead of making them wait
+        self.service.max_age = None if self.paused else self.interval * 2
+        SYNC_DECISIONS.labels(reason).inc()
+        SYNC_INTERVAL.labels().set(self.interval)
+        SYNC_PAUSED.labels().set(1 if self.paused else 0)
+        SYNC_CHANGE_RATIO.labels().set(self.change_ratio)
+        SYNC_DEMAND_RATE.labels().set(self.demand_rate)
+
+    async def _run(self) -> None:
+        while True:
+            if self.is_idle():
+                # Requests go back to refreshing on demand until one wakes us
+                self.paused = True
+                self._wake.clear()
+                self._decide("idle")
+                await self._wake.wait()
+                self.paused = False
+                # The waking request has just refreshed the snapshot
+                self.interval = self.min_interval
+                self._decide("demand")
+            else:
+                try:
+                    await self.sync_once()
+                except Exception as e:
+                    logger.exception("Deadline sync failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self.service.add_demand_listener(self.note_demand)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.service.remove_demand_listener(self.note_demand)
+            self.service.max_age = None
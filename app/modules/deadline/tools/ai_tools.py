@@ -5,30 +5,121 @@ simple parameters, and structured responses.
 Enhanced with MCP decorators for proper tool, resource, and prompt support.
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
-from mcp.server.fastmcp import FastMCP
-from ..service import deadline_service
-from ..schemas import DeadlineRead
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
 
-tools_router = APIRouter(tags=["Deadline AI Tools"])
+from fastapi import Body, HTTPException
+from pydantic import BaseModel, Field
 
-# Create MCP instance for decorators
-mcp = FastMCP("deadline-tools")
+from app.core.config import settings
+from app.core.http_cache import conditional_get
+from app.core.lazy_mcp import LazyFastMCP
+from app.core.profiling import TracedAPIRouter
+from app.core.render_cache import RenderCache, cached_render
+from app.core.request_scope import request_scope
+from app.core.tool_results import (
+    decode_cursor,
+    encode_cursor,
+    fit_to_budget,
+    json_size,
+    report_progress,
+)
+
+from ..history import get_history_store
+from ..schemas import (
+    MAX_CONTROL_JOBS,
+    HistorySeries,
+    JobControlResponse,
+    JobEstimate,
+    JobQueryParams,
+    JobQueryResult,
+    JobSearchResult,
+    LoadComparison,
+    ThroughputReport,
+)
+from ..service import (
+    ATTENTION_STATUSES,
+    FAILED_STATUSES,
+    RUNNING_STATUSES,
+    deadline_service,
+)
+
+# HTTP callers get ETags/304s; MCP calls bypass the router dependencies (the
+# MCP server opens a request scope per message itself)
+tools_router = TracedAPIRouter(
+    tags=["Deadline AI Tools"],
+    dependencies=[
+        request_scope(),
+        conditional_get("deadline", deadline_service.get_version),
+    ],
+)
+
+# History and time-relative analytics change between snapshot versions, so
+# these tools carry no snapshot ETag
+live_tools_router = TracedAPIRouter(
+    tags=["Deadline AI Tools"], dependencies=[request_scope()]
+)
+
+# Create MCP instance for decorators; the real server is built on first use
+# when LAZY_STARTUP is enabled
+mcp = LazyFastMCP("deadline-tools", lazy=settings.LAZY_STARTUP)
+
+# Rendered resources and prompts, reused until the job snapshot changes
+render_cache = RenderCache(settings.MCP_RENDER_CACHE_BYTES)
+cached = cached_render(render_cache, deadline_service.get_version)
+
+JOBS_RESOURCE_URI = "deadline://jobs"
+
+
+async def _jobs_changed(jobs, observed_at: float) -> None:
+    # Subscribed agents re-read deadline://jobs instead of polling it
+    await mcp.notify_resource_updated(JOBS_RESOURCE_URI)
+
+
+deadline_service.add_snapshot_listener(_jobs_changed)
+
+
+def open_sessions() -> int:
+    """Open MCP sessions; none before the server is built."""
+    return mcp.session_count() if mcp.is_built else 0
+
+
+def jobs_subscribers() -> int:
+    """MCP sessions subscribed to deadline://jobs."""
+    return mcp.subscriber_count(JOBS_RESOURCE_URI) if mcp.is_built else 0
+
+
+def _job_infos(jobs, rows) -> List["DeadlineJobInfo"]:
+    """Builds DeadlineJobInfo for the given snapshot rows straight from its columns."""
+    statuses = jobs.categories["status"]
+    users = jobs.categories["user"]
+    return [
+        DeadlineJobInfo(
+            id=jobs.ids[row],
+            name=jobs.names[row],
+            status=statuses.value(row),
+            user=users.value(row),
+        )
+        for row in rows
+    ]
 
 
 # Function-calling compatible models
 class DeadlineJobInfo(BaseModel):
     """Simplified job information for AI function calls."""
+
     id: str = Field(description="Unique job identifier")
     name: str = Field(description="Job name or title")
-    status: str = Field(description="Current job status (Completed, Rendering, Failed, etc.)")
+    status: str = Field(
+        description="Current job status (Completed, Rendering, Failed, etc.)"
+    )
     user: str = Field(description="User who submitted the job")
 
 
 class JobStatusResult(BaseModel):
     """Job status check result for AI function calls."""
+
     job_id: str = Field(description="Job identifier")
     status: str = Field(description="Current status")
     is_running: bool = Field(description="Whether job is currently running")
@@ -38,6 +129,7 @@ class JobStatusResult(BaseModel):
 
 class WorkloadSummary(BaseModel):
     """Workload summary for AI analysis."""
+
     total_jobs: int = Field(description="Total number of jobs")
     running_jobs: int = Field(description="Number of currently running jobs")
     completed_jobs: int = Field(description="Number of completed jobs")
@@ -45,25 +137,100 @@ class WorkloadSummary(BaseModel):
     active_users: List[str] = Field(description="List of users with active jobs")
 
 
+class JobPage(BaseModel):
+    """Summary of all jobs, then one page of them."""
+
+    total_jobs: int = Field(description="Total number of jobs")
+    status_counts: Dict[str, int] = Field(description="Number of jobs per status")
+    offset: int = Field(description="Index of the first job on this page")
+    jobs: List[DeadlineJobInfo] = Field(description="Jobs on this page")
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to get the next page; null on the last page"
+    )
+
+
+# Room left in the result budget for the summary fields and the cursor
+PAGE_OVERHEAD_BYTES = 512
+
+
+def _status_line(statistics) -> str:
+    counts = ", ".join(
+        f"{status} {count}" for status, count in statistics.status_counts.items()
+    )
+    return (
+        f"{statistics.total} jobs: {counts}" if counts else f"{statistics.total} jobs"
+    )
+
+
+def _resume_row(jobs, cursor: str) -> int:
+    """Row a continuation cursor points at, following its job if rows moved."""
+    if not cursor:
+        return 0
+    state = decode_cursor(cursor)
+    row, job_id = state.get("row"), state.get("id")
+    if not isinstance(row, int) or not isinstance(job_id, str):
+        raise ValueError("Invalid cursor")
+    if 0 <= row < len(jobs) and jobs.ids[row] == job_id:
+        return row
+    row = jobs.index_of(job_id)
+    if row is None:
+        raise ValueError(
+            "Cursor expired: the job list changed; start again without a cursor"
+        )
+    return row
+
+
 @mcp.tool()
-@tools_router.get("/get_all_jobs", response_model=List[DeadlineJobInfo])
-async def get_all_jobs():
+@tools_router.get("/get_all_jobs", response_model=JobPage)
+async def get_all_jobs(cursor: str = ""):
     """
-    Get all deadline jobs.
-    
-    Returns a list of all jobs in the system with basic information.
-    Use this function to get an overview of all current jobs.
+    Get all deadline jobs, one page at a time.
+
+    Args:
+        cursor: next_cursor of the previous page; leave empty for the first page
+
+    Returns the total and the number of jobs per status, then as many jobs
+    (with basic information) as fit in one result. When more jobs remain,
+    next_cursor is set: call again with it to get the next page.
+    Use this function to get an overview of all current jobs; use query_jobs
+    to narrow them down.
     """
+    await report_progress(0, 2, "Loading jobs")
     jobs = await deadline_service.get_jobs()
-    return [
-        DeadlineJobInfo(
-            id=job.id,
-            name=job.name,
-            status=job.status,
-            user=job.user
-        )
-        for job in jobs
-    ]
+    statistics = await deadline_service.get_statistics()
+    # The summary reaches MCP clients before the page is built
+    await report_progress(1, 2, _status_line(statistics))
+    try:
+        start = _resume_row(jobs, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    statuses = jobs.categories["status"]
+    users = jobs.categories["user"]
+    records = (
+        {
+            "id": jobs.ids[row],
+            "name": jobs.names[row],
+            "status": statuses.value(row),
+            "user": users.value(row),
+        }
+        for row in range(start, len(jobs))
+    )
+    budget = settings.TOOL_RESULT_MAX_BYTES - PAGE_OVERHEAD_BYTES
+    # Both sit in the page object: the counts one level deep, the jobs two
+    budget -= json_size(statistics.status_counts, depth=1)
+    end = start + fit_to_budget(records, budget, depth=2)
+    next_cursor = (
+        encode_cursor({"row": end, "id": jobs.ids[end]}) if end < len(jobs) else None
+    )
+    await report_progress(2, 2)
+    return JobPage(
+        total_jobs=statistics.total,
+        status_counts=statistics.status_counts,
+        offset=start,
+        jobs=_job_infos(jobs, range(start, end)),
+        next_cursor=next_cursor,
+    )
 
 
 @mcp.tool()
@@ -71,25 +238,15 @@ async def get_all_jobs():
 async def get_jobs_by_status(status: str):
     """
     Get jobs filtered by status.
-    
+
     Args:
         status: Job status to filter by (e.g., "Rendering", "Completed", "Failed")
-    
+
     Returns a list of jobs matching the specified status.
     Use this to find jobs in a specific state.
     """
-    jobs = await deadline_service.get_jobs()
-    filtered_jobs = [job for job in jobs if job.status.lower() == status.lower()]
-    
-    return [
-        DeadlineJobInfo(
-            id=job.id,
-            name=job.name,
-            status=job.status,
-            user=job.user
-        )
-        for job in filtered_jobs
-    ]
+    jobs, rows = await deadline_service.select_jobs(status=status)
+    return _job_infos(jobs, rows)
 
 
 @mcp.tool()
@@ -97,25 +254,105 @@ async def get_jobs_by_status(status: str):
 async def get_jobs_by_user(username: str):
     """
     Get jobs for a specific user.
-    
+
     Args:
         username: Username to filter jobs by
-    
+
     Returns a list of jobs belonging to the specified user.
     Use this to see what jobs a particular user has submitted.
     """
-    jobs = await deadline_service.get_jobs()
-    user_jobs = [job for job in jobs if job.user.lower() == username.lower()]
-    
-    return [
-        DeadlineJobInfo(
-            id=job.id,
-            name=job.name,
-            status=job.status,
-            user=job.user
+    jobs, rows = await deadline_service.select_jobs(user=username)
+    return _job_infos(jobs, rows)
+
+
+@mcp.tool()
+@tools_router.get("/query_jobs", response_model=JobQueryResult)
+async def query_jobs(
+    status: Optional[str] = None,
+    user: Optional[str] = None,
+    region: Optional[str] = None,
+    priority_min: Optional[int] = None,
+    priority_max: Optional[int] = None,
+    progress_min: Optional[float] = None,
+    progress_max: Optional[float] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    updated_before: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    name_contains: Optional[str] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """
+    Query jobs with several filters at once, sorted and trimmed to the fields you need.
+
+    Args:
+        status: Comma-separated statuses, any of which may match
+            (e.g. "Failed,Suspended")
+        user: Comma-separated usernames
+        region: Comma-separated regions
+        priority_min: Minimum priority, inclusive
+        priority_max: Maximum priority, inclusive
+        progress_min: Minimum progress percentage, inclusive
+        progress_max: Maximum progress percentage, inclusive
+        created_after: ISO 8601 time; only jobs created at or after it
+        created_before: ISO 8601 time; only jobs created at or before it
+        updated_after: ISO 8601 time; only jobs updated at or after it
+        updated_before: ISO 8601 time; only jobs updated at or before it
+        name_prefix: Job name prefix, case-insensitive
+        name_contains: Text the job name must contain, case-insensitive
+        sort: Comma-separated fields, "-" prefix for descending (e.g. "-priority,name")
+        fields: Comma-separated fields to return (e.g. "id,name,status")
+        limit: Maximum number of jobs to return (1-1000)
+        offset: Number of matching jobs to skip, for paging
+
+    Returns the total number of matches and one page of projected jobs.
+    Prefer this over get_all_jobs: request only the rows and fields you need.
+    """
+    try:
+        params = JobQueryParams(
+            status=status,
+            user=user,
+            region=region,
+            priority_min=priority_min,
+            priority_max=priority_max,
+            progress_min=progress_min,
+            progress_max=progress_max,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            name_prefix=name_prefix,
+            name_contains=name_contains,
+            sort=sort,
+            fields=fields,
+            limit=limit,
+            offset=offset,
         )
-        for job in user_jobs
-    ]
+        return await deadline_service.query_jobs(params)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@mcp.tool()
+@tools_router.get("/search_jobs", response_model=JobSearchResult)
+async def search_jobs(query: str, limit: int = 20):
+    """
+    Search jobs by partial name, best matches first.
+
+    Args:
+        query: Name fragments, all of which must appear (e.g. "Scene_02", "comp_v014")
+        limit: Maximum number of jobs to return (1-200)
+
+    Returns the number of matching jobs and the most relevant ones.
+    Use this when the user mentions a shot, scene or version by name.
+    """
+    if not query.strip():
+        raise HTTPException(status_code=422, detail="query must not be empty")
+    return await deadline_service.search_jobs(query, max(1, min(limit, 200)))
 
 
 @mcp.tool()
@@ -123,27 +360,26 @@ async def get_jobs_by_user(username: str):
 async def check_job_status(job_id: str):
     """
     Check the status of a specific job.
-    
+
     Args:
         job_id: The unique identifier of the job to check
-    
+
     Returns detailed status information about the job.
     Use this to monitor individual job progress.
     """
-    jobs = await deadline_service.get_jobs()
-    job = next((j for j in jobs if j.id == job_id), None)
-    
+    job = await deadline_service.get_job(job_id)
+
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-    
+
     status_lower = job.status.lower()
-    
+
     return JobStatusResult(
         job_id=job.id,
         status=job.status,
-        is_running=status_lower in ["rendering", "queued", "processing"],
+        is_running=status_lower in RUNNING_STATUSES,
         is_completed=status_lower == "completed",
-        needs_attention=status_lower in ["failed", "error", "suspended"]
+        needs_attention=status_lower in ATTENTION_STATUSES,
     )
 
 
@@ -152,35 +388,19 @@ async def check_job_status(job_id: str):
 async def get_workload_summary():
     """
     Get a summary of the current workload.
-    
+
     Returns statistics about all jobs including counts by status
     and list of active users.
     Use this to understand the overall system workload.
     """
-    jobs = await deadline_service.get_jobs()
-    
-    # Count jobs by status
-    running_count = 0
-    completed_count = 0
-    failed_count = 0
-    active_users = set()
-    
-    for job in jobs:
-        status_lower = job.status.lower()
-        if status_lower in ["rendering", "queued", "processing"]:
-            running_count += 1
-            active_users.add(job.user)
-        elif status_lower == "completed":
-            completed_count += 1
-        elif status_lower in ["failed", "error"]:
-            failed_count += 1
-    
+    statistics = await deadline_service.get_statistics()
+
     return WorkloadSummary(
-        total_jobs=len(jobs),
-        running_jobs=running_count,
-        completed_jobs=completed_count,
-        failed_jobs=failed_count,
-        active_users=list(active_users)
+        total_jobs=statistics.total,
+        running_jobs=statistics.running,
+        completed_jobs=statistics.completed,
+        failed_jobs=statistics.failed,
+        active_users=statistics.active_users,
     )
 
 
@@ -189,25 +409,12 @@ async def get_workload_summary():
 async def get_failed_jobs():
     """
     Get all jobs that have failed.
-    
+
     Returns a list of jobs with failed or error status.
     Use this to identify jobs that need attention or troubleshooting.
     """
-    jobs = await deadline_service.get_jobs()
-    failed_jobs = [
-        job for job in jobs 
-        if job.status.lower() in ["failed", "error", "suspended"]
-    ]
-    
-    return [
-        DeadlineJobInfo(
-            id=job.id,
-            name=job.name,
-            status=job.status,
-            user=job.user
-        )
-        for job in failed_jobs
-    ]
+    jobs, rows = await deadline_service.select_jobs(status=ATTENTION_STATUSES)
+    return _job_infos(jobs, rows)
 
 
 @mcp.tool()
@@ -215,25 +422,12 @@ async def get_failed_jobs():
 async def get_running_jobs():
     """
     Get all currently running jobs.
-    
+
     Returns a list of jobs that are currently being processed.
     Use this to monitor active rendering or processing tasks.
     """
-    jobs = await deadline_service.get_jobs()
-    running_jobs = [
-        job for job in jobs 
-        if job.status.lower() in ["rendering", "queued", "processing"]
-    ]
-    
-    return [
-        DeadlineJobInfo(
-            id=job.id,
-            name=job.name,
-            status=job.status,
-            user=job.user
-        )
-        for job in running_jobs
-    ]
+    jobs, rows = await deadline_service.select_jobs(status=RUNNING_STATUSES)
+    return _job_infos(jobs, rows)
 
 
 @mcp.tool()
@@ -241,18 +435,11 @@ async def get_running_jobs():
 async def count_jobs_by_status():
     """
     Count jobs grouped by their status.
-    
+
     Returns a dictionary with status names as keys and counts as values.
     Use this to get quick statistics about job distribution.
     """
-    jobs = await deadline_service.get_jobs()
-    status_counts = {}
-    
-    for job in jobs:
-        status = job.status
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    return status_counts
+    return await deadline_service.count_by_status()
 
 
 @mcp.tool()
@@ -260,13 +447,11 @@ async def count_jobs_by_status():
 async def list_active_users():
     """
     Get list of users who have jobs in the system.
-    
+
     Returns a list of usernames who have submitted jobs.
     Use this to see which users are currently using the system.
     """
-    jobs = await deadline_service.get_jobs()
-    users = list(set(job.user for job in jobs))
-    return sorted(users)
+    return await deadline_service.list_users()
 
 
 @mcp.tool()
@@ -274,48 +459,221 @@ async def list_active_users():
 async def is_system_busy():
     """
     Check if the render system is currently busy.
-    
+
     Returns information about system load and whether it's busy.
     Use this to determine if it's a good time to submit new jobs.
     """
-    jobs = await deadline_service.get_jobs()
-    running_jobs = [
-        job for job in jobs 
-        if job.status.lower() in ["rendering", "queued", "processing"]
-    ]
-    
-    total_jobs = len(jobs)
-    running_count = len(running_jobs)
-    
+    statistics = await deadline_service.get_statistics()
+
+    total_jobs = statistics.total
+    running_count = statistics.running
+
     # Consider system busy if more than 70% of jobs are running
     is_busy = running_count > (total_jobs * 0.7) if total_jobs > 0 else False
-    
+
     return {
         "is_busy": is_busy,
         "total_jobs": total_jobs,
         "running_jobs": running_count,
-        "load_percentage": round((running_count / total_jobs * 100) if total_jobs > 0 else 0, 1),
-        "recommendation": "Wait for current jobs to complete" if is_busy else "System available for new jobs"
+        "load_percentage": round(
+            (running_count / total_jobs * 100) if total_jobs > 0 else 0, 1
+        ),
+        "recommendation": (
+            "Wait for current jobs to complete"
+            if is_busy
+            else "System available for new jobs"
+        ),
     }
 
+
+# Job control: POST routes; the ID list is the JSON body ({"job_ids": [...]})
+JobIds = Body(
+    ...,
+    embed=True,
+    min_length=1,
+    max_length=MAX_CONTROL_JOBS,
+    description="IDs of the jobs to change",
+)
+
+
+@mcp.tool()
+@tools_router.post("/suspend_jobs", response_model=JobControlResponse)
+async def suspend_jobs(job_ids: List[str] = JobIds):
+    """
+    Suspend jobs so they stop rendering.
+
+    Args:
+        job_ids: IDs of the jobs to suspend (up to 1000)
+
+    Returns the outcome for every job, with its status afterwards.
+    Use this to stop jobs that are failing or blocking the farm.
+    """
+    return await deadline_service.control_jobs("suspend", job_ids)
+
+
+@mcp.tool()
+@tools_router.post("/resume_jobs", response_model=JobControlResponse)
+async def resume_jobs(job_ids: List[str] = JobIds):
+    """
+    Resume suspended jobs.
+
+    Args:
+        job_ids: IDs of the jobs to resume (up to 1000)
+
+    Returns the outcome for every job, with its status afterwards.
+    """
+    return await deadline_service.control_jobs("resume", job_ids)
+
+
+@mcp.tool()
+@tools_router.post("/requeue_jobs", response_model=JobControlResponse)
+async def requeue_jobs(job_ids: List[str] = JobIds):
+    """
+    Requeue jobs so they render again from the start.
+
+    Args:
+        job_ids: IDs of the jobs to requeue (up to 1000)
+
+    Returns the outcome for every job, with its status afterwards.
+    Use this to retry failed jobs after fixing the cause.
+    """
+    return await deadline_service.control_jobs("requeue", job_ids)
+
+
+@mcp.tool()
+@tools_router.post("/set_job_priority", response_model=JobControlResponse)
+async def set_job_priority(
+    job_ids: List[str] = JobIds,
+    priority: int = Body(
+        ..., embed=True, ge=0, le=100, description="New priority, 0-100"
+    ),
+):
+    """
+    Change the priority of jobs.
+
+    Args:
+        job_ids: IDs of the jobs to change (up to 1000)
+        priority: New priority from 0 (lowest) to 100 (highest)
+
+    Returns the outcome for every job, with its priority afterwards.
+    """
+    return await deadline_service.control_jobs("priority", job_ids, priority)
+
+
+@mcp.tool()
+@live_tools_router.get("/get_metric_history", response_model=HistorySeries)
+async def get_metric_history(
+    metric: str = "running", label: str = "", hours: float = 24
+):
+    """
+    Get how a farm metric changed over the last hours.
+
+    Args:
+        metric: "running" (running jobs), "jobs" (all jobs), "status" (jobs in
+            the status given as label) or "user_running" (running jobs of the
+            user given as label)
+        label: Status or username for "status"/"user_running", else empty
+        hours: How far back to look (up to 400 days)
+
+    Returns average/min/max points; the bucket width grows with the window.
+    Use this to describe trends, e.g. "how busy was the farm overnight?".
+    """
+    end = time.time()
+    hours = max(0.1, min(hours, 400 * 24))
+    resolution, points = await asyncio.to_thread(
+        get_history_store().query, metric, label, end - hours * 3600, end
+    )
+    return HistorySeries(
+        metric=metric, label=label, resolution=resolution, points=points
+    )
+
+
+@mcp.tool()
+@live_tools_router.get("/compare_load_to_usual", response_model=LoadComparison)
+async def compare_load_to_usual(
+    metric: str = "running", label: str = "", days: float = 7
+):
+    """
+    Check whether a farm metric is higher than usual right now.
+
+    Args:
+        metric: Metric name, as for get_metric_history (default "running")
+        label: Status or username for "status"/"user_running", else empty
+        days: Days of hourly history to compare against
+
+    Returns the current value, the usual (mean hourly) value, the 10th-90th
+    percentile range and where the current value ranks.
+    Use this to answer "is the farm busier than usual?".
+    """
+    days = max(1 / 24, min(days, 400))
+    return await asyncio.to_thread(get_history_store().compare, metric, label, days)
+
+
+@mcp.tool()
+@live_tools_router.get("/estimate_completion", response_model=List[JobEstimate])
+async def estimate_completion(job_id: str = "", user: str = "", limit: int = 20):
+    """
+    Estimate when rendering jobs will finish.
+
+    Args:
+        job_id: A single job to estimate; leave empty for the active jobs
+        user: Only this user's active jobs (ignored when job_id is given)
+        limit: Maximum number of jobs, soonest to finish first
+
+    Returns each job's progress rate, remaining time and estimated completion
+    time (UTC), and whether the rate was observed across refreshes or is an
+    average since submission.
+    Use this to answer "when will my renders be done?".
+    """
+    from ..analytics import farm_analytics
+
+    jobs = await deadline_service.get_jobs()
+    if job_id and jobs.index_of(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return farm_analytics.estimate_completion(
+        jobs, job_id or None, user or None, max(1, min(limit, 1000))
+    )
+
+
+@mcp.tool()
+@live_tools_router.get("/get_throughput", response_model=ThroughputReport)
+async def get_throughput(hours: float = 24, user: str = ""):
+    """
+    Get render farm throughput and queue wait times.
+
+    Args:
+        hours: Window for counting completed jobs
+        user: Only this user's jobs; leave empty for the whole farm
+
+    Returns completions per hour (per user too), the current rendering speed
+    in jobs per hour, and how long queued jobs have been waiting.
+    Use this to answer "how fast is the farm getting through work?".
+    """
+    from ..analytics import farm_analytics
+
+    jobs = await deadline_service.get_jobs()
+    return farm_analytics.throughput(jobs, max(0.1, min(hours, 24 * 400)), user or None)
+
+
 # Example MCP Resources (read-only data access)
-@mcp.resource("deadline://jobs")
+@mcp.resource(JOBS_RESOURCE_URI)
+@cached
 async def jobs_resource() -> str:
     """
     Resource providing access to all deadline jobs data.
-    
+
     This is a resource (not a tool) - it provides read-only access to data.
     Resources are for data that AI agents can read but not modify.
     """
     jobs = await deadline_service.get_jobs()
-    return f"Total jobs: {len(jobs)}\nJobs: {[job.name for job in jobs]}"
+    return f"Total jobs: {len(jobs)}\nJobs: {jobs.names}"
 
 
 @mcp.resource("deadline://config")
 async def config_resource() -> str:
     """
     Resource providing access to deadline system configuration.
-    
+
     Resources provide static or semi-static data that AI agents can reference.
     """
     return """
@@ -329,19 +687,27 @@ Deadline System Configuration:
 
 # Example MCP Prompts (text generation templates)
 @mcp.prompt()
+@cached
 async def job_report_prompt(job_id: str) -> str:
     """
     Generate a detailed report for a specific job.
-    
+
     This is a prompt (not a tool) - it generates human-readable text.
     Prompts are for generating reports, summaries, or formatted output.
     """
-    jobs = await deadline_service.get_jobs()
-    job = next((j for j in jobs if j.id == job_id), None)
-    
+    job = await deadline_service.get_job(job_id)
+
     if not job:
         return f"Job {job_id} not found."
-    
+
+    if job.status == "Completed":
+        outcome, recommendation = "✅ Job completed successfully.", "No action needed."
+    elif job.status == "Rendering":
+        outcome, recommendation = "⏳ Job is still processing.", "Monitor progress."
+    else:
+        outcome = "❌ Job needs attention."
+        recommendation = "Check logs and restart if necessary."
+
     return f"""
 # Deadline Job Report
 
@@ -351,42 +717,64 @@ async def job_report_prompt(job_id: str) -> str:
 **User**: {job.user}
 
 ## Summary
-This job is currently {job.status.lower()}. 
-{'✅ Job completed successfully.' if job.status == 'Completed' else '⏳ Job is still processing.' if job.status == 'Rendering' else '❌ Job needs attention.'}
+This job is currently {job.status.lower()}.
+{outcome}
 
 ## Recommendations
-{'No action needed.' if job.status == 'Completed' else 'Monitor progress.' if job.status == 'Rendering' else 'Check logs and restart if necessary.'}
+{recommendation}
 """
 
 
 @mcp.prompt()
+@cached
 async def system_status_prompt() -> str:
     """
     Generate a human-readable system status report.
-    
+
     Prompts generate formatted text for human consumption.
+    The issue list is cut to the tool result budget.
     """
-    jobs = await deadline_service.get_jobs()
-    
-    running_jobs = [job for job in jobs if job.status.lower() in ["rendering", "queued", "processing"]]
-    completed_jobs = [job for job in jobs if job.status.lower() == "completed"]
-    failed_jobs = [job for job in jobs if job.status.lower() in ["failed", "error"]]
-    
+    statistics = await deadline_service.get_statistics()
+    await report_progress(1, 3, _status_line(statistics))
+    jobs, running_rows = await deadline_service.select_jobs(
+        status=RUNNING_STATUSES, limit=5
+    )
+    _, failed_rows = await deadline_service.select_jobs(status=FAILED_STATUSES)
+    await report_progress(2, 3, f"{len(failed_rows)} jobs need attention")
+    # Only the rows shown in the report are materialized
+    running_jobs = jobs.rows(running_rows)
+    statuses = jobs.categories["status"]
+    issues = [f"- {jobs.names[row]} - {statuses.value(row)}" for row in failed_rows]
+    shown = fit_to_budget(issues, settings.TOOL_RESULT_MAX_BYTES - PAGE_OVERHEAD_BYTES)
+    if shown < len(issues):
+        issues[shown:] = [
+            f"- ... and {len(issues) - shown} more; page through them with "
+            f'query_jobs(status="{",".join(FAILED_STATUSES)}", offset={shown})'
+        ]
+    await report_progress(3, 3)
+    active = [f"- {job.name} ({job.user})" for job in running_jobs]
+    if not failed_rows:
+        health = "🟢 System running smoothly"
+    elif len(failed_rows) < 3:
+        health = "🟡 Some jobs need attention"
+    else:
+        health = "🔴 Multiple issues detected"
+
     return f"""
 # 🎬 Deadline System Status Report
 
 ## 📊 Overview
-- **Total Jobs**: {len(jobs)}
-- **Running**: {len(running_jobs)} 🟢
-- **Completed**: {len(completed_jobs)} ✅
-- **Failed**: {len(failed_jobs)} ❌
+- **Total Jobs**: {statistics.total}
+- **Running**: {statistics.running} 🟢
+- **Completed**: {statistics.completed} ✅
+- **Failed**: {statistics.failed} ❌
 
 ## 🔄 Active Jobs
-{chr(10).join([f"- {job.name} ({job.user})" for job in running_jobs[:5]]) if running_jobs else "No active jobs"}
+{chr(10).join(active) if active else "No active jobs"}
 
 ## ⚠️ Issues
-{chr(10).join([f"- {job.name} - {job.status}" for job in failed_jobs]) if failed_jobs else "No issues detected"}
+{chr(10).join(issues) if issues else "No issues detected"}
 
 ## 💡 System Health
-{'🟢 System running smoothly' if len(failed_jobs) == 0 else '🟡 Some jobs need attention' if len(failed_jobs) < 3 else '🔴 Multiple issues detected'}
-"""
\ No newline at end of file
+{health}
+"""
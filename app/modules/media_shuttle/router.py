@@ -1,45 +1,77 @@
+from typing import List
 
+from fastapi import Depends, HTTPException
+
+from app.core.http_cache import conditional_get
+from app.core.profiling import TracedAPIRouter
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
 from . import schemas
-from .service import media_shuttle_service, MediaShuttleService
+from .service import MediaShuttleService, media_shuttle_service
 
-router = APIRouter(
-    tags=["Media Shuttle"],
-    prefix="/media_shuttle"
+router = TracedAPIRouter(tags=["Media Shuttle"], prefix="/media_shuttle")
+
+# ETag from the store's write counter for the read routes; the counter is a
+# backend read (and the seed writes on first use), kept off the event loop
+transfers_etag = conditional_get(
+    "transfers", lambda: media_shuttle_service.read_version()
 )
 
+
 @router.post("/transfers", response_model=schemas.Transfer, status_code=201)
-def create_transfer(transfer: schemas.TransferCreate, service: MediaShuttleService = Depends(lambda: media_shuttle_service)):
+def create_transfer(
+    transfer: schemas.TransferCreate,
+    service: MediaShuttleService = Depends(lambda: media_shuttle_service),
+):
     """Create a new transfer job."""
     return service.create_transfer(transfer)
 
-@router.get("/transfers", response_model=List[schemas.Transfer])
-def list_transfers(service: MediaShuttleService = Depends(lambda: media_shuttle_service)):
+
+@router.get(
+    "/transfers", response_model=List[schemas.Transfer], dependencies=[transfers_etag]
+)
+def list_transfers(
+    service: MediaShuttleService = Depends(lambda: media_shuttle_service),
+):
     """List all transfer jobs."""
     return service.get_all_transfers()
 
-@router.get("/transfers/{transfer_id}", response_model=schemas.Transfer)
-def get_transfer(transfer_id: int, service: MediaShuttleService = Depends(lambda: media_shuttle_service)):
+
+@router.get(
+    "/transfers/{transfer_id}",
+    response_model=schemas.Transfer,
+    dependencies=[transfers_etag],
+)
+def get_transfer(
+    transfer_id: int,
+    service: MediaShuttleService = Depends(lambda: media_shuttle_service),
+):
     """Get a specific transfer job by its ID."""
     db_transfer = service.get_transfer_by_id(transfer_id)
     if db_transfer is None:
         raise HTTPException(status_code=404, detail="Transfer not found")
     return db_transfer
 
+
 @router.put("/transfers/{transfer_id}", response_model=schemas.Transfer)
-def update_transfer(transfer_id: int, transfer: schemas.TransferUpdate, service: MediaShuttleService = Depends(lambda: media_shuttle_service)):
+def update_transfer(
+    transfer_id: int,
+    transfer: schemas.TransferUpdate,
+    service: MediaShuttleService = Depends(lambda: media_shuttle_service),
+):
     """Update a transfer job."""
     updated_transfer = service.update_transfer(transfer_id, transfer)
     if updated_transfer is None:
         raise HTTPException(status_code=404, detail="Transfer not found")
     return updated_transfer
 
+
 @router.delete("/transfers/{transfer_id}", response_model=schemas.Transfer)
-def delete_transfer(transfer_id: int, service: MediaShuttleService = Depends(lambda: media_shuttle_service)):
+def delete_transfer(
+    transfer_id: int,
+    service: MediaShuttleService = Depends(lambda: media_shuttle_service),
+):
     """Delete a transfer job."""
     deleted_transfer = service.delete_transfer(transfer_id)
     if deleted_transfer is None:
         raise HTTPException(status_code=404, detail="Transfer not found")
-    return deleted_transfer
\ No newline at end of file
+    return deleted_transfer
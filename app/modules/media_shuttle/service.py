@@ -1,38 +1,116 @@
 # Business logic for Media Shuttle transfers
-from typing import List
+import time
+from typing import List, Optional
+
+from app.core.backends import StateBackend, get_backend, run_blocking
+
 from . import schemas
 
-# In-memory database for demonstration
-fake_db = {
-    1: schemas.Transfer(id=1, source_path="/mnt/source/file1.mov", destination_path="/mnt/dest/file1.mov", status="completed"),
-    2: schemas.Transfer(id=2, source_path="/mnt/source/file2.exr", destination_path="/mnt/dest/file2.exr", status="pending"),
-}
+# Transfers live in the shared state backend so every worker sees the same data
+TRANSFERS_KEY = "media_shuttle:transfers"
+LAST_ID_KEY = "media_shuttle:last_transfer_id"
+SEEDED_KEY = "media_shuttle:seeded"
+# Bumped on every write; the transfer list ETag is derived from it
+VERSION_KEY = "media_shuttle:version"
+
+# Demonstration data written once per backend
+SEED_TRANSFERS = [
+    schemas.Transfer(
+        id=1,
+        source_path="/mnt/source/file1.mov",
+        destination_path="/mnt/dest/file1.mov",
+        status="completed",
+    ),
+    schemas.Transfer(
+        id=2,
+        source_path="/mnt/source/file2.exr",
+        destination_path="/mnt/dest/file2.exr",
+        status="pending",
+    ),
+]
+
 
 class MediaShuttleService:
+    def __init__(self, backend: Optional[StateBackend] = None):
+        self._backend = backend
+        self._seeded = False
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_backend()
+        if not self._seeded:
+            # The flag is set only once the data is written, so a worker that
+            # sees it also sees the seed rows. Workers starting together may
+            # each write them: rows are only added when missing, and the
+            # counters only set when absent, so none goes back
+            if self._backend.get(SEEDED_KEY) is None:
+                for transfer in SEED_TRANSFERS:
+                    if self._backend.hget(TRANSFERS_KEY, str(transfer.id)) is None:
+                        self._backend.hset(
+                            TRANSFERS_KEY, str(transfer.id), transfer.model_dump_json()
+                        )
+                self._backend.set(
+                    LAST_ID_KEY, str(max(t.id for t in SEED_TRANSFERS)), nx=True
+                )
+                # Start from the current time so versions are not reused after a reset
+                self._backend.set(VERSION_KEY, str(int(time.time())), nx=True)
+                self._backend.set(SEEDED_KEY, "1")
+            self._seeded = True
+        return self._backend
+
+    async def read_version(self) -> int:
+        """``get_version`` for async callers, off the loop if the backend may block."""
+        if self._backend is None:
+            self._backend = get_backend()
+        return await run_blocking(self._backend, self.get_version)
+
+    def get_version(self) -> int:
+        return int(self.backend.get(VERSION_KEY) or 0)
+
     def get_all_transfers(self) -> List[schemas.Transfer]:
-        return list(fake_db.values())
+        stored = self.backend.hgetall(TRANSFERS_KEY)
+        transfers = [
+            schemas.Transfer.model_validate_json(value) for value in stored.values()
+        ]
+        return sorted(transfers, key=lambda transfer: transfer.id)
 
     def get_transfer_by_id(self, transfer_id: int) -> schemas.Transfer | None:
-        return fake_db.get(transfer_id)
+        stored = self.backend.hget(TRANSFERS_KEY, str(transfer_id))
+        return (
+            schemas.Transfer.model_validate_json(stored) if stored is not None else None
+        )
 
     def create_transfer(self, transfer: schemas.TransferCreate) -> schemas.Transfer:
-        new_id = max(fake_db.keys()) + 1 if fake_db else 1
+        # The atomic counter keeps ids unique across workers
+        new_id = self.backend.incr(LAST_ID_KEY)
         new_transfer = schemas.Transfer(id=new_id, **transfer.model_dump())
-        fake_db[new_id] = new_transfer
+        self.backend.hset(TRANSFERS_KEY, str(new_id), new_transfer.model_dump_json())
+        self.backend.incr(VERSION_KEY)
         return new_transfer
 
-    def update_transfer(self, transfer_id: int, transfer_update: schemas.TransferUpdate) -> schemas.Transfer | None:
-        if transfer_id not in fake_db:
+    def update_transfer(
+        self, transfer_id: int, transfer_update: schemas.TransferUpdate
+    ) -> schemas.Transfer | None:
+        stored_transfer = self.get_transfer_by_id(transfer_id)
+        if stored_transfer is None:
             return None
-        stored_transfer = fake_db[transfer_id]
         update_data = transfer_update.model_dump(exclude_unset=True)
         updated_transfer = stored_transfer.model_copy(update=update_data)
-        fake_db[transfer_id] = updated_transfer
+        self.backend.hset(
+            TRANSFERS_KEY, str(transfer_id), updated_transfer.model_dump_json()
+        )
+        self.backend.incr(VERSION_KEY)
         return updated_transfer
 
     def delete_transfer(self, transfer_id: int) -> schemas.Transfer | None:
-        if transfer_id not in fake_db:
+        stored_transfer = self.get_transfer_by_id(transfer_id)
+        if stored_transfer is None or not self.backend.hdel(
+            TRANSFERS_KEY, str(transfer_id)
+        ):
             return None
-        return fake_db.pop(transfer_id)
+        self.backend.incr(VERSION_KEY)
+        return stored_transfer
+
 
 media_shuttle_service = MediaShuttleService()
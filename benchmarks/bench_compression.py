@@ -0,0 +1,116 @@
+"""
+Compression benchmark: bytes on the wire and CPU per request.
+
+Drives large job-list responses in-process (mock Deadline with N jobs) through
+``CompressionMiddleware`` for every available encoding, with and without the
+per-version compressed body cache, and reports the average response size on
+the wire and the process CPU time per request (server and client together, so
+compare rows rather than absolute values).
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_compression.py --jobs 10000 --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Optional
+
+# The benchmark wraps the app itself, once per configuration
+os.environ["COMPRESSION_ENABLED"] = "false"
+
+import httpx
+
+from app.core.compression import CompressionMiddleware, available_encoders
+from app.core.config import settings
+from app.modules.deadline.mock_server import create_mock_app
+from app.modules.deadline.service import deadline_service
+from main import app
+
+PATHS = [
+    "/api/v1/deadline/rest/jobs?limit=1000",
+    "/api/v1/deadline/tools/get_all_jobs",
+]
+
+
+async def measure(asgi_app, encoding: str, path: str, requests: int) -> dict:
+    transport = httpx.ASGITransport(app=asgi_app)
+    headers = {"accept-encoding": encoding}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.get(path, headers=headers)  # warm the snapshot
+        wire = 0
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path, headers=headers)
+            wire += response.num_bytes_downloaded
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+    return {
+        "bytes": round(wire / requests),
+        "cpu_ms": round(cpu / requests * 1000, 3),
+        "wall_ms": round(wall / requests * 1000, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    rows = []
+    for path in PATHS:
+        rows.append(
+            {
+                "path": path,
+                "encoding": "identity",
+                "cache": "-",
+                **await measure(app, "identity", path, args.requests),
+            }
+        )
+        for name, encoder in available_encoders().items():
+            for cache_size in (0, 256):
+                wrapped = CompressionMiddleware(
+                    app,
+                    min_size=settings.COMPRESSION_MIN_SIZE,
+                    cache_size=cache_size,
+                    encoders={name: encoder},
+                )
+                result = await measure(wrapped, name, path, args.requests)
+                rows.append(
+                    {
+                        "path": path,
+                        "encoding": name,
+                        "cache": "on" if cache_size else "off",
+                        **result,
+                    }
+                )
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="CGCG API compression benchmark")
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    settings.DEADLINE_USE_MOCK_DATA = False
+    settings.DEADLINE_CACHE_TTL = 3600
+    deadline_service.configure(
+        transport=httpx.ASGITransport(create_mock_app(args.jobs))
+    )
+    rows = asyncio.run(run(args))
+
+    print(
+        f"{'path':40} {'encoding':9} {'cache':6} "
+        f"{'bytes':>10} {'cpu_ms':>9} {'wall_ms':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['path']:40} {row['encoding']:9} {row['cache']:6} {row['bytes']:>10}"
+            f" {row['cpu_ms']:>9} {row['wall_ms']:>9}"
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    main()
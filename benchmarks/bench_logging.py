@@ -0,0 +1,139 @@
+"""
+Microbenchmark for the per-request cost of request IDs and access logging.
+
+Drives a trivial ASGI app directly (no network, no HTTP parsing), like
+bench_metrics.py, and reports the time per request for:
+
+* the bare app;
+* ``RequestLogMiddleware`` with INFO disabled (request IDs only);
+* the middleware logging JSON lines with a plain synchronous
+  ``StreamHandler``, which writes on the event loop;
+* the same lines through the ``configure_logging`` queue;
+* the queue with the route sampled at 10%.
+
+The output is a sink whose ``write`` sleeps ``--write-delay`` microseconds, as
+a stdout pipe does when the log collector falls behind.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_logging.py --iterations 20000 --write-delay 20
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core.logs import (
+    LOG_RECORDS_DROPPED,
+    JsonFormatter,
+    RequestLogMiddleware,
+    configure_logging,
+    set_sample_rates,
+    stop_logging,
+)
+
+
+class SlowSink:
+    """A text stream that takes ``delay`` seconds per write."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+async def _plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _scope() -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/bench",
+        "root_path": "",
+        "headers": [],
+    }
+
+
+async def _drive(app, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(_scope(), _receive, _send)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _run(mode: str, iterations: int, sink: SlowSink) -> float:
+    root = logging.getLogger()
+    handler: Optional[logging.Handler] = None
+    if mode == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    elif mode in ("queue", "sampled"):
+        configure_logging("INFO", stream=sink)
+        set_sample_rates({"/bench": 0.1} if mode == "sampled" else {})
+    else:
+        root.setLevel(logging.WARNING)
+    app = _plain_app if mode == "bare" else RequestLogMiddleware(_plain_app)
+    try:
+        return asyncio.run(_drive(app, iterations))
+    finally:
+        if handler is not None:
+            root.removeHandler(handler)
+        stop_logging()
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Request logging overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument(
+        "--write-delay", type=float, default=20.0, help="microseconds per write"
+    )
+    args = parser.parse_args(argv)
+
+    report = {"iterations": args.iterations, "write_delay_us": args.write_delay}
+    print(
+        f"{'mode':10} {'us/request':>11} {'overhead':>9} {'written':>8} {'dropped':>8}"
+    )
+    baseline = None
+    for mode in ("bare", "ids-only", "sync", "queue", "sampled"):
+        sink = SlowSink(args.write_delay / 1e6)
+        dropped = LOG_RECORDS_DROPPED.labels().value
+        per_request = _run(mode, args.iterations, sink)
+        dropped = int(LOG_RECORDS_DROPPED.labels().value - dropped)
+        baseline = per_request if baseline is None else baseline
+        report[mode] = {
+            "us_per_request": round(per_request, 2),
+            "overhead_us": round(per_request - baseline, 2),
+            "written": sink.lines,
+            "dropped": dropped,
+        }
+        print(
+            f"{mode:10} {per_request:>11.2f} {per_request - baseline:>9.2f} "
+            f"{sink.lines:>8} {dropped:>8}"
+        )
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Single-job lookup benchmark: one lookup per call vs the batched loader.
+
+Loads N synthetic jobs (100k by default) into a ``DeadlineService`` and fires
+bursts of concurrent ``get_job`` calls, a share of them for the same IDs as a
+dashboard would. Reports p50/p99 latency per lookup (from the start of its
+burst) and the burst time for ``JobSnapshot.get`` per call, a lookup in the
+snapshot's ID index, and for ``get_job``, which coalesces each burst into
+deduplicated batches (waiting ``DEADLINE_LOOKUP_BATCH_WINDOW`` first).
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_lookups.py --jobs 100000 --burst 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.service import DeadlineService, DeadlineSnapshot
+from app.modules.deadline.snapshot import JobSnapshot
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank] * 1000
+
+
+async def run_bursts(
+    lookup: Callable[[str], Awaitable],
+    ids: list[str],
+    bursts: int,
+    size: int,
+    seed: int,
+):
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    burst_times: list[float] = []
+
+    async def timed(job_id: str, start: float) -> None:
+        # Timed from the start of the burst: every lookup arrives at once
+        assert await lookup(job_id) is not None
+        latencies.append(time.perf_counter() - start)
+
+    for _ in range(bursts):
+        # Half of every burst repeats IDs already in it
+        wanted = rng.sample(ids, max(1, size // 2))
+        wanted += rng.choices(wanted, k=size - len(wanted))
+        start = time.perf_counter()
+        await asyncio.gather(*(timed(job_id, start) for job_id in wanted))
+        burst_times.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "burst_ms": round(sum(burst_times) / len(burst_times) * 1000, 3),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Single-job lookup benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--burst", type=int, default=200)
+    parser.add_argument("--bursts", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    settings.DEADLINE_CACHE_TTL = 3600
+    jobs = JobSnapshot.from_records(generate_jobs(args.jobs))
+    service = DeadlineService()
+    service._snapshot = DeadlineSnapshot(
+        version=1, jobs=jobs, fingerprint="bench", fetched_at=time.monotonic()
+    )
+    # Built once per snapshot; not part of any lookup's latency
+    jobs.row_index
+
+    async def direct(job_id: str):
+        return (await service.get_jobs()).get(job_id)
+
+    report = {"jobs": args.jobs, "burst": args.burst}
+    print(f"{'lookup':10} {'p50_ms':>9} {'p99_ms':>9} {'burst_ms':>9}")
+    for name, lookup in (("direct", direct), ("batched", service.get_job)):
+        result = asyncio.run(
+            run_bursts(lookup, jobs.ids, args.bursts, args.burst, seed=1)
+        )
+        report[name] = result
+        print(
+            f"{name:10} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+            f"{result['burst_ms']:>9.3f}"
+        )
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Name search benchmark: linear substring scan vs the trigram index.
+
+Builds N synthetic job names (100k by default), reports the index build time,
+then for a set of typical artist queries the number of matches and the time
+per lookup (best of --repeat) for a scan over every name and for
+``NameIndex.search`` with ranking and a limit of 20.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_search.py --jobs 100000
+"""
+
+import argparse
+import time
+from typing import Callable, Optional
+
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.search import NameIndex, normalize
+
+QUERIES = [
+    "Scene_02",
+    "comp_v014",
+    "Shot_017",
+    "Scene_12_Shot_101",
+    "shot_017 comp",
+    "lookdev_v029",
+]
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Job name search benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    names = [job["name"] for job in generate_jobs(args.jobs)]
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # The scan gets pre-normalized names so only the matching is timed
+    normalized = [normalize(name) for name in names]
+
+    def scan(query: str) -> list[int]:
+        rows = range(len(normalized))
+        for term in query.split():
+            term = normalize(term)
+            rows = [row for row in rows if term in normalized[row]]
+        return rows
+
+    report = {"jobs": args.jobs, "build_ms": round(build_ms, 1), "queries": {}}
+    print(f"index build: {build_ms:.1f} ms for {args.jobs} names")
+    print(f"{'query':20} {'matches':>8} {'scan_ms':>9} {'index_ms':>9}")
+    for query in QUERIES:
+        expected = scan(query)
+        hits, total = index.search(query, args.limit)
+        assert total == len(expected), query
+        scan_ms = best_of(max(1, args.repeat // 10), lambda: scan(query)) * 1000
+        index_ms = best_of(args.repeat, lambda: index.search(query, args.limit)) * 1000
+        report["queries"][query] = {
+            "matches": total,
+            "scan_ms": round(scan_ms, 2),
+            "index_ms": round(index_ms, 3),
+        }
+        print(f"{query:20} {total:>8} {scan_ms:>9.2f} {index_ms:>9.3f}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Memory and filter-speed benchmark: list of DeadlineJob models vs JobSnapshot.
+
+Builds both representations from the same N synthetic jobs and reports bytes
+per job (traced allocations that stay alive), build time (inflated by
+tracemalloc, so compare the two columns), the time to filter
+by status + user and count by status, and the time to materialize a page of
+100 rows.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_snapshot.py --jobs 100000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.schemas import DeadlineJob
+from app.modules.deadline.snapshot import JobSnapshot
+
+
+def measure_build(build: Callable[[], object]) -> tuple[object, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Job snapshot memory benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # Fresh copies per build so neither side shares the other's strings
+    records = generate_jobs(args.jobs)
+    payload = json.dumps(records)
+    del records
+
+    models, models_bytes, models_build = measure_build(
+        lambda: [DeadlineJob(**record) for record in json.loads(payload)]
+    )
+    snapshot, snapshot_bytes, snapshot_build = measure_build(
+        lambda: JobSnapshot.from_records(json.loads(payload))
+    )
+
+    def filter_models():
+        rows = [
+            job
+            for job in models
+            if job.status.lower() == "rendering" and job.user.lower() == "artist_007"
+        ]
+        counts: dict[str, int] = {}
+        for job in models:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return rows, counts
+
+    def filter_snapshot():
+        rows = snapshot.rows(snapshot.where(status="rendering", user="artist_007"))
+        return rows, snapshot.count_by("status")
+
+    assert filter_models() == filter_snapshot()
+    report = {
+        "jobs": args.jobs,
+        "bytes_per_job": {
+            "models": round(models_bytes / args.jobs),
+            "snapshot": round(snapshot_bytes / args.jobs),
+        },
+        "build_ms": {
+            "models": round(models_build * 1000, 1),
+            "snapshot": round(snapshot_build * 1000, 1),
+        },
+        "filter_ms": {
+            "models": round(best_of(args.repeat, filter_models) * 1000, 2),
+            "snapshot": round(best_of(args.repeat, filter_snapshot) * 1000, 2),
+        },
+        "page_of_100_ms": {
+            "models": round(best_of(args.repeat, lambda: models[:100]) * 1000, 3),
+            "snapshot": round(best_of(args.repeat, lambda: snapshot[:100]) * 1000, 3),
+        },
+    }
+    print(f"{'metric':16} {'models':>12} {'snapshot':>12}")
+    for metric, row in report.items():
+        if isinstance(row, dict):
+            print(f"{metric:16} {row['models']:>12} {row['snapshot']:>12}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Cold-start benchmark: import time and time-to-first-response.
+
+For each startup mode (``LAZY_STARTUP`` on and off) this starts a fresh
+``uvicorn main:app`` process and measures:
+
+* ``import_s``: wall time of ``import main`` in a fresh interpreter;
+* ``first_response_s``: process spawn until ``GET /`` first returns 200;
+* ``first_mcp_s``: process spawn until an MCP ``initialize`` succeeds.
+
+The median over ``--runs`` is reported. With ``--budget`` the command exits
+non-zero when the lazy-mode import time exceeds the budget, so it can be used
+as an import-time check in CI.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --budget 0.8
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_INITIALIZE = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "cgcg-startup-bench", "version": "1.0"},
+        },
+    }
+).encode()
+
+
+def _env(lazy: bool) -> dict[str, str]:
+    return {**os.environ, "LAZY_STARTUP": str(lazy).lower(), "PYTHONPATH": ROOT}
+
+
+def measure_import(lazy: bool) -> float:
+    """Wall time of ``import main`` in a fresh interpreter."""
+    code = (
+        "import time; t = time.perf_counter(); import main; "
+        "print(time.perf_counter() - t)"
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", code], cwd=ROOT, env=_env(lazy)
+    )
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _poll(
+    request: urllib.request.Request, start: float, timeout: float
+) -> Optional[float]:
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(request, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.005)
+    return None
+
+
+def measure_server(lazy: bool, timeout: float = 30.0) -> dict[str, Optional[float]]:
+    """Spawn uvicorn and time the first HTTP and first MCP response."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=_env(lazy),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        first_response = _poll(urllib.request.Request(f"{base}/"), start, timeout)
+        mcp = urllib.request.Request(
+            f"{base}/mcp/mcp",
+            data=MCP_INITIALIZE,
+            headers={
+                "content-type": "application/json",
+                "accept": "application/json, text/event-stream",
+            },
+        )
+        first_mcp = _poll(mcp, start, timeout)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"first_response_s": first_response, "first_mcp_s": first_mcp}
+
+
+def _median(values: list[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def main(argv: Optional[list[str]] = None) -> dict[str, dict]:
+    parser = argparse.ArgumentParser(description="CGCG API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, help="max lazy-mode import time (s)")
+    parser.add_argument(
+        "--import-only", action="store_true", help="skip the uvicorn runs"
+    )
+    args = parser.parse_args(argv)
+
+    report: dict[str, dict] = {}
+    for mode, lazy in (("eager", False), ("lazy", True)):
+        rows = []
+        for _ in range(args.runs):
+            row: dict[str, Optional[float]] = {"import_s": measure_import(lazy)}
+            if not args.import_only:
+                row.update(measure_server(lazy))
+            rows.append(row)
+        report[mode] = {key: _median([row[key] for row in rows]) for key in rows[0]}
+
+    print(f"{'mode':8} " + " ".join(f"{key:>18}" for key in report["lazy"]))
+    for mode, row in report.items():
+        print(f"{mode:8} " + " ".join(f"{str(value):>18}" for value in row.values()))
+
+    if args.budget is not None and report["lazy"]["import_s"] > args.budget:
+        print(
+            f"import time {report['lazy']['import_s']}s exceeds budget {args.budget}s"
+        )
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
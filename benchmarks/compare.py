@@ -0,0 +1,71 @@
+"""
+Compare two benchmark result files written by ``run_load.py``.
+
+Prints the change in p50/p95/p99 latency and throughput per scenario and exits
+with status 1 when any scenario regressed by more than ``--threshold`` percent
+(p95 latency up or throughput down).
+
+Usage:
+    cd benchmarks/results
+    python ../compare.py <base>.json <head>.json
+"""
+
+import argparse
+import json
+import sys
+
+
+def _change(base, head) -> float | None:
+    if not base or head is None:
+        return None
+    return (head - base) / base * 100
+
+
+def _fmt(change) -> str:
+    return "n/a" if change is None else f"{change:+.1f}%"
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    """Return the scenarios that regressed beyond ``threshold`` percent."""
+    regressions = []
+    print(f"base {base['commit']}  ->  head {head['commit']}")
+    print(f"{'scenario':32} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>9}")
+    for name, head_row in head["results"].items():
+        base_row = base["results"].get(name)
+        if base_row is None:
+            print(f"{name:32} (new)")
+            continue
+        changes = {
+            key: _change(base_row[key], head_row[key])
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+        }
+        print(
+            f"{name:32} {_fmt(changes['p50_ms']):>9} {_fmt(changes['p95_ms']):>9}"
+            f" {_fmt(changes['p99_ms']):>9} {_fmt(changes['throughput_rps']):>9}"
+        )
+        p95, rps = changes["p95_ms"], changes["throughput_rps"]
+        if (p95 is not None and p95 > threshold) or (
+            rps is not None and rps < -threshold
+        ):
+            regressions.append(name)
+    print(f"RSS peak: {base['rss_mb']['peak']} -> {head['rss_mb']['peak']} MiB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+    with open(args.base) as base_file, open(args.head) as head_file:
+        regressions = compare(
+            json.load(base_file), json.load(head_file), args.threshold
+        )
+    if regressions:
+        print(f"Regressed beyond {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
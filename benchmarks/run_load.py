@@ -0,0 +1,329 @@
+"""
+Load-test and benchmark suite for the REST, tools, Media Shuttle and MCP endpoints.
+
+By default everything runs offline and in-process: the API is driven through
+``httpx.ASGITransport`` and the Deadline service is pointed at the mock
+Deadline web service (``app.modules.deadline.mock_server``) holding N synthetic
+jobs. Pass ``--base-url`` to drive an already running deployment instead.
+
+Each scenario is run with a fixed number of requests at the requested
+concurrency; p50/p95/p99 latency, throughput and process RSS are reported and
+written as JSON (default ``benchmarks/results/<commit>.json``) so runs can be
+compared with ``benchmarks/compare.py``.
+
+Usage:
+    PYTHONPATH=. python benchmarks/run_load.py --jobs 10000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+MCP_PATH = "/mcp/mcp"
+MCP_HEADERS = {"accept": "application/json, text/event-stream"}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    json: Optional[dict] = None
+    mcp: bool = False
+
+
+def default_scenarios(job_id: str) -> list[Scenario]:
+    rest = "/api/v1/deadline/rest"
+    tools = "/api/v1/deadline/tools"
+    return [
+        Scenario("rest.jobs", "GET", f"{rest}/jobs?limit=100"),
+        Scenario(
+            "rest.jobs_filtered", "GET", f"{rest}/jobs?status=Rendering&limit=100"
+        ),
+        Scenario("rest.job", "GET", f"{rest}/jobs/{job_id}"),
+        Scenario("rest.users", "GET", f"{rest}/users"),
+        Scenario("rest.status", "GET", f"{rest}/status"),
+        Scenario("tools.get_all_jobs", "GET", f"{tools}/get_all_jobs"),
+        Scenario("tools.get_workload_summary", "GET", f"{tools}/get_workload_summary"),
+        Scenario("tools.count_jobs_by_status", "GET", f"{tools}/count_jobs_by_status"),
+        Scenario("tools.is_system_busy", "GET", f"{tools}/is_system_busy"),
+        Scenario("tools.check_job_status", "GET", f"{tools}/check_job_status/{job_id}"),
+        Scenario("media_shuttle.transfers", "GET", "/api/v1/media_shuttle/transfers"),
+        Scenario(
+            "mcp.get_workload_summary",
+            "POST",
+            MCP_PATH,
+            json={"name": "get_workload_summary", "arguments": {}},
+            mcp=True,
+        ),
+        Scenario(
+            "mcp.check_job_status",
+            "POST",
+            MCP_PATH,
+            json={"name": "check_job_status", "arguments": {"job_id": job_id}},
+            mcp=True,
+        ),
+    ]
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    bytes_received: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "mean_ms": round(sum(ordered) / count * 1000, 3) if count else None,
+            "throughput_rps": round(count / self.elapsed, 1) if self.elapsed else None,
+            "avg_bytes": round(self.bytes_received / count) if count else None,
+        }
+
+
+def _percentile(ordered: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted latencies, in milliseconds."""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[rank] * 1000, 3)
+
+
+def rss_mb() -> dict[str, float]:
+    """Current and peak resident set size of this process in MiB."""
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # ru_maxrss is bytes on macOS
+        peak_kb /= 1024
+    current = None
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        current = round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError):
+        pass
+    return {"current": current, "peak": round(peak_kb / 1024, 1)}
+
+
+async def open_mcp_session(client: httpx.AsyncClient) -> dict[str, str]:
+    """Initializes an MCP streamable-HTTP session and returns its headers."""
+    response = await client.post(
+        MCP_PATH,
+        headers=MCP_HEADERS,
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-03-26",
+                "capabilities": {},
+                "clientInfo": {"name": "cgcg-bench", "version": "1.0"},
+            },
+        },
+    )
+    response.raise_for_status()
+    headers = dict(MCP_HEADERS)
+    session_id = response.headers.get("mcp-session-id")
+    if session_id:
+        headers["mcp-session-id"] = session_id
+    await client.post(
+        MCP_PATH,
+        headers=headers,
+        json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+    )
+    return headers
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+) -> ScenarioResult:
+    result = ScenarioResult()
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        headers = await open_mcp_session(client) if scenario.mcp else None
+        for request_id in remaining:
+            body = scenario.json
+            if scenario.mcp:
+                body = {
+                    "jsonrpc": "2.0",
+                    "id": request_id + 1,
+                    "method": "tools/call",
+                    "params": scenario.json,
+                }
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    scenario.method, scenario.path, json=body, headers=headers
+                )
+                ok = response.status_code < 400 and (
+                    not scenario.mcp or '"isError":true' not in response.text
+                )
+                result.bytes_received += len(response.content)
+            except httpx.HTTPError:
+                ok = False
+            result.latencies.append(time.perf_counter() - start)
+            if not ok:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    from app.modules.deadline.mock_server import generate_jobs
+
+    job_id = generate_jobs(1, args.seed)[0]["id"]
+    scenarios = [
+        s
+        for s in default_scenarios(job_id)
+        if not args.scenario or any(s.name.startswith(p) for p in args.scenario)
+    ]
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    results: dict[str, Any] = {}
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits) as client:
+            for scenario in scenarios:
+                await run_scenario(client, scenario, args.warmup, args.concurrency)
+                outcome = await run_scenario(
+                    client, scenario, args.requests, args.concurrency
+                )
+                results[scenario.name] = outcome.summary()
+        return results
+
+    from app.core.config import settings
+    from app.modules.deadline.mock_server import create_mock_app
+    from app.modules.deadline.service import deadline_service
+    from main import app
+
+    use_mock_data = settings.DEADLINE_USE_MOCK_DATA
+    settings.DEADLINE_USE_MOCK_DATA = False
+    deadline_service.configure(
+        transport=httpx.ASGITransport(
+            create_mock_app(args.jobs, args.seed, args.latency)
+        )
+    )
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport,
+                base_url="http://localhost",
+                limits=limits,
+                timeout=60,
+            ) as client:
+                for scenario in scenarios:
+                    await run_scenario(client, scenario, args.warmup, args.concurrency)
+                    outcome = await run_scenario(
+                        client, scenario, args.requests, args.concurrency
+                    )
+                    results[scenario.name] = outcome.summary()
+    finally:
+        settings.DEADLINE_USE_MOCK_DATA = use_mock_data
+        deadline_service.configure()
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CGCG API load benchmark")
+    parser.add_argument(
+        "--jobs", type=int, default=10_000, help="synthetic jobs in the mock Deadline"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mock upstream latency (s)"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="requests per scenario"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="warm-up requests per scenario"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--scenario", action="append", help="only run scenarios with this prefix"
+    )
+    parser.add_argument(
+        "--base-url", help="drive a running server instead of in-process"
+    )
+    parser.add_argument(
+        "--output", help="JSON output path (default results/<commit>.json)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    # FastMCP installs an INFO-level handler; per-request log lines would
+    # dominate the measurements.
+    for name in ("httpx", "mcp"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    commit = git_commit()
+    results = asyncio.run(run(args))
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "jobs": args.jobs,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "target": args.base_url or "in-process",
+        },
+        "rss_mb": rss_mb(),
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    print(f"{'scenario':32} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>9} {'err':>5}")
+    for name, row in results.items():
+        print(
+            f"{name:32} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+            f" {row['throughput_rps']:>9} {row['errors']:>5}"
+        )
+    print(f"RSS: {report['rss_mb']} MiB -> {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
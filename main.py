@@ -1,16 +1,114 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
 from app.api.v1.api_router import api_router as api_v1_router
-from app.modules.deadline.tools.ai_tools import mcp
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.logs import RequestLogMiddleware, configure_logging, stop_logging
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_latest
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.modules.deadline.history import HistorySampler, get_history_store
+from app.modules.deadline.persistence import SnapshotPersister
+from app.modules.deadline.service import RUNNING_STATUSES, deadline_service
+from app.modules.deadline.sync import SyncScheduler
+from app.modules.deadline.tools.ai_tools import jobs_subscribers, mcp, open_sessions
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging(
+        settings.LOG_LEVEL,
+        settings.LOG_JSON,
+        settings.LOG_QUEUE_SIZE,
+        settings.LOG_SAMPLE_RATES,
+    )
+    persister = None
+    if settings.DEADLINE_SNAPSHOT_PATH:
+        # Serve the jobs saved before the last shutdown while Deadline is asked
+        persister = SnapshotPersister(
+            deadline_service,
+            settings.DEADLINE_SNAPSHOT_PATH,
+            settings.DEADLINE_SNAPSHOT_SAVE_INTERVAL,
+        )
+        if persister.load():
+            deadline_service.reconcile()
+        persister.start()
+    sampler = None
+    if settings.HISTORY_SAMPLE_INTERVAL > 0:
+        sampler = HistorySampler(
+            deadline_service,
+            get_history_store(),
+            settings.HISTORY_SAMPLE_INTERVAL,
+            RUNNING_STATUSES,
+        )
+        sampler.start()
+    scheduler = None
+    if settings.DEADLINE_SYNC_ENABLED:
+        scheduler = SyncScheduler(
+            deadline_service,
+            settings.DEADLINE_SYNC_MIN_INTERVAL,
+            settings.DEADLINE_SYNC_MAX_INTERVAL,
+            settings.DEADLINE_SYNC_IDLE_TIMEOUT,
+            clients=open_sessions,
+            subscribers=jobs_subscribers,
+        )
+        scheduler.start()
+    # Mounted apps do not get lifespan events, so the MCP session manager is
+    # started here on behalf of the /mcp mount.
+    async with mcp.run_http():
+        yield
+    if scheduler is not None:
+        await scheduler.stop()
+    if sampler is not None:
+        await sampler.stop()
+    if persister is not None:
+        await persister.stop()
+    await deadline_service.aclose()
+    stop_logging()
+
 
 # Create FastAPI app instance
 app = FastAPI(
     title="CGCG API",
     description="A comprehensive API for CGCG services",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Compress large JSON/markdown/SSE bodies; versioned bodies are compressed once
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        min_size=settings.COMPRESSION_MIN_SIZE,
+        cache_size=settings.COMPRESSION_CACHE_SIZE,
+    )
+
+# Per-client request limit, counted in the shared state backend
+if settings.RATE_LIMIT_PER_MINUTE:
+    app.add_middleware(RateLimitMiddleware, limit=settings.RATE_LIMIT_PER_MINUTE)
+
+# Record per-route latency and in-flight requests for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in per-request profiling; not installed at all when disabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        sample_every=settings.PROFILING_SAMPLE_EVERY,
+        mode=settings.PROFILING_MODE,
+        interval=settings.PROFILING_SAMPLE_INTERVAL,
+    )
+
+# Request IDs and sampled access lines; outermost, so every layer sees the ID
+app.add_middleware(RequestLogMiddleware)
+
 # Mount the MCP server from deadline tools
-app.mount("/mcp", mcp.streamable_http_app())
+app.mount("/mcp", mcp.http_app())
 
 # Include the versioned API router
 # All application routes are now managed in api_router.py
@@ -25,7 +123,16 @@ async def root():
     return {"message": "Welcome to CGCG API. All endpoints are available under /api/v1"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    return PlainTextResponse(render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # The following is for running the app with uvicorn when this file is executed directly
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port="8000")
\ No newline at end of file
+
+    uvicorn.run(app, host="0.0.0.0", port="8000")
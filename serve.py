@@ -0,0 +1,50 @@
+"""
+Production entry point: runs the API with one uvicorn worker per CPU core.
+
+    python serve.py            # WEB_CONCURRENCY=0 -> os.cpu_count() workers
+    WEB_CONCURRENCY=1 python serve.py
+
+Workers are separate processes, so shared state must use a cross-process
+``STATE_BACKEND_URL`` (sqlite:/// or redis://), and MCP needs
+``MCP_STATELESS_HTTP`` because a session created on one worker is unknown to
+the others.
+"""
+
+import logging
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    return settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+
+def main() -> None:
+    workers = worker_count()
+    if workers > 1:
+        if settings.STATE_BACKEND_URL.startswith("memory://"):
+            logger.warning(
+                "memory:// state is per worker; "
+                "use a sqlite:/// or redis:// STATE_BACKEND_URL"
+            )
+        if not settings.MCP_STATELESS_HTTP:
+            logger.warning("MCP sessions are per worker; set MCP_STATELESS_HTTP=true")
+    uvicorn.run(
+        "main:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=workers,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        # Requests are logged (and sampled) by RequestLogMiddleware
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
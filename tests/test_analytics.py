@@ -0,0 +1,164 @@
+"""
+Tests for the render farm analytics.
+"""
+
+import asyncio
+import math
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.modules.deadline.analytics import FarmAnalytics
+from app.modules.deadline.mock_server import create_mock_app
+from app.modules.deadline.service import DeadlineService, deadline_service
+from app.modules.deadline.snapshot import JobSnapshot
+from main import app
+
+client = TestClient(app)
+
+NOW = 1_760_000_000.0
+
+
+def _iso(epoch: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def _snapshot(progress_a: float, status_b: str = "Queued") -> JobSnapshot:
+    return JobSnapshot.from_records(
+        [
+            {
+                "id": "a",
+                "name": "A",
+                "status": "Rendering",
+                "user": "ann",
+                "progress": progress_a,
+                "created_at": _iso(NOW - 7200),
+                "updated_at": _iso(NOW - 3600),
+            },
+            {
+                "id": "b",
+                "name": "B",
+                "status": status_b,
+                "user": "bob",
+                "progress": 0.0,
+                "created_at": _iso(NOW - 600),
+                "updated_at": _iso(NOW - 600),
+            },
+            {
+                "id": "c",
+                "name": "C",
+                "status": "Completed",
+                "user": "ann",
+                "progress": 100.0,
+                "created_at": _iso(NOW - 9000),
+                "updated_at": _iso(NOW - 1800),
+            },
+            {
+                "id": "d",
+                "name": "D",
+                "status": "Completed",
+                "user": "bob",
+                "progress": 100.0,
+                "created_at": _iso(NOW - 99000),
+                "updated_at": _iso(NOW - 90000),
+            },
+        ]
+    )
+
+
+def test_rates_fall_back_then_track_observed_progress():
+    """Average-since-submission rates are replaced by rates seen across snapshots."""
+    analytics = FarmAnalytics()
+    first = _snapshot(20.0)
+    analytics.observe(first, NOW)
+    rate, observed = analytics.rates(first)
+    assert not observed[0] and math.isclose(rate[0], 20.0 / 3600)
+
+    second = _snapshot(30.0, status_b="Rendering")
+    analytics.observe(second, NOW + 100)
+    rate, observed = analytics.rates(second)
+    assert observed[0] and math.isclose(rate[0], 0.1)
+
+    [estimate] = analytics.estimate_completion(second, job_id="a", now=NOW + 100)
+    assert estimate["basis"] == "observed"
+    assert math.isclose(estimate["remaining_seconds"], 700)
+    assert estimate["estimated_completion"] == _iso(NOW + 800)
+    assert math.isclose(estimate["rate_per_hour"], 360)
+
+    [done] = analytics.estimate_completion(second, job_id="c", now=NOW + 100)
+    assert done["basis"] == "completed" and done["estimated_completion"] == _iso(
+        NOW - 1800
+    )
+    assert analytics.estimate_completion(second, job_id="missing") == []
+
+
+def test_throughput_and_queue_waits():
+    """Completions in the window, rendering speed and waits of started jobs."""
+    analytics = FarmAnalytics()
+    analytics.observe(_snapshot(20.0), NOW)
+    later = _snapshot(30.0, status_b="Rendering")
+    analytics.observe(later, NOW + 100)
+
+    report = analytics.throughput(later, hours=24, now=NOW + 100)
+    assert report["completed"] == 1 and report["completed_by_user"] == {"ann": 1}
+    assert report["active_jobs"] == 2 and report["active_jobs_with_rate"] == 1
+    assert math.isclose(report["progress_jobs_per_hour"], 0.1 * 3600 / 100)
+    assert report["recent_wait_seconds"]["count"] == 1
+    assert math.isclose(report["recent_wait_seconds"]["max"], 700)
+
+    assert (
+        analytics.throughput(later, hours=48, user="BOB", now=NOW + 100)["completed"]
+        == 1
+    )
+    queued = analytics.throughput(_snapshot(20.0), now=NOW)
+    assert queued["queued_jobs"] == 1 and math.isclose(
+        queued["queued_age_seconds"]["max"], 600
+    )
+
+
+def test_service_notifies_analytics_only_for_new_content(monkeypatch):
+    """Snapshot listeners run when upstream content changes, not on every refresh."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    upstream = create_mock_app(job_count=20)
+    service = DeadlineService(transport=httpx.ASGITransport(upstream))
+    seen = []
+    service.add_snapshot_listener(lambda jobs, observed_at: seen.append(jobs))
+
+    asyncio.run(service.get_jobs())
+    asyncio.run(service.get_jobs())
+    assert len(seen) == 1
+    upstream.state.body = upstream.state.body.replace(b'"Queued"', b'"Rendering"')
+    asyncio.run(service.get_jobs())
+    assert len(seen) == 2
+
+
+def test_analytics_endpoints(monkeypatch):
+    """REST and tool routes return estimates and throughput without an ETag."""
+    snapshot = _snapshot(50.0)
+
+    async def get_jobs():
+        return snapshot
+
+    monkeypatch.setattr(deadline_service, "get_jobs", get_jobs)
+    response = client.get("/api/v1/deadline/rest/analytics/eta")
+    assert response.status_code == 200 and "etag" not in response.headers
+    assert [job["job_id"] for job in response.json()] == ["a"]
+    assert client.get("/api/v1/deadline/rest/analytics/eta/zzz").status_code == 404
+    assert (
+        client.get("/api/v1/deadline/rest/analytics/throughput").json()["queued_jobs"]
+        == 1
+    )
+
+    tool = client.get(
+        "/api/v1/deadline/tools/estimate_completion", params={"job_id": "a"}
+    ).json()
+    assert tool[0]["basis"] in ("average", "observed")
+    assert (
+        client.get(
+            "/api/v1/deadline/tools/get_throughput", params={"user": "ann"}
+        ).json()["user"]
+        == "ann"
+    )
@@ -0,0 +1,202 @@
+"""
+Tests for the shared state backends, the backend-backed Media Shuttle store and
+rate limiting.
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.backends import MemoryBackend, SQLiteBackend, create_backend
+from app.core.rate_limit import RateLimitMiddleware
+from app.modules.media_shuttle import router, schemas
+from app.modules.media_shuttle.service import (
+    SEED_TRANSFERS,
+    SEEDED_KEY,
+    TRANSFERS_KEY,
+    MediaShuttleService,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(str(tmp_path / "state.db"))
+
+
+def test_string_commands(backend):
+    """get/set/delete/incr behave like the Redis commands."""
+    assert backend.get("missing") is None
+    assert backend.set("key", "value")
+    assert backend.get("key") == "value"
+    assert not backend.set("key", "other", nx=True)
+    assert backend.incr("counter") == 1
+    assert backend.incr("counter", 5) == 6
+    assert backend.delete("key", "counter", "missing") == 2
+    assert backend.get("key") is None
+
+
+def test_expiry(backend):
+    """Keys set with ex, or given an expire, disappear after the TTL."""
+    backend.set("short", "1", ex=0.05)
+    backend.incr("window")
+    assert backend.expire("window", 0.05)
+    assert backend.get("short") == "1"
+    time.sleep(0.1)
+    assert backend.get("short") is None
+    assert backend.get("window") is None
+    assert backend.set("short", "2", nx=True)
+
+
+def test_hash_commands(backend):
+    """hset/hget/hgetall/hdel operate on fields of one key."""
+    assert backend.hset("h", "a", "1") == 1
+    assert backend.hset("h", "a", "2") == 0
+    backend.hset("h", "b", "3")
+    assert backend.hget("h", "a") == "2"
+    assert backend.hgetall("h") == {"a": "2", "b": "3"}
+    assert backend.hdel("h", "a", "missing") == 1
+    assert backend.hgetall("h") == {"b": "3"}
+
+
+def _increment(path: str, times: int) -> None:
+    backend = SQLiteBackend(path)
+    for _ in range(times):
+        backend.incr("shared")
+
+
+def test_sqlite_counter_is_consistent_across_processes(tmp_path):
+    """Concurrent worker processes never lose an increment."""
+    path = str(tmp_path / "state.db")
+    SQLiteBackend(path)
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_increment, args=(path, 50))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert SQLiteBackend(path).get("shared") == "200"
+
+
+def test_create_backend_from_url(tmp_path):
+    """The backend is picked from the STATE_BACKEND_URL scheme."""
+    assert isinstance(create_backend("memory://"), MemoryBackend)
+    assert isinstance(create_backend(f"sqlite:///{tmp_path}/state.db"), SQLiteBackend)
+    with pytest.raises(ValueError):
+        create_backend("ftp://nowhere")
+
+
+def test_transfer_store_is_shared_between_workers(tmp_path):
+    """Two services on the same SQLite file see each other's writes."""
+    path = str(tmp_path / "state.db")
+    worker_a = MediaShuttleService(SQLiteBackend(path))
+    worker_b = MediaShuttleService(SQLiteBackend(path))
+
+    assert len(worker_a.get_all_transfers()) == 2
+    created = worker_b.create_transfer(
+        schemas.TransferCreate(source_path="/a.mov", destination_path="/b.mov")
+    )
+    assert created.id == 3
+    assert worker_a.get_transfer_by_id(3) == created
+    assert len(worker_b.get_all_transfers()) == 3
+    assert worker_a.delete_transfer(3) == created
+    assert worker_b.get_transfer_by_id(3) is None
+
+
+def test_seeding_writes_the_rows_before_the_flag(tmp_path):
+    """The seeded flag follows the rows, and a late second seeding undoes nothing."""
+    path = str(tmp_path / "state.db")
+
+    class CheckedBackend(SQLiteBackend):
+        def set(self, key, value, ex=None, nx=False):
+            if key == SEEDED_KEY:
+                stored = self.hgetall(TRANSFERS_KEY)
+                assert all(str(transfer.id) in stored for transfer in SEED_TRANSFERS)
+            return super().set(key, value, ex=ex, nx=nx)
+
+    worker_a = MediaShuttleService(CheckedBackend(path))
+    updated = worker_a.update_transfer(1, schemas.TransferUpdate(status="failed"))
+    created = worker_a.create_transfer(
+        schemas.TransferCreate(source_path="/a.mov", destination_path="/b.mov")
+    )
+
+    # A worker that checked the flag before it was set seeds again
+    SQLiteBackend(path).delete(SEEDED_KEY)
+    worker_b = MediaShuttleService(CheckedBackend(path))
+    assert worker_b.get_transfer_by_id(1) == updated
+    assert (
+        worker_b.create_transfer(
+            schemas.TransferCreate(source_path="/c.mov", destination_path="/d.mov")
+        ).id
+        == created.id + 1
+    )
+
+
+def test_transfer_etag_reads_the_backend_off_the_event_loop(tmp_path, monkeypatch):
+    """The transfers ETag dependency does its backend read in a worker thread."""
+    on_loop = []
+
+    class RecordingBackend(SQLiteBackend):
+        def get(self, key):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return super().get(key)
+
+    service = MediaShuttleService(RecordingBackend(str(tmp_path / "state.db")))
+    monkeypatch.setattr(router, "media_shuttle_service", service)
+    app = FastAPI()
+    app.include_router(router.router)
+    with TestClient(app) as client:
+        response = client.get("/media_shuttle/transfers/1")
+    assert response.status_code == 200 and response.headers["ETag"]
+    assert on_loop and not any(on_loop)
+
+
+def test_rate_limit_returns_429_after_limit():
+    """Requests over the per-client limit are rejected with Retry-After."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limit=3, backend=MemoryBackend())
+    client = TestClient(app)
+    statuses = [client.get("/ping").status_code for _ in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+    assert int(client.get("/ping").headers["Retry-After"]) > 0
+
+
+def test_rate_limit_fails_open_without_blocking_the_loop(tmp_path):
+    """A locked SQLite backend delays nobody: the check times out and lets them in."""
+
+    class LockedBackend(SQLiteBackend):
+        def incr(self, key, amount=1):
+            # Another worker holding the write lock
+            time.sleep(2)
+            return super().incr(key, amount)
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware, limit=1, backend=LockedBackend(str(tmp_path / "state.db"))
+    )
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        statuses = [client.get("/ping").status_code for _ in range(2)]
+        assert statuses == [200, 200]
+        assert time.perf_counter() - start < 1.5
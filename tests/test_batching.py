@@ -0,0 +1,175 @@
+"""
+Tests for coalescing single-job lookups into batches.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from app.core.batching import DataLoader
+from app.core.config import settings
+from app.core.metrics import render_latest
+from app.core.request_scope import begin_request_scope
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.service import (
+    DeadlineService,
+    DeadlineSnapshot,
+    deadline_service,
+)
+from app.modules.deadline.snapshot import JobSnapshot
+from main import app
+
+RECORDS = generate_jobs(1000, seed=46)
+
+
+def _snapshot(version=1):
+    return DeadlineSnapshot(
+        version=version,
+        jobs=JobSnapshot.from_records(RECORDS),
+        fingerprint="lookups",
+        fetched_at=time.monotonic(),
+    )
+
+
+def test_loader_coalesces_and_deduplicates_keys():
+    """Concurrent loads become one call per batch with each key once."""
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    loader = DataLoader(batch, "test", window=0.01, max_batch_size=4)
+
+    async def scenario():
+        keys = ["a", "b", "a", "missing", "b", "c", "d", "e"]
+        return await asyncio.gather(*(loader.load(key) for key in keys))
+
+    assert asyncio.run(scenario()) == ["A", "B", "A", None, "B", "C", "D", "E"]
+    # The fourth distinct key fills the first batch; the rest wait for the window
+    assert calls == [["a", "b", "missing", "c"], ["d", "e"]]
+    assert (
+        'batch_loader_keys_total{loader="test",outcome="deduplicated"} 2'
+        in render_latest()
+    )
+
+
+def test_loader_failures_reach_every_caller():
+    """An exception in the batch function is raised to all its callers."""
+
+    async def batch(keys):
+        raise RuntimeError("upstream down")
+
+    loader = DataLoader(batch, "failing")
+
+    async def scenario():
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_job_lookup_bursts_share_one_pass(monkeypatch):
+    """A burst of get_job calls reads the snapshot once and matches snapshot.get."""
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    service = DeadlineService()
+    service._snapshot = _snapshot()
+    batches = []
+    lookup_jobs = service._lookup_jobs
+
+    async def spy(job_ids):
+        batches.append(job_ids)
+        return await lookup_jobs(job_ids)
+
+    monkeypatch.setattr(service._job_loader, "batch_fn", spy)
+    wanted = [RECORDS[i]["id"] for i in (5, 900, 5, 42)] + ["job-missing"]
+
+    async def scenario():
+        return await asyncio.gather(*(service.get_job(job_id) for job_id in wanted))
+
+    jobs = asyncio.run(scenario())
+    assert len(batches) == 1 and len(batches[0]) == 4
+    assert jobs[:4] == [service._snapshot.jobs.get(job_id) for job_id in wanted[:4]]
+    assert jobs[4] is None
+
+
+def test_concurrent_http_lookups_are_batched(monkeypatch):
+    """/rest/jobs/{id} and check_job_status requests in flight together are batched."""
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    monkeypatch.setattr(deadline_service, "_snapshot", _snapshot(version=46))
+    monkeypatch.setattr(deadline_service._job_loader, "window", 0.05)
+    batches = []
+    lookup_jobs = deadline_service._lookup_jobs
+
+    async def spy(job_ids):
+        batches.append(job_ids)
+        return await lookup_jobs(job_ids)
+
+    monkeypatch.setattr(deadline_service._job_loader, "batch_fn", spy)
+    ids = [record["id"] for record in RECORDS[:10]]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            rest = [
+                client.get(f"/api/v1/deadline/rest/jobs/{job_id}") for job_id in ids
+            ]
+            tools = [
+                client.get(f"/api/v1/deadline/tools/check_job_status/{job_id}")
+                for job_id in ids[:3]
+            ]
+            return await asyncio.gather(*rest, *tools)
+
+    responses = asyncio.run(scenario())
+    assert all(response.status_code == 200 for response in responses)
+    assert [response.json()["id"] for response in responses[:10]] == ids
+    assert {key.job_id for batch in batches for key in batch} == set(ids)
+    assert len(batches) < 5
+
+
+def test_lookups_read_the_snapshot_of_their_request(monkeypatch):
+    """A request keeps its snapshot's job even if a newer one arrives meanwhile."""
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    service = DeadlineService()
+    service._snapshot = _snapshot(version=1)
+    job_id = RECORDS[7]["id"]
+    changed = dict(
+        RECORDS[7], status="Failed" if RECORDS[7]["status"] != "Failed" else "Completed"
+    )
+    newer = DeadlineSnapshot(
+        version=2,
+        jobs=JobSnapshot.from_records([*RECORDS[:7], changed, *RECORDS[8:]]),
+        fingerprint="newer",
+        fetched_at=time.monotonic(),
+    )
+
+    async def request():
+        begin_request_scope()
+        version = await service.get_version()
+        service._snapshot = newer
+        job = await service.get_job(job_id)
+        return version, job
+
+    async def scenario():
+        # Two requests in one batch window, on either side of the refresh
+        first = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        return await first, await service.get_job(job_id)
+
+    (version, job), current = asyncio.run(scenario())
+    assert version == 1 and job.status == RECORDS[7]["status"]
+    assert current.status == changed["status"]
+
+
+def test_index_of_many_finds_rows_in_one_pass():
+    """Rows come back for the IDs present; absent IDs are left out."""
+    jobs = JobSnapshot.from_records(RECORDS)
+    ids = [RECORDS[row]["id"] for row in (0, 150, 999)]
+    assert jobs.index_of_many(ids + ["nope"]) == {
+        job_id: jobs.index_of(job_id) for job_id in ids
+    }
@@ -0,0 +1,103 @@
+"""
+Tests for response compression and the per-version compressed body cache.
+"""
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, GzipEncoder, negotiate
+
+PAYLOAD = [
+    {"id": f"job-{i:07d}", "status": "Rendering", "user": "artist_001"}
+    for i in range(500)
+]
+
+
+class CountingGzip(GzipEncoder):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def compress(self, data: bytes) -> bytes:
+        self.calls += 1
+        return super().compress(data)
+
+
+def _client(encoder=None, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/jobs")
+    async def jobs(response: Response):
+        response.headers["ETag"] = 'W/"deadline-7"'
+        return PAYLOAD
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            for i in range(3):
+                yield f"data: {'x' * 2000} {i}\n\n".encode()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    encoders = {"gzip": encoder} if encoder is not None else None
+    app.add_middleware(CompressionMiddleware, encoders=encoders, **options)
+    return TestClient(app)
+
+
+def test_large_json_is_compressed():
+    """Bodies above the threshold are gzipped and decode to the same JSON."""
+    response = _client().get("/jobs", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(response.content) / 5
+    assert response.json() == PAYLOAD
+
+
+def test_small_and_unaccepted_responses_are_not_compressed():
+    """Small bodies and identity-only clients get the plain body."""
+    client = _client()
+    assert (
+        "Content-Encoding"
+        not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    )
+    assert (
+        "Content-Encoding"
+        not in client.get("/jobs", headers={"Accept-Encoding": "identity"}).headers
+    )
+
+
+def test_versioned_body_is_compressed_once():
+    """Responses with the same ETag and URL reuse the cached compressed body."""
+    encoder = CountingGzip()
+    client = _client(encoder)
+    for _ in range(5):
+        assert (
+            client.get("/jobs", headers={"Accept-Encoding": "gzip"}).json() == PAYLOAD
+        )
+    assert encoder.calls == 1
+    client.get("/jobs?limit=10", headers={"Accept-Encoding": "gzip"})
+    assert encoder.calls == 2
+
+
+def test_streaming_response_is_compressed_incrementally():
+    """Server-sent events are compressed without buffering the stream."""
+    response = _client().get("/events", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.text.count("data: ") == 3
+
+
+def test_negotiation_honours_q_values():
+    """The highest q-value wins; ties go to the server's preference."""
+    available = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, br", available) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert negotiate("br;q=0, *", available) == "zstd"
+    assert negotiate("identity", available) is None
+    assert negotiate("gzip;q=0", ["gzip"]) is None
+    assert negotiate(None, available) is None
@@ -0,0 +1,200 @@
+"""
+Tests for Deadline job control against the local mock Deadline server.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.modules.deadline.mock_server import create_mock_app
+from app.modules.deadline.service import DeadlineService, deadline_service
+from app.modules.deadline.snapshot import JobSnapshot
+from app.modules.deadline.tools.ai_tools import mcp
+from main import app
+
+client = TestClient(app)
+
+
+def _service(monkeypatch, job_count=200, latency=0.0):
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    upstream = create_mock_app(job_count=job_count, latency=latency)
+    return upstream, DeadlineService(transport=httpx.ASGITransport(upstream))
+
+
+def test_with_changes_copies_only_changed_columns():
+    """Copy-on-write updates leave the original snapshot untouched."""
+    records = [
+        {
+            "id": "a",
+            "name": "A",
+            "status": "Rendering",
+            "user": "u",
+            "priority": 10,
+            "progress": 40.0,
+        },
+        {
+            "id": "b",
+            "name": "B",
+            "status": "Failed",
+            "user": "v",
+            "priority": 20,
+            "progress": 10.0,
+        },
+    ]
+    original = JobSnapshot.from_records(records)
+    updated = original.with_changes(
+        {1: {"status": "Queued", "progress": 0.0}, 0: {"priority": 90}}
+    )
+    assert [job.status for job in original] == ["Rendering", "Failed"]
+    assert [job.status for job in updated] == ["Rendering", "Queued"]
+    assert [job.priority for job in updated] == [90, 20]
+    assert updated[1].progress == 0.0 and original[1].progress == 10.0
+    assert updated.names is original.names
+    assert updated.where(status="queued") == [1]
+
+
+def test_resume_only_requeues_suspended_jobs(monkeypatch):
+    """Resuming a mix of jobs shows Queued only for those that were suspended."""
+    upstream, service = _service(monkeypatch)
+    jobs = asyncio.run(service.get_jobs())
+    suspended = jobs.ids[:3]
+    rendering = [
+        job.id for job in jobs if job.status == "Rendering" and job.id not in suspended
+    ][:3]
+    completed = [
+        job.id for job in jobs if job.status == "Completed" and job.id not in suspended
+    ][:3]
+    asyncio.run(service.control_jobs("suspend", suspended))
+
+    response = asyncio.run(
+        service.control_jobs("resume", suspended + rendering + completed)
+    )
+    assert response.succeeded == 9
+    statuses = {result.job_id: result.status for result in response.results}
+    assert all(statuses[job_id] == "Queued" for job_id in suspended)
+    assert all(statuses[job_id] == "Rendering" for job_id in rendering)
+    assert all(statuses[job_id] == "Completed" for job_id in completed)
+
+    # The mock Deadline server agrees with the optimistic update
+    upstream_statuses = {job["id"]: job["status"] for job in upstream.state.jobs}
+    assert {job_id: upstream_statuses[job_id] for job_id in statuses} == statuses
+
+
+def test_batched_commands_update_upstream_and_snapshot(monkeypatch):
+    """Every job gets a command; the snapshot changes at once with a new version."""
+    monkeypatch.setattr(settings, "DEADLINE_CONTROL_CONCURRENCY", 4)
+    upstream, service = _service(monkeypatch, latency=0.01)
+    jobs = asyncio.run(service.get_jobs())
+    version = asyncio.run(service.get_version())
+    job_ids = jobs.ids[:30]
+
+    response = asyncio.run(
+        service.control_jobs("suspend", job_ids + job_ids[:5] + ["missing"])
+    )
+    assert response.requested == 31
+    assert response.succeeded == 30 and response.failed == 1
+    assert response.results[-1].error == "Job not found"
+    assert all(result.status == "Suspended" for result in response.results[:30])
+
+    # Bounded concurrency, one command per distinct job
+    assert len(upstream.state.commands) == 30
+    assert 1 < upstream.state.max_in_flight <= 4
+    suspended = {
+        job["id"] for job in upstream.state.jobs if job["status"] == "Suspended"
+    }
+    assert set(job_ids) <= suspended
+
+    # Optimistic local update without an upstream refresh
+    requests = upstream.state.requests
+    jobs = asyncio.run(service.get_jobs())
+    assert upstream.state.requests == requests
+    assert {jobs.categories["status"].value(row) for row in range(30)} == {"Suspended"}
+    assert asyncio.run(service.get_version()) != version
+
+
+def test_requeue_and_priority_commands(monkeypatch):
+    """Requeue resets progress; priority sets the new value."""
+    upstream, service = _service(monkeypatch)
+    jobs = asyncio.run(service.get_jobs())
+    job_id = jobs.ids[0]
+
+    asyncio.run(service.control_jobs("requeue", [job_id]))
+    job = asyncio.run(service.get_job(job_id))
+    assert job.status == "Queued" and job.progress == 0.0
+
+    response = asyncio.run(service.control_jobs("priority", [job_id], priority=77))
+    assert response.results[0].priority == 77
+    assert upstream.state.commands[-1] == {
+        "Command": "priority",
+        "JobID": job_id,
+        "Priority": 77,
+    }
+
+    # A priority passed with another command is not sent
+    asyncio.run(service.control_jobs("suspend", [job_id], priority=10))
+    assert upstream.state.commands[-1] == {"Command": "suspend", "JobID": job_id}
+    assert asyncio.run(service.get_job(job_id)).priority == 77
+
+
+def test_upstream_failures_are_reported_per_job(monkeypatch):
+    """A job Deadline rejects fails alone and keeps its cached status."""
+    upstream, service = _service(monkeypatch)
+    jobs = asyncio.run(service.get_jobs())
+    gone, kept = jobs.ids[0], jobs.ids[1]
+    status = jobs.categories["status"].value(0)
+    upstream.state.jobs = [job for job in upstream.state.jobs if job["id"] != gone]
+
+    response = asyncio.run(service.control_jobs("suspend", [gone, kept]))
+    assert [result.ok for result in response.results] == [False, True]
+    assert response.results[0].error == "Deadline returned HTTP 404"
+    assert response.results[0].status == status
+
+
+def test_control_endpoints_and_tools(monkeypatch):
+    """REST routes, tool routes and MCP tools return per-job results."""
+    upstream, service = _service(monkeypatch)
+    for attribute in ("transport", "_client", "_snapshot", "_statistics"):
+        monkeypatch.setattr(deadline_service, attribute, getattr(service, attribute))
+    job_ids = upstream.state.jobs[0]["id"], upstream.state.jobs[1]["id"]
+
+    response = client.post(
+        "/api/v1/deadline/rest/jobs/suspend", json={"job_ids": list(job_ids)}
+    )
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 2
+    listed = client.get(f"/api/v1/deadline/rest/jobs/{job_ids[0]}").json()
+    assert listed["status"] == "Suspended"
+
+    assert (
+        client.post(
+            "/api/v1/deadline/rest/jobs/priority", json={"job_ids": ["x"]}
+        ).status_code
+        == 422
+    )
+    assert (
+        client.post(
+            "/api/v1/deadline/rest/jobs/resume", json={"job_ids": []}
+        ).status_code
+        == 422
+    )
+
+    tool = client.post(
+        "/api/v1/deadline/tools/set_job_priority",
+        json={"job_ids": [job_ids[1]], "priority": 5},
+    ).json()
+    assert tool["results"][0]["priority"] == 5
+
+    contents = asyncio.run(mcp.call_tool("resume_jobs", {"job_ids": [job_ids[0]]}))
+    assert '"status": "Queued"' in contents[0].text
+
+
+def test_control_is_unavailable_with_sample_jobs(monkeypatch):
+    """The built-in sample data has no upstream to send commands to."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", True)
+    service = DeadlineService()
+    job_id = asyncio.run(service.get_jobs()).ids[0]
+    response = asyncio.run(service.control_jobs("suspend", [job_id]))
+    assert response.failed == 1 and "unavailable" in response.results[0].error
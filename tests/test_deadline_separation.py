@@ -3,6 +3,7 @@ Tests for deadline module REST vs Tools API separation.
 """
 
 from fastapi.testclient import TestClient
+
 from main import app
 
 client = TestClient(app)
@@ -39,7 +40,7 @@ def test_deadline_rest_api_single_job():
     # First get all jobs to find a valid ID
     response = client.get("/api/v1/deadline/rest/jobs")
     jobs = response.json()
-    
+
     if jobs:
         job_id = jobs[0]["id"]
         response = client.get(f"/api/v1/deadline/rest/jobs/{job_id}")
@@ -53,8 +54,9 @@ def test_deadline_tools_get_all_jobs():
     response = client.get("/api/v1/deadline/tools/get_all_jobs")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    for job in data:
+    assert data["total_jobs"] >= len(data["jobs"])
+    assert "status_counts" in data
+    for job in data["jobs"]:
         assert "id" in job
         assert "name" in job
         assert "status" in job
@@ -85,8 +87,8 @@ def test_deadline_tools_check_job_status():
     """Test AI Tools API check job status function."""
     # First get a job ID
     response = client.get("/api/v1/deadline/tools/get_all_jobs")
-    jobs = response.json()
-    
+    jobs = response.json()["jobs"]
+
     if jobs:
         job_id = jobs[0]["id"]
         response = client.get(f"/api/v1/deadline/tools/check_job_status/{job_id}")
@@ -125,13 +127,13 @@ def test_api_separation():
     rest_response = client.get("/api/v1/deadline/rest/status")
     rest_data = rest_response.json()
     assert "statistics" in rest_data  # User-friendly statistics
-    
+
     # Tools API should have function-calling compatible structured data
     tools_response = client.get("/api/v1/deadline/tools/get_workload_summary")
     tools_data = tools_response.json()
     assert "total_jobs" in tools_data  # Function-calling compatible
     assert "running_jobs" in tools_data
-    
+
     # Verify they return different data structures
     assert rest_data.keys() != tools_data.keys()
 
@@ -143,13 +145,13 @@ def test_function_calling_compatibility():
     assert response.status_code == 200
     users = response.json()
     assert isinstance(users, list)
-    
+
     response = client.get("/api/v1/deadline/tools/count_jobs_by_status")
     assert response.status_code == 200
     counts = response.json()
     assert isinstance(counts, dict)
-    
+
     response = client.get("/api/v1/deadline/tools/get_running_jobs")
     assert response.status_code == 200
     running_jobs = response.json()
-    assert isinstance(running_jobs, list)
\ No newline at end of file
+    assert isinstance(running_jobs, list)
@@ -0,0 +1,197 @@
+"""
+Equivalence tests for the shared deadline views used by REST, AI tools and MCP.
+
+Every view is compared with the list-comprehension implementation it
+replaced, run over the same jobs as a plain list of models.
+"""
+
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.request_scope import begin_request_scope
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.schemas import DeadlineJob
+from app.modules.deadline.service import (
+    DeadlineService,
+    DeadlineSnapshot,
+    deadline_service,
+)
+from app.modules.deadline.snapshot import JobSnapshot
+from app.modules.deadline.tools.ai_tools import mcp
+from main import app
+
+client = TestClient(app)
+
+RECORDS = generate_jobs(2000, seed=11, users=40)
+# Mixed case, like Deadline's own statuses next to hand-entered ones
+RECORDS[0]["status"] = "rendering"
+RECORDS[1]["status"] = "Error"
+MODELS = [DeadlineJob(**record) for record in RECORDS]
+
+RUNNING = ["rendering", "queued", "processing"]
+FAILED = ["failed", "error"]
+ATTENTION = ["failed", "error", "suspended"]
+
+
+def _use_jobs(monkeypatch, records=RECORDS):
+    snapshot = DeadlineSnapshot(
+        version=1,
+        jobs=JobSnapshot.from_records(records),
+        fingerprint="views",
+        fetched_at=time.monotonic(),
+    )
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    monkeypatch.setattr(deadline_service, "_snapshot", snapshot)
+
+
+def _infos(jobs):
+    return [
+        {"id": j.id, "name": j.name, "status": j.status, "user": j.user} for j in jobs
+    ]
+
+
+def _counts(values):
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def test_rest_views_match_list_comprehensions(monkeypatch):
+    """/jobs, /jobs/{id}, /users and /status agree with the model-list versions."""
+    _use_jobs(monkeypatch)
+    base = "/api/v1/deadline/rest"
+
+    rendering = [j.model_dump() for j in MODELS if j.status.lower() == "rendering"][:50]
+    assert (
+        client.get(f"{base}/jobs", params={"status": "RENDERING", "limit": 50}).json()
+        == rendering
+    )
+    mine = [j.model_dump() for j in MODELS if j.user.lower() == "artist_003"]
+    assert (
+        client.get(f"{base}/jobs", params={"user": "Artist_003", "limit": 1000}).json()
+        == mine
+    )
+    assert client.get(f"{base}/jobs/{MODELS[7].id}").json() == MODELS[7].model_dump()
+    assert client.get(f"{base}/users").json() == sorted({j.user for j in MODELS})
+
+    statistics = client.get(f"{base}/status").json()["statistics"]
+    assert statistics == {
+        "total_jobs": len(MODELS),
+        "status_breakdown": _counts(j.status for j in MODELS),
+        "user_breakdown": _counts(j.user for j in MODELS),
+        "active_users": len({j.user for j in MODELS}),
+    }
+
+
+def test_tool_views_match_list_comprehensions(monkeypatch):
+    """The AI tool routes agree with the model-list versions."""
+    _use_jobs(monkeypatch)
+    base = "/api/v1/deadline/tools"
+    running = [j for j in MODELS if j.status.lower() in RUNNING]
+
+    assert client.get(f"{base}/get_jobs_by_status/Failed").json() == _infos(
+        j for j in MODELS if j.status.lower() == "failed"
+    )
+    assert client.get(f"{base}/get_jobs_by_user/artist_010").json() == _infos(
+        j for j in MODELS if j.user.lower() == "artist_010"
+    )
+    assert client.get(f"{base}/get_running_jobs").json() == _infos(running)
+    assert client.get(f"{base}/get_failed_jobs").json() == _infos(
+        j for j in MODELS if j.status.lower() in ATTENTION
+    )
+    assert client.get(f"{base}/count_jobs_by_status").json() == _counts(
+        j.status for j in MODELS
+    )
+    assert client.get(f"{base}/list_active_users").json() == sorted(
+        {j.user for j in MODELS}
+    )
+
+    # Users with running jobs, in order of their first job overall
+    running_users = {j.user for j in running}
+    active_users = [
+        user for user in dict.fromkeys(j.user for j in MODELS) if user in running_users
+    ]
+    assert client.get(f"{base}/get_workload_summary").json() == {
+        "total_jobs": len(MODELS),
+        "running_jobs": len(running),
+        "completed_jobs": sum(j.status.lower() == "completed" for j in MODELS),
+        "failed_jobs": sum(j.status.lower() in FAILED for j in MODELS),
+        "active_users": active_users,
+    }
+    busy = client.get(f"{base}/is_system_busy").json()
+    assert busy["running_jobs"] == len(running)
+    assert busy["load_percentage"] == round(len(running) / len(MODELS) * 100, 1)
+
+    status = client.get(f"{base}/check_job_status/{MODELS[1].id}").json()
+    assert (
+        status["status"] == "Error"
+        and status["needs_attention"]
+        and not status["is_running"]
+    )
+
+
+def test_mcp_tools_return_the_same_views_as_http(monkeypatch):
+    """MCP tool calls and their HTTP routes share one implementation."""
+    _use_jobs(monkeypatch)
+
+    async def call(name):
+        return await mcp.call_tool(name, {})
+
+    base = "/api/v1/deadline/tools"
+    for name in ("count_jobs_by_status", "get_workload_summary"):
+        contents = asyncio.run(call(name))
+        assert json.loads(contents[0].text) == client.get(f"{base}/{name}").json()
+    # Lists come back as one content item per entry
+    users = [content.text for content in asyncio.run(call("list_active_users"))]
+    assert users == client.get(f"{base}/list_active_users").json()
+
+
+def test_request_scope_reads_the_snapshot_once(monkeypatch):
+    """Inside a scope every read reuses the first snapshot, even when expired."""
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    service = DeadlineService()
+    fetches = []
+
+    async def fetch_jobs():
+        fetches.append(1)
+        return JobSnapshot.from_records(RECORDS[:10]), "scoped"
+
+    monkeypatch.setattr(service, "_fetch_jobs", fetch_jobs)
+
+    async def in_scope():
+        begin_request_scope()
+        await service.get_version()
+        await service.get_statistics()
+        await service.select_jobs(status="Completed")
+        return await service.get_jobs()
+
+    async def unscoped():
+        await service.get_version()
+        return await service.get_jobs()
+
+    asyncio.run(in_scope())
+    assert len(fetches) == 1
+    asyncio.run(unscoped())
+    assert len(fetches) == 3
+
+
+def test_http_request_reads_the_snapshot_once(monkeypatch):
+    """The ETag dependency and the endpoint of one request share a snapshot read."""
+    _use_jobs(monkeypatch, RECORDS[:20])
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    fetches = []
+
+    async def fetch_jobs():
+        fetches.append(1)
+        return deadline_service._snapshot.jobs, "views"
+
+    monkeypatch.setattr(deadline_service, "_fetch_jobs", fetch_jobs)
+    response = client.get("/api/v1/deadline/rest/status")
+    assert response.status_code == 200 and "etag" in response.headers
+    assert len(fetches) == 1
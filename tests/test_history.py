@@ -0,0 +1,185 @@
+"""
+Tests for the farm history store and its endpoints.
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.modules.deadline import history
+from app.modules.deadline.history import HistorySampler, HistoryStore, snapshot_metrics
+from app.modules.deadline.mock_server import create_mock_app, generate_jobs
+from app.modules.deadline.service import (
+    RUNNING_STATUSES,
+    DeadlineService,
+    DeadlineSnapshot,
+)
+from app.modules.deadline.snapshot import JobSnapshot
+from main import app
+
+client = TestClient(app)
+
+DAY = 24 * 3600
+
+
+def test_samples_roll_up_into_each_resolution():
+    """Samples fold into 1 min, 5 min and 1 h buckets with avg/min/max."""
+    store = HistoryStore(":memory:")
+    base = 1_700_000_000 - 1_700_000_000 % 3600
+    for minute, value in enumerate([4, 6, 8, 10, 12, 14]):
+        store.record(base + minute * 60, {("running", ""): value})
+
+    resolution, points = store.query(
+        "running", start=base, end=base + 600, resolution=60
+    )
+    assert resolution == 60 and [point["avg"] for point in points] == [
+        4,
+        6,
+        8,
+        10,
+        12,
+        14,
+    ]
+    _, five = store.query("running", start=base, end=base + 600, resolution=300)
+    assert [(point["avg"], point["min"], point["max"]) for point in five] == [
+        (8, 4, 12),
+        (14, 14, 14),
+    ]
+    _, hourly = store.query("running", start=base, end=base + 600, resolution=3600)
+    assert hourly == [{"timestamp": base, "avg": 9, "min": 4, "max": 14}]
+    assert store.latest("running")["avg"] == 14
+    assert store.series() == {"running": [""]}
+
+
+def test_resolution_choice_and_retention():
+    """Long windows use coarser buckets, and expired buckets are pruned."""
+    store = HistoryStore(":memory:")
+    now = time.time()
+    assert store.pick_resolution(now - 3600, now, now) == 60
+    assert store.pick_resolution(now - 1.5 * DAY, now, now) == 300
+    assert store.pick_resolution(now - 3 * DAY, now, now) == 3600
+    assert store.pick_resolution(now - 30 * DAY, now, now) == 3600
+
+    store.record(now - 10 * DAY, {("jobs", ""): 1})
+    store.record(now, {("jobs", ""): 2})
+    assert (
+        store.query("jobs", start=now - 11 * DAY, end=now, resolution=60)[1][-1]["avg"]
+        == 2
+    )
+    assert (
+        len(store.query("jobs", start=now - 11 * DAY, end=now, resolution=60)[1]) == 1
+    )
+    assert (
+        len(store.query("jobs", start=now - 11 * DAY, end=now, resolution=3600)[1]) == 2
+    )
+
+
+def test_compare_ranks_current_value_against_hours():
+    """compare() flags a current value above most recent hourly averages."""
+    store = HistoryStore(":memory:")
+    now = time.time()
+    for hour in range(1, 49):
+        store.record(now - hour * 3600, {("running", ""): 10 + hour % 3})
+    store.record(now, {("running", ""): 30})
+    result = store.compare("running", days=3, now=now)
+    assert result["current"] == 30
+    assert 10 <= result["usual"] <= 13
+    assert result["busier_than_usual"] and result["percentile"] == 100.0
+    assert store.compare("missing", now=now)["current"] is None
+
+
+def test_sampler_records_snapshot_aggregates_once_per_interval():
+    """One sample per interval, with status, running and per-user counts."""
+    jobs = JobSnapshot.from_records(generate_jobs(200, seed=4))
+    service = DeadlineService()
+    service._snapshot = DeadlineSnapshot(
+        version=1, jobs=jobs, fingerprint="history", fetched_at=time.monotonic()
+    )
+
+    store = HistoryStore(":memory:")
+    sampler = HistorySampler(service, store, 3600, RUNNING_STATUSES)
+    now = time.time()
+    assert asyncio.run(sampler.sample(now)) is True
+    assert asyncio.run(sampler.sample(now)) is False
+
+    metrics = snapshot_metrics(jobs, RUNNING_STATUSES)
+    running = sum(1 for job in jobs if job.status.lower() in RUNNING_STATUSES)
+    assert metrics[("running", "")] == running
+    assert sum(v for (m, _), v in metrics.items() if m == "user_running") == running
+    assert (
+        store.latest("status", "Completed")["avg"]
+        == jobs.count_by("status")["Completed"]
+    )
+
+
+def test_sampler_never_calls_deadline(monkeypatch):
+    """An idle machine makes no upstream calls; samples follow fetched snapshots."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    upstream = create_mock_app(job_count=30)
+    service = DeadlineService(transport=httpx.ASGITransport(upstream))
+    store = HistoryStore(":memory:")
+    sampler = HistorySampler(service, store, 0.05, RUNNING_STATUSES)
+
+    async def scenario():
+        sampler.start()
+        try:
+            # Nothing fetched, then a snapshot older than the interval
+            await asyncio.sleep(0.12)
+            await service.get_snapshot()
+            service._snapshot.fetched_at -= 1
+            await asyncio.sleep(0.12)
+            assert upstream.state.requests == 1
+            assert store.latest("jobs", "") is None
+
+            # A fresh snapshot (e.g. from a request) is recorded
+            await service.get_snapshot()
+            await asyncio.sleep(0.06)
+        finally:
+            await sampler.stop()
+
+    asyncio.run(scenario())
+    assert upstream.state.requests == 2
+    assert store.latest("jobs", "")["avg"] == 30
+
+
+def test_history_endpoints(monkeypatch):
+    """REST and tool routes read the store and have no snapshot ETag."""
+    store = HistoryStore(":memory:")
+    store.record(time.time(), {("running", ""): 5, ("user_running", "artist_001"): 2})
+    monkeypatch.setattr(history, "_store", store)
+
+    assert client.get("/api/v1/deadline/rest/history").json() == {
+        "running": [""],
+        "user_running": ["artist_001"],
+    }
+    response = client.get(
+        "/api/v1/deadline/rest/history/user_running",
+        params={"label": "artist_001", "hours": 2},
+    )
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    body = response.json()
+    assert body["resolution"] == 60 and body["points"][0]["avg"] == 2
+    assert (
+        client.get(
+            "/api/v1/deadline/rest/history/running", params={"resolution": 7}
+        ).status_code
+        == 422
+    )
+    assert (
+        client.get(
+            "/api/v1/deadline/rest/history/running", params={"start": "last week"}
+        ).status_code
+        == 422
+    )
+
+    compare = client.get("/api/v1/deadline/tools/compare_load_to_usual").json()
+    assert compare["current"] == 5
+    tool = client.get(
+        "/api/v1/deadline/tools/get_metric_history", params={"hours": 1}
+    ).json()
+    assert tool["points"][0]["avg"] == 5
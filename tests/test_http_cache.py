@@ -0,0 +1,166 @@
+"""
+Tests for conditional GET (ETag / If-None-Match) on deadline and transfer reads.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.http_cache import etag_matches
+from app.modules.deadline.mock_server import create_mock_app, generate_jobs
+from app.modules.deadline.service import DeadlineService
+from main import app
+
+client = TestClient(app)
+
+
+def test_deadline_reads_return_etag_and_cache_control():
+    """REST and tools GET routes carry the snapshot ETag."""
+    for path in [
+        "/api/v1/deadline/rest/jobs",
+        "/api/v1/deadline/rest/jobs/job-001",
+        "/api/v1/deadline/rest/status",
+        "/api/v1/deadline/tools/get_workload_summary",
+    ]:
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('W/"deadline-')
+        assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_unchanged_poll_returns_304():
+    """A matching If-None-Match is answered with an empty 304."""
+    first = client.get("/api/v1/deadline/rest/jobs")
+    etag = first.headers["ETag"]
+    second = client.get("/api/v1/deadline/rest/jobs", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+    stale = client.get(
+        "/api/v1/deadline/rest/jobs", headers={"If-None-Match": 'W/"deadline-0"'}
+    )
+    assert stale.status_code == 200
+
+
+def test_transfer_etag_changes_on_write():
+    """The transfer list ETag follows the store's write counter."""
+    etag = client.get("/api/v1/media_shuttle/transfers").headers["ETag"]
+    assert (
+        client.get(
+            "/api/v1/media_shuttle/transfers", headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+
+    created = client.post(
+        "/api/v1/media_shuttle/transfers",
+        json={"source_path": "/etag/a.mov", "destination_path": "/etag/b.mov"},
+    ).json()
+    response = client.get(
+        "/api/v1/media_shuttle/transfers", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    client.delete(f"/api/v1/media_shuttle/transfers/{created['id']}")
+
+
+def test_snapshot_version_follows_upstream_content(monkeypatch):
+    """The version changes only when the upstream payload changes."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    upstream = create_mock_app(job_count=20)
+    worker_a = DeadlineService(transport=httpx.ASGITransport(upstream))
+    worker_b = DeadlineService(transport=httpx.ASGITransport(upstream))
+
+    async def versions():
+        return await worker_a.get_version(), await worker_b.get_version()
+
+    first_a, first_b = asyncio.run(versions())
+    assert first_a == first_b
+    assert asyncio.run(worker_a.get_version()) == first_a
+
+    upstream.state.body = upstream.state.body.replace(b'"Queued"', b'"Rendering"')
+    assert asyncio.run(worker_a.get_version()) > first_a
+
+
+def test_expired_snapshot_is_refreshed_once_for_concurrent_callers(monkeypatch):
+    """Concurrent requests share a single upstream fetch."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    upstream = create_mock_app(job_count=20, latency=0.01)
+    service = DeadlineService(transport=httpx.ASGITransport(upstream))
+
+    async def poll():
+        return await asyncio.gather(*(service.get_jobs() for _ in range(10)))
+
+    results = asyncio.run(poll())
+    assert all(len(jobs) == 20 for jobs in results)
+    assert upstream.state.requests == 1
+
+
+def test_failed_refresh_keeps_the_last_good_snapshot(monkeypatch):
+    """An upstream error keeps the cached jobs and version and notifies nobody."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    jobs = generate_jobs(20, seed=31)
+    down = []
+
+    def handler(request):
+        return httpx.Response(503) if down else httpx.Response(200, json=jobs)
+
+    service = DeadlineService(transport=httpx.MockTransport(handler))
+    observed = []
+    service.add_snapshot_listener(lambda jobs, observed_at: observed.append(len(jobs)))
+
+    first = asyncio.run(service.get_snapshot())
+    down.append(True)
+    after = asyncio.run(service.get_snapshot())
+    assert service.last_fetch_failed
+    assert after is first and len(after.jobs) == 20
+    assert observed == [20]
+
+    # Nothing fetched yet: the empty list is served, but not observed
+    empty = DeadlineService(transport=httpx.MockTransport(handler))
+    empty.add_snapshot_listener(lambda jobs, observed_at: observed.append(len(jobs)))
+    assert len(asyncio.run(empty.get_jobs())) == 0
+    assert observed == [20]
+
+
+def test_malformed_payload_keeps_the_last_good_snapshot(monkeypatch):
+    """A payload that cannot be parsed is a failed fetch, not an empty job list."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    jobs = generate_jobs(20, seed=31)
+    bad_row = {**jobs[0], "id": "job-bad", "user": None}
+    responses = [
+        httpx.Response(200, json=jobs),
+        httpx.Response(200, json=[jobs[0], bad_row]),
+        httpx.Response(200, json=[jobs[0], {"id": "job-bad"}]),
+        httpx.Response(200, json={"jobs": jobs}),
+        httpx.Response(200, content=b"<html>not json</html>"),
+    ]
+    service = DeadlineService(
+        transport=httpx.MockTransport(lambda request: responses.pop(0))
+    )
+    observed = []
+    service.add_snapshot_listener(lambda jobs, observed_at: observed.append(len(jobs)))
+
+    first = asyncio.run(service.get_snapshot())
+    while responses:
+        after = asyncio.run(service.get_snapshot())
+        assert service.last_fetch_failed
+        assert after is first and len(after.jobs) == 20
+        assert after.fingerprint != "empty"
+    assert observed == [20]
+
+
+def test_etag_matching():
+    """If-None-Match supports lists, weak validators and *."""
+    assert etag_matches('W/"deadline-3"', 'W/"deadline-3"')
+    assert etag_matches('"deadline-3"', 'W/"deadline-3"')
+    assert etag_matches('W/"x-1", W/"deadline-3"', 'W/"deadline-3"')
+    assert etag_matches("*", 'W/"deadline-3"')
+    assert not etag_matches(None, 'W/"deadline-3"')
+    assert not etag_matches('W/"deadline-4"', 'W/"deadline-3"')
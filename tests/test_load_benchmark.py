@@ -0,0 +1,122 @@
+"""
+Tests for the offline benchmark tooling: mock Deadline server, upstream fetch
+and the MCP streamable-HTTP endpoint the load suite drives.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.modules.deadline.mock_server import create_mock_app, generate_jobs
+from app.modules.deadline.service import DeadlineService
+from main import app
+
+MCP_HEADERS = {"accept": "application/json, text/event-stream"}
+
+
+def test_mock_server_generates_requested_jobs():
+    """The mock Deadline web service serves N deterministic jobs."""
+    client = TestClient(create_mock_app(job_count=250, seed=1))
+    jobs = client.get("/api/jobs").json()
+    assert len(jobs) == 250
+    assert jobs == generate_jobs(250, seed=1)
+
+    subset = client.get("/api/jobs", params={"JobID": "job-0000003,job-0000007"}).json()
+    assert [job["id"] for job in subset] == ["job-0000003", "job-0000007"]
+
+
+def test_service_fetches_from_upstream(monkeypatch):
+    """With mock data disabled the service parses the upstream job list."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    service = DeadlineService(
+        transport=httpx.ASGITransport(create_mock_app(job_count=40))
+    )
+    jobs = asyncio.run(service.get_jobs())
+    assert len(jobs) == 40
+    assert jobs[0].id == "job-0000000"
+
+
+def test_service_returns_empty_list_on_upstream_error(monkeypatch):
+    """Upstream failures degrade to an empty job list."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    failing = httpx.MockTransport(lambda request: httpx.Response(503))
+    assert asyncio.run(DeadlineService(transport=failing).get_jobs()) == []
+
+
+def test_mcp_streamable_http_endpoint_serves_tool_calls():
+    """/mcp works once the app lifespan has started the session manager."""
+    with TestClient(app, base_url="http://cgcg-api.fly.dev") as client:
+        response = client.post(
+            "/mcp/mcp",
+            headers=MCP_HEADERS,
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-03-26",
+                    "capabilities": {},
+                    "clientInfo": {"name": "test", "version": "1"},
+                },
+            },
+        )
+        assert response.status_code == 200
+        headers = {**MCP_HEADERS, "mcp-session-id": response.headers["mcp-session-id"]}
+        client.post(
+            "/mcp/mcp",
+            headers=headers,
+            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+        )
+        response = client.post(
+            "/mcp/mcp",
+            headers=headers,
+            json={
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {"name": "count_jobs_by_status", "arguments": {}},
+            },
+        )
+        assert response.status_code == 200
+        assert "Completed" in response.text
+
+
+def test_load_benchmark_writes_json_report(tmp_path):
+    """A tiny in-process run reports latency percentiles, throughput and RSS."""
+    path = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "run_load.py")
+    spec = importlib.util.spec_from_file_location("run_load", path)
+    run_load = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(run_load)
+
+    output = tmp_path / "result.json"
+    run_load.main(
+        [
+            "--jobs",
+            "50",
+            "--requests",
+            "4",
+            "--warmup",
+            "1",
+            "--concurrency",
+            "2",
+            "--scenario",
+            "rest.status",
+            "--scenario",
+            "mcp.check_job_status",
+            "--output",
+            str(output),
+        ]
+    )
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {"rest.status", "mcp.check_job_status"}
+    for row in report["results"].values():
+        assert row["errors"] == 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+        assert row["throughput_rps"] > 0
+    assert report["rss_mb"]["peak"] > 0
+    assert settings.DEADLINE_USE_MOCK_DATA is True
@@ -0,0 +1,141 @@
+"""
+Tests for structured logging, request IDs and access log sampling.
+"""
+
+import io
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logs import (
+    LOG_RECORDS_DROPPED,
+    RequestLogMiddleware,
+    configure_logging,
+    get_request_id,
+    sampled,
+    set_sample_rates,
+    stop_logging,
+)
+from app.core.mcp_server import InstrumentedFastMCP
+
+MCP_HEADERS = {"accept": "application/json, text/event-stream"}
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def _app(server: InstrumentedFastMCP) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app):
+        async with server.run_http():
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/jobs/{job_id}")
+    async def job(job_id: str):
+        logging.getLogger("tests.jobs").info(
+            "Looked up %s", job_id, extra={"job_id": job_id}
+        )
+        return {"id": job_id, "request_id": get_request_id()}
+
+    app.mount("/mcp", server.http_app())
+    app.add_middleware(RequestLogMiddleware)
+    return app
+
+
+def test_records_carry_the_request_id_as_json():
+    """Client and generated request IDs reach log lines, responses and MCP tools."""
+    server = InstrumentedFastMCP("logs", stateless_http=True, json_response=True)
+
+    @server.tool()
+    def whoami() -> str:
+        return get_request_id()
+
+    stream = io.StringIO()
+    configure_logging("INFO", queue_size=100, stream=stream)
+    try:
+        with TestClient(_app(server)) as client:
+            given = client.get("/jobs/42", headers={"X-Request-ID": "req-123"})
+            generated = client.get("/jobs/43")
+            call = {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {"name": "whoami", "arguments": {}},
+            }
+            tool = client.post(
+                "/mcp/mcp", headers={**MCP_HEADERS, "X-Request-ID": "mcp-7"}, json=call
+            )
+    finally:
+        stop_logging()
+
+    assert given.headers["x-request-id"] == given.json()["request_id"] == "req-123"
+    request_id = generated.headers["x-request-id"]
+    assert generated.json()["request_id"] == request_id and request_id != "req-123"
+    assert tool.json()["result"]["content"][0]["text"] == "mcp-7"
+
+    lines = _lines(stream)
+    lookup = next(line for line in lines if line["logger"] == "tests.jobs")
+    assert lookup["message"] == "Looked up 42"
+    assert (lookup["job_id"], lookup["request_id"], lookup["level"]) == (
+        "42",
+        "req-123",
+        "INFO",
+    )
+    access = [line for line in lines if line["logger"] == "app.access"]
+    assert [(line["path"], line["status"]) for line in access] == [
+        ("/jobs/42", 200),
+        ("/jobs/43", 200),
+        ("/mcp/mcp", 200),
+    ]
+    assert access[1]["request_id"] == request_id
+    call_line = next(line for line in lines if line["logger"] == "app.core.mcp_server")
+    assert (call_line["target"], call_line["outcome"], call_line["request_id"]) == (
+        "whoami",
+        "ok",
+        "mcp-7",
+    )
+
+
+def test_sampling_follows_the_longest_prefix():
+    """Each path is sampled at the rate of its longest matching prefix."""
+    set_sample_rates({"/mcp": 0.0, "/mcp/tool/get_all_jobs": 1.0, "/api": 0.5})
+    try:
+        assert not any(sampled("/mcp/mcp") for _ in range(100))
+        assert all(sampled("/mcp/tool/get_all_jobs") for _ in range(100))
+        assert all(sampled("/metrics") for _ in range(100))
+        assert 10 < sum(sampled("/api/v1/deadline/jobs") for _ in range(200)) < 190
+    finally:
+        set_sample_rates({})
+
+
+def test_a_blocked_output_drops_records_instead_of_blocking():
+    """When the writer thread is stuck, logging stays fast and counts the drops."""
+    release = threading.Event()
+
+    class BlockedStream(io.StringIO):
+        def write(self, text):
+            release.wait()
+            return super().write(text)
+
+    stream = BlockedStream()
+    dropped = LOG_RECORDS_DROPPED.labels().value
+    configure_logging("INFO", queue_size=10, stream=stream)
+    logger = logging.getLogger("tests.flood")
+    try:
+        start = time.perf_counter()
+        for i in range(200):
+            logger.info("record %d", i)
+        assert time.perf_counter() - start < 1.0
+        assert LOG_RECORDS_DROPPED.labels().value - dropped >= 150
+    finally:
+        release.set()
+        stop_logging()
+    assert 10 <= len(_lines(stream)) <= 11
@@ -0,0 +1,125 @@
+import asyncio
+
+import anyio
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from app.core.render_cache import RenderCache, cached_render
+from app.modules.deadline.service import deadline_service
+from app.modules.deadline.tools.ai_tools import JOBS_RESOURCE_URI, mcp, render_cache
+
+
+def test_render_cache_evicts_least_recently_used_by_size():
+    """Entries are bounded by their total size; the oldest unused go first."""
+    cache = RenderCache(max_bytes=10)
+    cache.put(("a",), 1, "aaaa")
+    cache.put(("b",), 1, "bbbb")
+    assert cache.get(("a",), 1) == "aaaa"
+    cache.put(("c",), 1, "cccc")
+    assert cache.get(("b",), 1) is None
+    assert cache.get(("a",), 1) == "aaaa"
+    assert cache.size == 8
+    # Larger than the whole cache: not stored
+    cache.put(("d",), 1, "d" * 11)
+    assert cache.get(("d",), 1) is None
+
+
+def test_render_cache_drops_entries_of_older_versions():
+    """A lookup with a new version invalidates everything rendered before."""
+    cache = RenderCache(max_bytes=100)
+    cache.put(("a",), 1, "old")
+    assert cache.get(("a",), 2) is None
+    assert len(cache) == 0
+    cache.put(("a",), 2, "new")
+    assert cache.get(("a",), 2) == "new"
+
+
+def test_cached_render_reuses_text_until_version_changes():
+    """Renders run once per (arguments, version)."""
+    version = {"value": 1}
+    calls = []
+
+    async def get_version():
+        return version["value"]
+
+    @cached_render(RenderCache(1024), get_version)
+    async def render(job_id: str) -> str:
+        calls.append(job_id)
+        return f"{job_id}@{version['value']}"
+
+    async def scenario():
+        assert await render(job_id="a") == "a@1"
+        assert await render(job_id="a") == "a@1"
+        assert await render(job_id="b") == "b@1"
+        version["value"] = 2
+        assert await render(job_id="a") == "a@2"
+
+    asyncio.run(scenario())
+    assert calls == ["a", "b", "a"]
+
+
+def test_cached_render_skips_renders_that_raced_a_version_change():
+    """Text built while the data changed is returned but not cached."""
+    version = {"value": 1}
+    cache = RenderCache(1024)
+
+    async def get_version():
+        return version["value"]
+
+    @cached_render(cache, get_version)
+    async def render() -> str:
+        version["value"] += 1
+        return "text"
+
+    assert asyncio.run(render()) == "text"
+    assert len(cache) == 0
+
+
+def test_mcp_resources_and_prompts_are_served_from_the_cache():
+    """Repeated reads of the jobs resource and prompts return the cached text."""
+    render_cache.clear()
+
+    async def scenario():
+        first = await mcp.read_resource(JOBS_RESOURCE_URI)
+        second = await mcp.read_resource(JOBS_RESOURCE_URI)
+        prompt = await mcp.get_prompt("system_status_prompt", {})
+        again = await mcp.get_prompt("system_status_prompt", {})
+        return first, second, prompt, again
+
+    first, second, prompt, again = asyncio.run(scenario())
+    assert list(first)[0].content == list(second)[0].content
+    assert "Total jobs" in list(first)[0].content
+    assert prompt.messages[0].content.text == again.messages[0].content.text
+    assert len(render_cache) == 2
+
+
+def test_subscribed_sessions_receive_resource_updated_notifications():
+    """Subscribers of deadline://jobs are notified when the snapshot changes."""
+    received = []
+
+    async def message_handler(message):
+        if isinstance(message, types.ServerNotification):
+            received.append(message.root)
+
+    async def scenario():
+        server = mcp.server
+        async with create_connected_server_and_client_session(
+            server._mcp_server, message_handler=message_handler
+        ) as client:
+            capabilities = client.get_server_capabilities()
+            assert capabilities.resources.subscribe is True
+            await client.subscribe_resource(JOBS_RESOURCE_URI)
+            assert server.subscriber_count(JOBS_RESOURCE_URI) == 1
+
+            jobs = await deadline_service.get_jobs()
+            await deadline_service._notify(jobs)
+            with anyio.fail_after(5):
+                while not received:
+                    await anyio.sleep(0.01)
+
+            await client.unsubscribe_resource(JOBS_RESOURCE_URI)
+            assert server.subscriber_count(JOBS_RESOURCE_URI) == 0
+
+    asyncio.run(scenario())
+    assert isinstance(received[0], types.ResourceUpdatedNotification)
+    assert str(received[0].params.uri) == JOBS_RESOURCE_URI
@@ -0,0 +1,142 @@
+"""
+Tests for MCP session limits, per-session tool call limits and their metrics.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from app.core.mcp_server import (
+    MCP_TOOL_CALLS_IN_FLIGHT,
+    MCP_TOOL_CALLS_QUEUED,
+    InstrumentedFastMCP,
+)
+from app.core.metrics import render_latest
+
+MCP_HEADERS = {"accept": "application/json, text/event-stream"}
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1"},
+    },
+}
+
+
+def _gauge(gauge) -> float:
+    return gauge.labels().value
+
+
+def test_session_tool_calls_are_bounded_and_queued():
+    """One call runs, one waits for its slot and the next one is rejected."""
+    server = InstrumentedFastMCP(
+        "limits", max_in_flight_per_session=1, max_queued_per_session=1
+    )
+    release = asyncio.Event()
+    started = []
+
+    @server.tool()
+    async def slow(tag: str) -> str:
+        started.append(tag)
+        await release.wait()
+        return tag
+
+    async def scenario():
+        async with create_connected_server_and_client_session(
+            server._mcp_server
+        ) as client:
+            results = {}
+
+            async def call(tag):
+                results[tag] = await client.call_tool("slow", {"tag": tag})
+
+            async with anyio.create_task_group() as tasks:
+                tasks.start_soon(call, "first")
+                with anyio.fail_after(5):
+                    while not started:
+                        await anyio.sleep(0.01)
+                tasks.start_soon(call, "second")
+                with anyio.fail_after(5):
+                    while _gauge(MCP_TOOL_CALLS_QUEUED) < 1:
+                        await anyio.sleep(0.01)
+                assert _gauge(MCP_TOOL_CALLS_IN_FLIGHT) >= 1
+                await call("third")
+                assert started == ["first"]
+                release.set()
+            return results, started
+
+    results, started = asyncio.run(scenario())
+    assert started == ["first", "second"]
+    assert not results["first"].isError and not results["second"].isError
+    assert results["third"].isError
+    assert "Too many tool calls" in results["third"].content[0].text
+    assert _gauge(MCP_TOOL_CALLS_QUEUED) == 0
+    assert "mcp_tool_calls_rejected_total" in render_latest()
+
+
+def test_session_limit_refuses_new_sessions():
+    """Beyond MCP_MAX_SESSIONS new sessions get 503; open ones are counted."""
+    server = InstrumentedFastMCP("capped", max_sessions=1, stateless_http=False)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with server.run_http():
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+    app.mount("/mcp", server.http_app())
+    with TestClient(app) as client:
+        first = client.post("/mcp/mcp", headers=MCP_HEADERS, json=INITIALIZE)
+        assert first.status_code == 200
+        assert server.session_count() == 1
+        second = client.post("/mcp/mcp", headers=MCP_HEADERS, json=INITIALIZE)
+        assert second.status_code == 503
+        metrics = render_latest()
+        assert 'mcp_sessions_active{server="capped"} 1' in metrics
+        assert "process_resident_memory_bytes" in metrics
+
+        # Closing the session frees its place
+        session_id = first.headers["mcp-session-id"]
+        closed = client.delete(
+            "/mcp/mcp", headers={**MCP_HEADERS, "mcp-session-id": session_id}
+        )
+        assert closed.status_code == 200
+        for _ in range(50):
+            if server.session_count() == 0:
+                break
+            time.sleep(0.01)
+        assert server.session_count() == 0
+        assert (
+            client.post("/mcp/mcp", headers=MCP_HEADERS, json=INITIALIZE).status_code
+            == 200
+        )
+        assert server.session_count() == 1
+
+
+def test_stateless_mode_keeps_no_sessions():
+    """Stateless servers answer every request without opening a session."""
+    server = InstrumentedFastMCP(
+        "stateless", stateless_http=True, json_response=True, max_sessions=1
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with server.run_http():
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+    app.mount("/mcp", server.http_app())
+    with TestClient(app) as client:
+        for _ in range(3):
+            response = client.post("/mcp/mcp", headers=MCP_HEADERS, json=INITIALIZE)
+            assert response.status_code == 200
+            assert response.json()["result"]["serverInfo"]["name"] == "stateless"
+        assert server.session_count() == 0
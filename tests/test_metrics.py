@@ -0,0 +1,86 @@
+"""
+Tests for the Prometheus-style metrics middleware and /metrics endpoint.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, Registry
+from app.modules.deadline.tools.ai_tools import mcp
+from main import app
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_exposes_route_templates():
+    """Latency is labelled with the route template, not the raw path."""
+    client.get("/api/v1/deadline/rest/jobs")
+    client.get("/api/v1/deadline/rest/jobs/job-001")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/deadline/rest/jobs",status="200"}'
+    ) in body
+    assert 'route="/api/v1/deadline/rest/jobs/{job_id}"' in body
+    assert 'route="/api/v1/deadline/rest/jobs/job-001"' not in body
+    assert "http_requests_in_flight" in body
+
+
+def test_metrics_unmatched_routes_are_collapsed():
+    """Unknown paths share one label value to keep cardinality bounded."""
+    client.get("/does-not-exist/12345")
+    body = client.get("/metrics").text
+    assert 'route="<unmatched>",status="404"' in body
+    assert "/does-not-exist/12345" not in body
+
+
+def test_metrics_record_upstream_deadline_calls():
+    """Deadline service calls are timed per operation."""
+    client.get("/api/v1/deadline/rest/status")
+    body = client.get("/metrics").text
+    assert (
+        'deadline_upstream_request_duration_seconds_count{operation="get_jobs"}' in body
+    )
+
+
+def test_metrics_record_mcp_tool_calls():
+    """MCP tool calls are counted and timed by tool name."""
+    asyncio.run(mcp.call_tool("count_jobs_by_status", {}))
+    body = client.get("/metrics").text
+    assert (
+        'mcp_calls_total{kind="tool",name="count_jobs_by_status",outcome="ok"}' in body
+    )
+    assert (
+        'mcp_call_duration_seconds_count{kind="tool",name="count_jobs_by_status"}'
+        in body
+    )
+
+
+def test_histogram_rendering_is_cumulative():
+    """Histogram buckets are cumulative and end with +Inf."""
+    registry = Registry()
+    histogram = Histogram(
+        "test_latency_seconds", "Test histogram.", buckets=(0.1, 1.0), registry=registry
+    )
+    child = histogram.labels()
+    for value in (0.05, 0.5, 5.0):
+        child.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_latency_seconds_count 3" in lines
+
+
+def test_counter_rejects_wrong_label_count():
+    """Label values must match the declared label names."""
+    counter = Counter("test_total", "Test counter.", ["a", "b"], registry=Registry())
+    with pytest.raises(ValueError):
+        counter.labels("only-one")
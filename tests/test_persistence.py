@@ -0,0 +1,140 @@
+"""
+Tests for saving the Deadline job snapshot to disk and restoring it at startup.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.modules.deadline.mock_server import create_mock_app, generate_jobs
+from app.modules.deadline.persistence import (
+    SnapshotPersister,
+    dump_snapshot,
+    load_snapshot,
+)
+from app.modules.deadline.service import DeadlineService, DeadlineSnapshot
+from app.modules.deadline.snapshot import JobSnapshot
+
+
+def _upstream_service(monkeypatch, upstream):
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    return DeadlineService(transport=httpx.ASGITransport(upstream))
+
+
+def test_snapshot_file_round_trips():
+    """Every column, missing value and odd timestamp survives a save and load."""
+    records = generate_jobs(500, seed=45)
+    records[0].update(priority=None, progress=None, region=None, created_at="yesterday")
+    records[1]["updated_at"] = "2024-01-02T03:04:05.123456+00:00"
+    records[2]["name"] = "Scène_02 ✨"
+    snapshot = DeadlineSnapshot(
+        version=7,
+        jobs=JobSnapshot.from_records(records),
+        fingerprint="abc",
+        fetched_at=0.0,
+    )
+    service = DeadlineService()
+    statistics = service.statistics_for(snapshot.jobs)
+
+    restored, restored_statistics, saved_at = load_snapshot(
+        dump_snapshot(snapshot, statistics)
+    )
+    assert restored.jobs == snapshot.jobs
+    assert restored.jobs.records(range(3)) == snapshot.jobs.records(range(3))
+    assert (restored.version, restored.fingerprint) == (7, "abc")
+    assert restored_statistics == statistics
+    assert saved_at > 0
+    assert restored.jobs.where(status="rendering") == snapshot.jobs.where(
+        status="rendering"
+    )
+
+    data = dump_snapshot(snapshot)
+    for broken in (b"not a snapshot", data[:40], data[:-8]):
+        with pytest.raises(ValueError):
+            load_snapshot(broken)
+
+
+def test_warm_restart_serves_saved_jobs_then_reconciles(monkeypatch, tmp_path):
+    """A restarted service answers from disk at once and refreshes in the background."""
+    path = str(tmp_path / "deadline" / "snapshot.bin")
+    upstream = create_mock_app(job_count=300, latency=0.2)
+    before = _upstream_service(monkeypatch, upstream)
+    persister = SnapshotPersister(before, path, interval=60)
+    original = asyncio.run(before.get_snapshot())
+    assert asyncio.run(persister.save())
+    # Unchanged content is not written again
+    assert not asyncio.run(persister.save())
+
+    after = _upstream_service(monkeypatch, upstream)
+    assert SnapshotPersister(after, path, interval=60).load()
+    requests = upstream.state.requests
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        snapshot = await after.get_snapshot()
+        served_in = loop.time() - start
+        statistics = await after.get_statistics()
+        # The background refresh finds the same content
+        await after._reconcile_task
+        return snapshot, statistics, served_in
+
+    snapshot, statistics, served_in = asyncio.run(scenario())
+    assert served_in < 0.1
+    assert snapshot.restored and snapshot.jobs == original.jobs
+    assert statistics.total == 300
+    assert upstream.state.requests == requests + 1
+    current = after.cached_snapshot
+    assert not current.restored
+    assert current.version == original.version
+
+
+def test_restored_jobs_survive_an_unreachable_deadline(monkeypatch, tmp_path):
+    """Until Deadline answers, the saved jobs are served instead of an empty list."""
+    path = str(tmp_path / "snapshot.bin")
+    source = _upstream_service(monkeypatch, create_mock_app(job_count=20))
+    asyncio.run(source.get_snapshot())
+    asyncio.run(SnapshotPersister(source, path, interval=60).save())
+
+    failing = httpx.MockTransport(lambda request: httpx.Response(503))
+    service = DeadlineService(transport=failing)
+    assert SnapshotPersister(service, path, interval=60).load()
+    asyncio.run(service.refresh())
+    assert len(service.cached_snapshot.jobs) == 20
+    assert service.cached_snapshot.restored
+
+    # A corrupt file is ignored rather than served
+    with open(path, "r+b") as file:
+        file.write(b"garbage")
+    assert not SnapshotPersister(DeadlineService(), path, interval=60).load()
+
+
+def test_reconcile_attempts_back_off_while_deadline_fails(monkeypatch, tmp_path):
+    """Requests served from a restored snapshot do not each retry Deadline."""
+    path = str(tmp_path / "snapshot.bin")
+    source = _upstream_service(monkeypatch, create_mock_app(job_count=20))
+    asyncio.run(source.get_snapshot())
+    asyncio.run(SnapshotPersister(source, path, interval=60).save())
+
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0.05)
+    attempts = []
+    failing = httpx.MockTransport(
+        lambda request: attempts.append(1) or httpx.Response(503)
+    )
+    service = DeadlineService(transport=failing)
+    assert SnapshotPersister(service, path, interval=60).load()
+
+    async def scenario():
+        for _ in range(50):
+            snapshot = await service.get_snapshot()
+            assert snapshot.restored and len(snapshot.jobs) == 20
+            await asyncio.sleep(0.01)
+        await service._reconcile_task
+
+    asyncio.run(scenario())
+    # About 0.5 s of requests: attempts at 0, 0.05, 0.15 and 0.35 s
+    assert 3 <= len(attempts) <= 5
+    assert service._reconcile_failures == len(attempts)
@@ -0,0 +1,134 @@
+"""
+Tests for opt-in request profiling and trace spans.
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.api_router import api_router
+from app.core.config import settings
+from app.core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    Trace,
+    TracedAPIRouter,
+    activate,
+    span,
+)
+from app.modules.deadline.tools.ai_tools import mcp
+
+
+def _profiled_client(**options) -> tuple[TestClient, ProfileStore]:
+    store = ProfileStore(max_items=5)
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.add_middleware(ProfilingMiddleware, store=store, **options)
+    return TestClient(app), store
+
+
+def test_unprofiled_request_has_no_profile_headers():
+    """Requests without the token are served untouched."""
+    client, store = _profiled_client(token="secret")
+    response = client.get("/api/v1/deadline/rest/jobs")
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert store.list() == []
+
+
+def test_profile_with_admin_token_returns_folded_stacks():
+    """The X-Profile token enables sampling and stores folded stacks."""
+    client, store = _profiled_client(token="secret", interval=0.0001)
+    response = client.get(
+        "/api/v1/deadline/rest/status",
+        headers={
+            "X-Profile": "secret",
+            "traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        },
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert "deadline.get_jobs;dur=" in response.headers["Server-Timing"]
+
+    record = store.get(profile_id)
+    assert record.mode == "sampling"
+    assert record.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert {s["name"] for s in record.spans} >= {
+        "deadline.get_jobs",
+        "handler",
+        "request",
+    }
+    for line in record.output.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and stack
+
+
+def test_profile_cprofile_mode_and_sampling_rate():
+    """Every Nth request is profiled; the mode header selects cProfile."""
+    client, store = _profiled_client(sample_every=2)
+    for _ in range(4):
+        client.get(
+            "/api/v1/deadline/rest/users", headers={"X-Profile-Mode": "cprofile"}
+        )
+    records = store.list()
+    assert len(records) == 2
+    assert all(r.mode == "cprofile" for r in records)
+    assert "function calls" in records[0].output
+
+
+def test_span_is_noop_without_trace():
+    """Outside a profiled request span() records nothing."""
+    assert span("anything") is span("something-else")
+
+
+def test_mcp_dispatch_span_is_recorded(monkeypatch):
+    """MCP tool calls show up as spans on the active trace."""
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    trace = Trace()
+    with activate(trace):
+        asyncio.run(mcp.call_tool("list_active_users", {}))
+    names = [s.name for s in trace.spans]
+    assert "mcp.tool" in names
+    assert "deadline.get_jobs" in names
+
+
+def test_traced_router_reports_serialization_span(monkeypatch):
+    """Endpoints on a TracedAPIRouter mark where serialization starts."""
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    router = TracedAPIRouter()
+
+    @router.get("/items")
+    async def items():
+        return [{"id": i} for i in range(100)]
+
+    store = ProfileStore(max_items=5)
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware, token="secret", store=store)
+    response = TestClient(app).get("/items", headers={"X-Profile": "secret"})
+
+    record = store.get(response.headers["X-Profile-Id"])
+    names = [s["name"] for s in record.spans]
+    assert "endpoint" in names
+    assert "serialize" in names
+
+
+def test_debug_router_requires_token(monkeypatch):
+    """Profile retrieval endpoints reject requests without the admin token."""
+    from app.api.v1.endpoints import debug
+
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(debug.router)
+    client = TestClient(app)
+    assert client.get("/debug/profiles").status_code == 403
+    for wrong in ("secret2", "secre", b"s\xe9cret"):
+        assert (
+            client.get("/debug/profiles", headers={"X-Profile": wrong}).status_code
+            == 403
+        )
+    assert (
+        client.get("/debug/profiles", headers={"X-Profile": "secret"}).status_code
+        == 200
+    )
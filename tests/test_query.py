@@ -0,0 +1,175 @@
+"""
+Tests for the vectorized job query engine.
+"""
+
+from datetime import datetime
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.schemas import DeadlineJob, JobQueryParams
+from app.modules.deadline.service import deadline_service
+from app.modules.deadline.snapshot import JobSnapshot
+from main import app
+
+client = TestClient(app)
+
+RECORDS = generate_jobs(2000, seed=11)
+JOBS = [DeadlineJob(**record) for record in RECORDS]
+SNAPSHOT = JobSnapshot.from_records(RECORDS)
+
+
+def test_masks_match_list_comprehensions():
+    """Combined status/user/region masks select the same rows as Python filters."""
+    query = SNAPSHOT.query
+    region = JOBS[0].region
+    mask = query.mask(status=["RENDERING", "queued"], region=region)
+    expected = [
+        i
+        for i, job in enumerate(JOBS)
+        if job.status.lower() in ("rendering", "queued") and job.region == region
+    ]
+    assert query.rows(mask).tolist() == expected
+    assert query.count(mask) == len(expected)
+    assert query.count(query.mask(user="nobody")) == 0
+    assert query.count() == len(JOBS)
+    # Cached masks are shared, so they must not be writable
+    assert query.mask(status="failed") is query.mask(status="FAILED")
+    assert not query.mask(status="failed").flags.writeable
+
+
+def test_count_by_with_mask_and_index_selections():
+    """Group-by counts accept no selection, a boolean mask or row indices."""
+    query = SNAPSHOT.query
+    counts = {}
+    for job in JOBS:
+        counts[job.user] = counts.get(job.user, 0) + 1
+    assert query.count_by("user") == counts
+
+    mask = query.mask(status="failed")
+    failed = [job for job in JOBS if job.status == "Failed"]
+    expected = {}
+    for job in failed:
+        expected[job.region] = expected.get(job.region, 0) + 1
+    expected.pop(None, None)
+    assert query.count_by("region", mask) == expected
+    assert query.count_by("region", query.rows(mask).tolist()) == expected
+    assert query.count_by("region", []) == {}
+    assert SNAPSHOT.distinct("status", []) == []
+
+
+def test_top_n_orders_ties_and_skips_missing():
+    """top_n returns the N best rows, ties in row order, never a missing value."""
+    records = [
+        {"id": "a", "name": "A", "status": "Queued", "user": "u", "priority": 50},
+        {"id": "b", "name": "B", "status": "Queued", "user": "u"},
+        {"id": "c", "name": "C", "status": "Failed", "user": "u", "priority": 90},
+        {"id": "d", "name": "D", "status": "Queued", "user": "u", "priority": 50},
+        {"id": "e", "name": "E", "status": "Queued", "user": "u", "priority": 10},
+    ]
+    query = JobSnapshot.from_records(records).query
+    assert query.top_n("priority", 2).tolist() == [2, 0]
+    assert query.top_n("priority", 3).tolist() == [2, 0, 3]
+    assert query.top_n("priority", 10, descending=False).tolist() == [4, 0, 3, 2]
+    assert query.top_n("priority", 2, query.mask(status="queued")).tolist() == [0, 3]
+    assert query.top_n("priority", 0).tolist() == []
+
+
+def test_top_n_matches_sorted():
+    """On a large snapshot top_n agrees with a full stable sort."""
+    query = SNAPSHOT.query
+    progress = np.array([job.progress for job in JOBS], dtype=float)
+    expected = sorted(
+        (i for i in range(len(JOBS)) if not np.isnan(progress[i])),
+        key=lambda i: (-progress[i], i),
+    )[:25]
+    assert query.top_n("progress", 25).tolist() == expected
+
+
+def test_execute_matches_python_filter_and_sort():
+    """Ranges, name filters, multi-key sort and paging agree with plain Python."""
+    params = JobQueryParams(
+        status="Rendering,Queued",
+        priority_min=30,
+        priority_max=80,
+        created_after="2025-02-01T00:00:00Z",
+        name_prefix="scene_1",
+        sort="-priority,name",
+        limit=20,
+        offset=5,
+    )
+    rows, total = SNAPSHOT.query.execute(params)
+    start = datetime.fromisoformat("2025-02-01T00:00:00+00:00")
+    matches = [
+        job
+        for job in JOBS
+        if job.status in ("Rendering", "Queued")
+        and 30 <= job.priority <= 80
+        and datetime.fromisoformat(job.created_at) >= start
+        and job.name.lower().startswith("scene_1")
+    ]
+    matches.sort(key=lambda job: (-job.priority, job.name.lower()))
+    assert total == len(matches)
+    assert SNAPSHOT.rows(rows.tolist()) == matches[5:25]
+
+    contains = SNAPSHOT.query.name_mask(contains="_FX_")
+    assert SNAPSHOT.query.count(contains) == sum(
+        "_fx_" in job.name.lower() for job in JOBS
+    )
+
+
+def test_records_project_requested_fields():
+    """records() returns only the requested fields, in DeadlineJob form."""
+    assert SNAPSHOT.records([0], ["id", "priority"]) == [
+        {"id": JOBS[0].id, "priority": JOBS[0].priority}
+    ]
+    assert SNAPSHOT.records([1]) == [JOBS[1].model_dump()]
+
+
+def test_query_endpoint(monkeypatch):
+    """GET /rest/jobs/query filters, sorts and projects server-side."""
+
+    async def get_jobs():
+        return SNAPSHOT
+
+    monkeypatch.setattr(deadline_service, "get_jobs", get_jobs)
+    response = client.get(
+        "/api/v1/deadline/rest/jobs/query",
+        params={
+            "status": "Failed,Suspended",
+            "sort": "-priority",
+            "fields": "id,priority",
+            "limit": 3,
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    expected = sorted(
+        (job for job in JOBS if job.status in ("Failed", "Suspended")),
+        key=lambda job: -job.priority,
+    )
+    assert body["total"] == len(expected)
+    assert [job["priority"] for job in body["jobs"]] == [
+        job.priority for job in expected[:3]
+    ]
+    assert set(body["jobs"][0]) == {"id", "priority"}
+
+    tool = client.get(
+        "/api/v1/deadline/tools/query_jobs",
+        params={"user": "artist_001", "fields": "user"},
+    )
+    assert {job["user"] for job in tool.json()["jobs"]} == {"artist_001"}
+
+    assert (
+        client.get(
+            "/api/v1/deadline/rest/jobs/query", params={"sort": "bogus"}
+        ).status_code
+        == 422
+    )
+    assert (
+        client.get(
+            "/api/v1/deadline/rest/jobs/query", params={"created_after": "yesterday"}
+        ).status_code
+        == 422
+    )
@@ -0,0 +1,106 @@
+"""
+Tests for the job name search index.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.modules.deadline.mock_server import create_mock_app, generate_jobs
+from app.modules.deadline.search import NameIndex, normalize
+from app.modules.deadline.service import DeadlineService, deadline_service
+from app.modules.deadline.snapshot import JobSnapshot
+from main import app
+
+client = TestClient(app)
+
+NAMES = [job["name"] for job in generate_jobs(3000, seed=5)] + [
+    "Café-Noir.exr",
+    "",
+    "ab",
+    "x_scene_02",
+    "scene_02",
+]
+INDEX = NameIndex(NAMES)
+
+
+def test_matches_equal_a_linear_scan():
+    """Every query returns exactly the rows a substring scan would."""
+    queries = [
+        "Scene_02",
+        "comp_v014",
+        "SHOT_017 comp",
+        "fx",
+        "a",
+        "café",
+        "noir.exr",
+        "zzz",
+        "scene-02",
+    ]
+    for query in queries:
+        expected = [
+            row
+            for row, name in enumerate(NAMES)
+            if all(normalize(term) in normalize(name) for term in query.split())
+        ]
+        hits, total = INDEX.search(query)
+        assert total == len(expected), query
+        assert sorted(row for row, _ in hits) == expected, query
+    assert INDEX.search("   ") == ([], 0)
+    assert NameIndex([]).search("abc") == ([], 0)
+
+
+def test_ranking_prefers_exact_prefix_then_word_matches():
+    """Exact names rank first, then prefix, then word-start, then inner matches."""
+    index = NameIndex(
+        ["xscene_02_a", "Shot_scene_02", "Scene_02_long_name", "scene_02", "Scene_02_b"]
+    )
+    hits, total = index.search("scene_02", limit=4)
+    assert total == 5
+    assert [row for row, _ in hits] == [3, 4, 2, 1]
+    assert [score for _, score in hits] == [4, 3, 3, 2]
+    assert index.search("scene_02")[0][-1] == (0, 1)
+
+
+def test_search_endpoint_and_tool(monkeypatch):
+    """GET /rest/jobs/search and the search_jobs tool return ranked jobs."""
+    snapshot = JobSnapshot.from_records(generate_jobs(500, seed=1))
+
+    async def get_jobs():
+        return snapshot
+
+    monkeypatch.setattr(deadline_service, "get_jobs", get_jobs)
+    response = client.get(
+        "/api/v1/deadline/rest/jobs/search", params={"q": "Scene_01", "limit": 5}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == sum("scene_01" in job.name.lower() for job in snapshot)
+    assert len(body["jobs"]) == min(5, body["total"])
+    assert all("scene_01" in job["name"].lower() for job in body["jobs"])
+
+    tool = client.get(
+        "/api/v1/deadline/tools/search_jobs", params={"query": "comp_v01", "limit": 3}
+    )
+    assert [job["score"] for job in tool.json()["jobs"]] == sorted(
+        (job["score"] for job in tool.json()["jobs"]), reverse=True
+    )
+    assert client.get("/api/v1/deadline/rest/jobs/search").status_code == 422
+
+
+def test_unchanged_refresh_keeps_snapshot_and_index(monkeypatch):
+    """A refresh with identical upstream content reuses the indexed snapshot."""
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    upstream = create_mock_app(job_count=50)
+    service = DeadlineService(transport=httpx.ASGITransport(upstream))
+
+    first = asyncio.run(service.search_jobs("scene"))
+    jobs = asyncio.run(service.get_jobs())
+    assert jobs.has_name_index and first.total == 50
+    assert asyncio.run(service.get_jobs()) is jobs
+
+    upstream.state.body = upstream.state.body.replace(b"Scene_", b"Sequence_")
+    assert asyncio.run(service.search_jobs("scene")).total == 0
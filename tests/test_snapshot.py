@@ -0,0 +1,124 @@
+"""
+Tests for the columnar job snapshot.
+"""
+
+import pytest
+
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.schemas import DeadlineJob
+from app.modules.deadline.snapshot import JobSnapshot
+
+RECORDS = generate_jobs(500, seed=3)
+
+
+def test_rows_round_trip_to_models():
+    """Materialized rows equal the models built from the same records."""
+    snapshot = JobSnapshot.from_records(RECORDS)
+    assert len(snapshot) == len(RECORDS)
+    assert list(snapshot) == [DeadlineJob(**record) for record in RECORDS]
+    assert snapshot[-1] == DeadlineJob(**RECORDS[-1])
+    assert snapshot[10:13] == [DeadlineJob(**record) for record in RECORDS[10:13]]
+
+
+def test_missing_and_non_canonical_values_round_trip():
+    """Optional fields and unusual timestamp formats survive unchanged."""
+    records = [
+        {"id": "a", "name": "A", "status": "Queued", "user": "u"},
+        {
+            "id": "b",
+            "name": "B",
+            "status": "Failed",
+            "user": "u",
+            "region": "eu-west",
+            "priority": 0,
+            "progress": 0.0,
+            "created_at": "2025-03-01T10:00:00.250+02:00",
+            "updated_at": "not a date",
+        },
+    ]
+    snapshot = JobSnapshot.from_records(records)
+    assert list(snapshot) == [DeadlineJob(**record) for record in records]
+
+
+def test_filters_match_list_comprehensions():
+    """where() and count_by() agree with filtering the model list."""
+    snapshot = JobSnapshot.from_records(RECORDS)
+    jobs = [DeadlineJob(**record) for record in RECORDS]
+
+    rows = snapshot.where(status="rendering", user="ARTIST_007")
+    expected = [
+        job
+        for job in jobs
+        if job.status.lower() == "rendering" and job.user.lower() == "artist_007"
+    ]
+    assert snapshot.rows(rows) == expected
+    assert (
+        snapshot.where(status=["failed", "suspended"], limit=3)
+        == [i for i, job in enumerate(jobs) if job.status in ("Failed", "Suspended")][
+            :3
+        ]
+    )
+    assert snapshot.where(status="Unknown") == []
+
+    counts = {}
+    for job in jobs:
+        counts[job.status] = counts.get(job.status, 0) + 1
+    assert snapshot.count_by("status") == counts
+    assert snapshot.get(jobs[42].id) == jobs[42]
+    assert snapshot.get("missing") is None
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"id": "a", "name": "A", "status": "Queued"},
+        {"id": "a", "name": "A", "status": "Queued", "user": None},
+        "job-a",
+        None,
+    ],
+)
+def test_invalid_record_is_rejected(record):
+    """Any invalid row fails the whole snapshot with ValueError, like models did."""
+    with pytest.raises(ValueError, match="Invalid job record"):
+        JobSnapshot.from_records([RECORDS[0], record])
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("priority", "high"),
+        ("priority", 2**64),
+        ("progress", "half"),
+        ("region", ["eu-west"]),
+    ],
+)
+def test_bad_row_leaves_the_columns_consistent(field, value):
+    """A row rejected for a bad optional field appends nothing to any column."""
+    snapshot = JobSnapshot.from_records(RECORDS[:3])
+    with pytest.raises(ValueError):
+        snapshot._append({**RECORDS[3], field: value})
+    lengths = {
+        len(snapshot.ids),
+        len(snapshot.names),
+        len(snapshot.priority),
+        len(snapshot.progress),
+        *(len(category.codes) for category in snapshot.categories.values()),
+        *(len(column) for column in snapshot.timestamps.values()),
+    }
+    assert lengths == {3}
+    assert list(snapshot) == [DeadlineJob(**record) for record in RECORDS[:3]]
+
+
+def test_id_lookups_use_the_row_index():
+    """ID lookups agree with a scan, keep the first repeated ID and survive changes."""
+    snapshot = JobSnapshot.from_records([*RECORDS, {**RECORDS[7], "name": "Repeat"}])
+    assert snapshot.index_of(RECORDS[7]["id"]) == 7
+    assert snapshot.index_of("missing") is None
+    wanted = [RECORDS[3]["id"], "missing", RECORDS[400]["id"], RECORDS[3]["id"]]
+    assert snapshot.index_of_many(wanted) == {
+        RECORDS[3]["id"]: 3,
+        RECORDS[400]["id"]: 400,
+    }
+    changed = snapshot.with_changes({3: {"status": "Suspended"}})
+    assert changed.row_index is snapshot.row_index
+    assert changed.get(RECORDS[3]["id"]).status == "Suspended"
@@ -0,0 +1,110 @@
+"""
+Tests for the startup-optimized (LAZY_STARTUP) mode.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.lazy_mcp import LazyFastMCP
+from main import app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of the import path of ``main`` in lazy mode
+DEFERRED_MODULES = ["mcp", "mcp.server.fastmcp", "httpx", "numpy"]
+
+
+def test_lazy_startup_defers_heavy_imports():
+    """Importing the app does not import the MCP SDK or httpx."""
+    code = (
+        "import sys, main; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "LAZY_STARTUP": "true"}
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, env=env)
+    assert output.decode().strip() == ""
+
+
+def test_lazy_mcp_replays_registrations_on_first_use():
+    """Tools registered before the server exists are available once it is built."""
+    lazy = LazyFastMCP("startup-test")
+
+    @lazy.tool()
+    def ping() -> str:
+        """Replies with pong."""
+        return "pong"
+
+    assert not lazy.is_built
+    tools = asyncio.run(lazy.list_tools())
+    assert lazy.is_built
+    assert [tool.name for tool in tools] == ["ping"]
+
+    @lazy.tool()
+    def pong() -> str:
+        """Replies with ping."""
+        return "ping"
+
+    assert {tool.name for tool in asyncio.run(lazy.list_tools())} == {"ping", "pong"}
+
+
+def test_tool_list_is_cached():
+    """tools/list reuses the same schemas until the tool set changes."""
+    lazy = LazyFastMCP("startup-test", lazy=False)
+
+    @lazy.tool()
+    def ok() -> str:
+        """Replies with ok."""
+        return "ok"
+
+    assert asyncio.run(lazy.list_tools()) is asyncio.run(lazy.list_tools())
+
+
+def test_mcp_mount_unavailable_without_lifespan():
+    """Without the app lifespan the MCP mount answers 503 instead of hanging."""
+    response = TestClient(app).post("/mcp/mcp", json={})
+    assert response.status_code == 503
+
+
+def test_failed_mcp_build_answers_503_or_fails_startup(monkeypatch):
+    """A server that cannot be built or started never leaves requests hanging."""
+    lazy = LazyFastMCP("broken")
+
+    def broken_build():
+        raise ImportError("no MCP SDK")
+
+    monkeypatch.setattr(lazy, "_build", broken_build)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with lazy.run_http():
+            yield
+
+    broken_app = FastAPI(lifespan=lifespan)
+    broken_app.mount("/mcp", lazy.http_app())
+    with TestClient(broken_app) as client:
+        response = client.post("/mcp/mcp", json={})
+        assert response.status_code == 503
+        assert response.text == "MCP server failed to start"
+
+    eager = LazyFastMCP("eager-broken", lazy=False)
+
+    @asynccontextmanager
+    async def failing_run_http():
+        raise RuntimeError("session manager failed")
+        yield
+
+    monkeypatch.setattr(eager._server, "run_http", failing_run_http)
+
+    async def start():
+        async with eager.run_http():
+            pass
+
+    with pytest.raises(RuntimeError, match="session manager failed"):
+        asyncio.run(asyncio.wait_for(start(), timeout=5))
@@ -0,0 +1,185 @@
+"""
+Tests for the adaptive Deadline sync scheduler.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import render_latest
+from app.core.request_scope import begin_request_scope
+from app.modules.deadline.mock_server import create_mock_app
+from app.modules.deadline.service import DeadlineService, deadline_service
+from app.modules.deadline.sync import SyncScheduler
+from main import app
+
+
+def _service(monkeypatch, status_code=None):
+    monkeypatch.setattr(settings, "DEADLINE_USE_MOCK_DATA", False)
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 0)
+    upstream = create_mock_app(job_count=50)
+    transport = httpx.ASGITransport(upstream)
+    if status_code is not None:
+        transport = httpx.MockTransport(lambda request: httpx.Response(status_code))
+    return upstream, DeadlineService(transport=transport)
+
+
+def _change(upstream):
+    upstream.state.jobs[0] = dict(upstream.state.jobs[0], status="Failed")
+    upstream.state.body = None
+
+
+def test_interval_follows_change_rate(monkeypatch):
+    """New content halves the interval, unchanged content stretches it up to the max."""
+    upstream, service = _service(monkeypatch)
+    scheduler = SyncScheduler(service, min_interval=1, max_interval=8, idle_timeout=60)
+    scheduler.interval = 4
+
+    async def scenario():
+        assert await scheduler.sync_once() == "unchanged"
+        assert scheduler.interval == 6
+        _change(upstream)
+        assert await scheduler.sync_once() == "changed"
+        assert scheduler.interval == 3 and scheduler.reason == "change"
+        for _ in range(5):
+            await scheduler.sync_once()
+
+    asyncio.run(scenario())
+    assert scheduler.interval == 8 and scheduler.reason == "max_interval"
+    assert 0 < scheduler.change_ratio < 1
+    # Requests are served from the scheduler's snapshot meanwhile
+    assert service.max_age == 16
+
+
+def test_latency_errors_and_demand_lengthen_the_interval(monkeypatch):
+    """Slow or failing upstreams and rare requests all slow the sync down."""
+    _, failing = _service(monkeypatch, status_code=503)
+    scheduler = SyncScheduler(failing, min_interval=1, max_interval=60, idle_timeout=60)
+    for expected in (2, 4, 8):
+        assert asyncio.run(scheduler.sync_once()) == "error"
+        assert scheduler.interval == expected and scheduler.reason == "backoff"
+
+    _, service = _service(monkeypatch)
+    scheduler = SyncScheduler(service, min_interval=1, max_interval=60, idle_timeout=60)
+    scheduler.last_latency = 0.5
+    assert scheduler.adjust("unchanged") == 5 and scheduler.reason == "latency"
+
+    # One request in 2 seconds (smoothed to fewer): most refreshes every
+    # 2.5 s would go unread
+    scheduler.last_latency = 0
+    scheduler.note_demand()
+    scheduler._counted_at -= 2
+    assert 2.5 < scheduler.adjust("changed") < 60
+    assert scheduler.reason == "demand"
+    # Subscribed agents want changes pushed, however rarely they ask
+    subscribed = SyncScheduler(
+        service, min_interval=1, max_interval=60, idle_timeout=60, subscribers=lambda: 1
+    )
+    subscribed.demand_rate = 0.01
+    assert subscribed.adjust("changed") == 1
+    assert "deadline_sync_interval_seconds" in render_latest()
+    assert 'deadline_sync_decisions_total{reason="demand"}' in render_latest()
+
+
+def test_scheduler_pauses_without_clients_and_wakes_on_demand(monkeypatch):
+    """No upstream calls while idle; a request wakes the background refresh."""
+    upstream, service = _service(monkeypatch)
+    scheduler = SyncScheduler(
+        service, min_interval=0.01, max_interval=0.05, idle_timeout=0.2
+    )
+
+    async def request():
+        begin_request_scope()
+        return await service.get_jobs()
+
+    async def scenario():
+        scheduler.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert scheduler.paused and upstream.state.requests == 0
+            assert service.max_age is None
+
+            # The waking request fetches on demand, then the scheduler takes over
+            await asyncio.create_task(request())
+            await asyncio.sleep(0.1)
+            assert not scheduler.paused
+            assert upstream.state.requests > 2
+
+            # Reads within max_age no longer call Deadline
+            before = upstream.state.requests
+            await service.get_snapshot()
+            assert upstream.state.requests - before <= 1
+
+            # An open client connection keeps it running past the idle timeout
+            sessions = [1]
+            scheduler.clients = lambda: len(sessions)
+            await asyncio.sleep(0.3)
+            assert not scheduler.paused
+            sessions.clear()
+            await asyncio.sleep(0.15)
+            assert scheduler.paused
+            requests = upstream.state.requests
+            await asyncio.sleep(0.1)
+            assert upstream.state.requests == requests
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert service.max_age is None
+    assert service._demand_listeners == []
+
+
+def test_analytics_polls_count_as_demand():
+    """Clients that only poll ETAs or throughput keep the sync awake."""
+    demand = []
+
+    def listener():
+        demand.append(True)
+
+    deadline_service.add_demand_listener(listener)
+    try:
+        client = TestClient(app)
+        for path in ("eta", "throughput"):
+            before = len(demand)
+            response = client.get(f"/api/v1/deadline/rest/analytics/{path}")
+            assert response.status_code == 200
+            # One demand signal per request, however many reads it makes
+            assert len(demand) == before + 1
+    finally:
+        deadline_service.remove_demand_listener(listener)
+
+
+def test_scheduler_survives_a_failing_refresh(monkeypatch):
+    """An exception from refresh() is logged and the sync carries on."""
+    upstream, service = _service(monkeypatch)
+    scheduler = SyncScheduler(
+        service,
+        min_interval=0.01,
+        max_interval=0.05,
+        idle_timeout=60,
+        clients=lambda: 1,
+    )
+    refresh = service.refresh
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) <= 2:
+            raise RuntimeError("refresh blew up")
+        return await refresh()
+
+    monkeypatch.setattr(service, "refresh", flaky)
+
+    async def scenario():
+        scheduler.start()
+        try:
+            await asyncio.sleep(0.2)
+            assert not scheduler._task.done()
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert len(calls) > 3
+    assert upstream.state.requests > 0
@@ -0,0 +1,151 @@
+"""
+Tests for budgeted, paged tool results and MCP progress notifications.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from app.core.config import settings
+from app.core.tool_results import decode_cursor, encode_cursor, fit_to_budget
+from app.modules.deadline.mock_server import generate_jobs
+from app.modules.deadline.service import DeadlineSnapshot, deadline_service
+from app.modules.deadline.snapshot import JobSnapshot
+from app.modules.deadline.tools.ai_tools import mcp, render_cache
+from main import app
+
+client = TestClient(app)
+
+RECORDS = generate_jobs(3000, seed=43, users=30)
+URL = "/api/v1/deadline/tools/get_all_jobs"
+
+
+def _use_jobs(monkeypatch, records=RECORDS, version=43):
+    snapshot = DeadlineSnapshot(
+        version=version,
+        jobs=JobSnapshot.from_records(records),
+        fingerprint=f"pages-{version}",
+        fetched_at=time.monotonic(),
+    )
+    monkeypatch.setattr(settings, "DEADLINE_CACHE_TTL", 3600)
+    monkeypatch.setattr(deadline_service, "_snapshot", snapshot)
+    monkeypatch.setattr(deadline_service, "_statistics", None)
+    render_cache.clear()
+
+
+def test_cursors_and_budget():
+    """Cursors round-trip, reject garbage, and budgets always take one item."""
+    assert decode_cursor(encode_cursor({"row": 5, "id": "job-5"})) == {
+        "row": 5,
+        "id": "job-5",
+    }
+    for cursor in ("not a cursor", encode_cursor([1, 2])):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    # Each item is a line of its own: quotes, newline and comma
+    assert fit_to_budget(["aaaa", "bbbb", "cccc"], 16) == 2
+    assert fit_to_budget(["aaaa", "bbbb", "cccc"], 16, depth=1) == 1
+    assert fit_to_budget(["x" * 100], 10) == 1
+    assert fit_to_budget([], 10) == 0
+
+
+def test_get_all_jobs_pages_within_the_budget(monkeypatch):
+    """Every job comes back exactly once, each page within the byte budget."""
+    _use_jobs(monkeypatch)
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_BYTES", 16 * 1024)
+    seen = []
+    cursor = ""
+    pages = 0
+    while True:
+        response = client.get(URL, params={"cursor": cursor})
+        assert response.status_code == 200
+        assert len(response.content) <= settings.TOOL_RESULT_MAX_BYTES
+        page = response.json()
+        assert page["total_jobs"] == len(RECORDS)
+        assert page["offset"] == len(seen)
+        seen += [job["id"] for job in page["jobs"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [record["id"] for record in RECORDS]
+    assert pages > 1
+    assert sum(page["status_counts"].values()) == len(RECORDS)
+
+
+def test_mcp_pages_stay_within_the_budget(monkeypatch):
+    """Pages sent over MCP (indented JSON) fit the budget, not just the REST body."""
+    _use_jobs(monkeypatch)
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_BYTES", 16 * 1024)
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        content = asyncio.run(mcp.call_tool("get_all_jobs", {"cursor": cursor}))
+        text = content[0].text
+        assert len(text.encode()) <= settings.TOOL_RESULT_MAX_BYTES
+        page = json.loads(text)
+        seen += [job["id"] for job in page["jobs"]]
+        cursor = page["next_cursor"]
+    assert seen == [record["id"] for record in RECORDS]
+
+
+def test_cursor_follows_its_job_across_snapshots(monkeypatch):
+    """A refreshed job list resumes at the cursor's job, or rejects the cursor."""
+    _use_jobs(monkeypatch)
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_BYTES", 8 * 1024)
+    cursor = client.get(URL).json()["next_cursor"]
+    next_id = decode_cursor(cursor)["id"]
+
+    # Two older jobs disappear: the next page still starts at the same job
+    _use_jobs(monkeypatch, RECORDS[2:], version=44)
+    page = client.get(URL, params={"cursor": cursor}).json()
+    assert page["jobs"][0]["id"] == next_id
+
+    remaining = [record for record in RECORDS if record["id"] != next_id]
+    _use_jobs(monkeypatch, remaining, version=45)
+    response = client.get(URL, params={"cursor": cursor})
+    assert response.status_code == 422
+    assert "start again" in response.json()["detail"]
+    assert client.get(URL, params={"cursor": "garbage"}).status_code == 422
+
+
+def test_mcp_progress_sends_the_summary_first(monkeypatch):
+    """MCP clients asking for progress get the status summary before the page."""
+    _use_jobs(monkeypatch)
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_BYTES", 8 * 1024)
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, total, message))
+
+    async def scenario():
+        async with create_connected_server_and_client_session(
+            mcp.server._mcp_server
+        ) as session:
+            return await session.call_tool(
+                "get_all_jobs", {}, progress_callback=on_progress
+            )
+
+    result = asyncio.run(scenario())
+    page = json.loads(result.content[0].text)
+    assert page["next_cursor"] and len(page["jobs"]) < len(RECORDS)
+    assert [update[0] for update in updates] == [0, 1, 2]
+    assert updates[1][2].startswith(f"{len(RECORDS)} jobs: ")
+
+
+def test_status_prompt_truncates_the_issue_list(monkeypatch):
+    """Failed jobs beyond the budget are summarized with a pointer to the next page."""
+    records = [dict(record, status="Failed") for record in RECORDS]
+    _use_jobs(monkeypatch, records, version=46)
+    monkeypatch.setattr(settings, "TOOL_RESULT_MAX_BYTES", 4 * 1024)
+    prompt = asyncio.run(mcp.get_prompt("system_status_prompt", {}))
+    text = prompt.messages[0].content.text
+    assert len(text.encode()) <= settings.TOOL_RESULT_MAX_BYTES
+    shown = text.count(" - Failed")
+    assert 0 < shown < len(records)
+    assert f"and {len(records) - shown} more" in text
+    assert f"offset={shown})" in text
@@ -0,0 +1,89 @@
+"""
+Tests for the user lookup cache and bulk username resolution.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.schemas.user_schemas import UserCreate, UserInDB
+from app.db.models.user import User
+from app.db.repositories.user_repository import _MISSING, UserCache, UserRepository
+from app.db.session import Base
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    with Session(engine) as session:
+        session.add_all(
+            User(
+                username=f"artist{i}",
+                email=f"artist{i}@cgcg.example",
+                hashed_password="x",
+            )
+            for i in range(20)
+        )
+        session.commit()
+        queries.clear()
+        session.queries = queries
+        yield session
+
+
+def test_lookups_are_read_through_and_invalidated_on_create(db):
+    """Repeated lookups hit the cache, including misses, until a user is created."""
+    repository = UserRepository(db, UserCache(ttl=60, max_entries=100))
+    user = repository.get_user_by_username("artist3")
+    assert user.email == "artist3@cgcg.example"
+    assert repository.get_user_by_id(user.id) == user
+    assert repository.get_user_by_email(user.email) == user
+    assert repository.get_user_by_username("newcomer") is None
+    assert repository.get_user_by_username("newcomer") is None
+    assert len(db.queries) == 2
+
+    created = repository.create_user(
+        UserCreate(username="newcomer", email="new@cgcg.example", password="pw"),
+        "hashed",
+    )
+    assert isinstance(created, UserInDB)
+    assert repository.get_user_by_username("newcomer") == created
+    assert repository.get_user_by_id(created.id) == created
+
+
+def test_bulk_resolution_uses_one_query_for_the_misses(db):
+    """A page of job users resolves with a single IN query, then from the cache."""
+    repository = UserRepository(db, UserCache(ttl=60, max_entries=100))
+    repository.get_user_by_username("artist0")
+    db.queries.clear()
+
+    page = ["artist0", "artist1", "artist1", "artist7", "render-bot", "artist19"] * 5
+    users = repository.get_users_by_usernames(page)
+    assert sorted(users) == ["artist0", "artist1", "artist19", "artist7"]
+    assert len(db.queries) == 1 and " IN " in db.queries[0]
+
+    assert repository.get_users_by_usernames(page) == users
+    assert repository.get_user_by_username("render-bot") is None
+    assert len(db.queries) == 1
+
+
+def test_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    """Entries expire after the TTL and the oldest are evicted past the limit."""
+    clock = [0.0]
+    monkeypatch.setattr(
+        "app.db.repositories.user_repository.time.monotonic", lambda: clock[0]
+    )
+    cache = UserCache(ttl=10, max_entries=2)
+    cache.set("a", None)
+    cache.set("b", None)
+    cache.get("a")
+    cache.set("c", None)
+    assert "b" not in cache._entries and "a" in cache._entries
+    clock[0] = 11
+    assert cache.get("a") is _MISSING
+    assert "a" not in cache._entries